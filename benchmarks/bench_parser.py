@@ -0,0 +1,53 @@
+"""Microbenchmark for the blood pressure measurement parser.
+
+Compares the precompiled fast path of `parse_blood_pressure` with the
+field-by-field reference decoder on a corpus covering every flag combination.
+If NumPy is installed, the batch decoder is measured as well.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_parser
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from custom_components.medisana_blood_pressure.medisana_bp.parser import (
+    parse_blood_pressure,
+)
+from tests.reference_parser import parse_blood_pressure_reference
+
+from .corpus import build_corpus
+
+
+def main() -> None:
+    """Run the benchmark and print the per-frame cost of both decoders."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--frames", type=int, default=10_000)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    corpus = build_corpus(args.frames)
+    results = {}
+    for name, parse in (("reference", parse_blood_pressure_reference), ("fast path", parse_blood_pressure)):
+        best = min(timeit.repeat(lambda parse=parse: [parse(frame) for frame in corpus],
+                                 number=1, repeat=args.repeat))
+        results[name] = best / len(corpus)
+        print(f"{name:>10}: {results[name] * 1e6:7.3f} µs/frame")
+
+    print(f"   speedup: {results['reference'] / results['fast path']:7.2f}x")
+
+    try:
+        from custom_components.medisana_blood_pressure.medisana_bp.batch import (  # noqa: PLC0415
+            parse_blood_pressure_batch,
+        )
+    except ImportError:
+        return
+    best = min(timeit.repeat(lambda: parse_blood_pressure_batch(corpus), number=1, repeat=args.repeat))
+    print(f"{'batch':>10}: {best / len(corpus) * 1e6:7.3f} µs/frame")
+
+
+if __name__ == "__main__":
+    main()
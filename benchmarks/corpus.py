@@ -0,0 +1,107 @@
+"""Synthetic corpora for the benchmarks.
+
+All corpora are generated from a seed, so runs on different machines measure
+the same input.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import random
+from typing import Any
+
+from custom_components.medisana_blood_pressure.medisana_bp.supported_devices import (
+    MANUFACTURER_IDS,
+    SUPPORTED_NAME_PREFIX,
+)
+from tests import frames
+
+_OTHER_NAMES = ("LYWSD03MMC", "Govee_H5075", "Galaxy Buds", "Mi Band 7", None)
+_OTHER_UUIDS = ("0000180f-0000-1000-8000-00805f9b34fb", "0000fe95-0000-1000-8000-00805f9b34fb", "fef3")
+
+
+def _random_fields(rng: random.Random, flags: int) -> dict[str, Any]:
+    """Return plausible random values of the fields announced by `flags`."""
+    fields: dict[str, Any] = {
+        "systolic": rng.randrange(90, 180),
+        "diastolic": rng.randrange(50, 110),
+        "mean_arterial_pressure": rng.randrange(60, 130),
+    }
+    if flags & frames.FLAG_TIMESTAMP:
+        fields["timestamp"] = (rng.randrange(2020, 2030), rng.randrange(1, 13), rng.randrange(1, 29),
+                               rng.randrange(24), rng.randrange(60), rng.randrange(60))
+    if flags & frames.FLAG_PULSE_RATE:
+        fields["pulse_rate"] = rng.randrange(40, 120)
+    if flags & frames.FLAG_USER_ID:
+        fields["user_id"] = rng.randrange(1, 5)
+    if flags & frames.FLAG_STATUS:
+        fields["status"] = rng.randrange(0x40)
+    return fields
+
+
+def build_frame(rng: random.Random, flags: int) -> bytes:
+    """Return a random 0x2A35 frame with the optional fields announced by `flags`."""
+    return frames.build_frame(flags, **_random_fields(rng, flags))
+
+
+def build_corpus(size: int, seed: int = 0) -> list[bytes]:
+    """Return `size` synthetic 0x2A35 frames spread over all flag combinations."""
+    rng = random.Random(seed)
+    return [build_frame(rng, i % 0x20) for i in range(size)]
+
+
+def build_memory_dump(size: int, users: int = 2, seed: int = 0) -> list[bytes]:
+    """Return `size` distinct timestamped frames of several users, as sent after a connection."""
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1, 7, 0)
+    dump = []
+    for i in range(size):
+        time = start + timedelta(hours=12 * i, minutes=rng.randrange(60))
+        fields = _random_fields(rng, 0x1E)
+        fields.update(timestamp=time, user_id=1 + i % users)
+        dump.append(frames.build_frame(0x1E, **fields))
+    return dump
+
+
+@dataclass(slots=True)
+class Advertisement:
+    """A BluetoothServiceInfo-like advertisement."""
+
+    address: str
+    name: str | None
+    rssi: int
+    time: float
+    manufacturer_data: dict[int, bytes] = field(default_factory=dict)
+    service_uuids: list[str] = field(default_factory=list)
+
+
+def build_advertisement_storm(size: int, devices: int = 200, monitors: int = 2, seed: int = 0) -> list[Advertisement]:
+    """Return `size` advertisements of `devices` addresses, `monitors` of them Medisana monitors.
+
+    Devices re-advertise the same payload most of the time, like on a busy proxy.
+    """
+    rng = random.Random(seed)
+    payloads: list[tuple[str | None, dict[int, bytes], list[str]]] = []
+    for index in range(devices):
+        if index < monitors:
+            payloads.append((f"{SUPPORTED_NAME_PREFIX}{index:04d}", {min(MANUFACTURER_IDS): b"\x00"},
+                             ["00001810-0000-1000-8000-00805f9b34fb"]))
+        else:
+            payloads.append((rng.choice(_OTHER_NAMES), {rng.randrange(0x10000): b"\x00"},
+                             rng.sample(_OTHER_UUIDS, rng.randrange(len(_OTHER_UUIDS)))))
+    storm = []
+    for i in range(size):
+        index = rng.randrange(devices)
+        name, manufacturer_data, service_uuids = payloads[index]
+        if rng.random() < 0.01:  # noqa PLR2004
+            service_uuids = [*service_uuids, rng.choice(_OTHER_UUIDS)]
+        storm.append(Advertisement(
+            address=f"AA:BB:CC:{index >> 16 & 0xFF:02X}:{index >> 8 & 0xFF:02X}:{index & 0xFF:02X}",
+            name=name,
+            rssi=rng.randrange(-100, -30),
+            time=i * 0.01,
+            manufacturer_data=manufacturer_data,
+            service_uuids=service_uuids,
+        ))
+    return storm
@@ -0,0 +1,626 @@
+"""Simulated cuffs and Bluetooth proxies for load and scaling tests.
+
+Drives the real `MedisanaCoordinator` and its entities with N simulated
+Medisana cuffs instead of hardware:
+
+- each cuff takes a measurement every `measurement_interval`, then advertises
+  with the `1872B` name and manufacturer id 18498 or 31256 and is connectable
+  for `advertising_window`
+- proxies hand out `BleakClient` replacements after a connect delay, fail a
+  configurable share of the attempts and reject connections beyond their slots
+- a connected cuff sends its memory as a burst of 0x2A35 notifications, or
+  with a Record Access Control Point only the requested records
+
+The report contains the throughput, the delay from measurement to event,
+the event loop lag and the memory per device. The coordinator timings are
+scaled down (see `Timing`), so a run takes seconds instead of minutes.
+
+Run from the repository root:
+
+    python -m benchmarks.harness --devices 1 10 100 [--duration 20] [--failure-rate 0.1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable, Iterable
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import logging
+import random
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import MappingProxyType, SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+from bleak import BleakError
+from bleak.backends.device import BLEDevice
+from custom_components.medisana_blood_pressure import sensor
+from custom_components.medisana_blood_pressure.const import (
+    CONF_MAX_SESSION_DURATION,
+    DOMAIN,
+    EVENT_MEASUREMENT,
+)
+from custom_components.medisana_blood_pressure.medisana_bp import session
+from custom_components.medisana_blood_pressure.medisana_bp.matcher import (
+    AdvertisementMatcher,
+)
+from custom_components.medisana_blood_pressure.medisana_bp.metrics import (
+    DURATION_BOUNDS,
+    Histogram,
+)
+from custom_components.medisana_blood_pressure.medisana_bp.scheduler import (
+    ConnectionScheduler,
+)
+from custom_components.medisana_blood_pressure.medisana_bp.supported_devices import (
+    BATTERY_LEVEL_UUID,
+    BP_MEASUREMENT_UUID,
+    MANUFACTURER_IDS,
+    RECORD_ACCESS_CONTROL_POINT_UUID,
+    SUPPORTED_NAME_PREFIX,
+)
+from homeassistant import loader
+from homeassistant.components import bluetooth
+from homeassistant.config_entries import SOURCE_BLUETOOTH, ConfigEntry
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_STATE_REPORTED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import EntityPlatform
+
+from .corpus import build_frame
+
+BP_SERVICE_UUID = "00001810-0000-1000-8000-00805f9b34fb"
+BATTERY_SERVICE_UUID = "0000180f-0000-1000-8000-00805f9b34fb"
+LAG_BOUNDS = (1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, 500.0)  # ms
+MEASUREMENT_SPACING = timedelta(minutes=1)  # between the device timestamps of a cuff
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class CuffProfile:
+    """Behaviour of the simulated cuffs and proxies; times are in seconds."""
+
+    measurement_interval: float = 10.0
+    advertising_window: float = 4.0
+    advertisement_interval: float = 0.5
+    notification_interval: float = 0.02
+    # Stored measurements sent on every connection by a cuff without record access control point
+    memory: int = 60
+    # Measurements stored before the run
+    backlog: int = 20
+    users: int = 2
+    record_access: bool = False
+    connect_delay: float = 0.1
+    connect_jitter: float = 0.1
+    failure_rate: float = 0.0
+    proxies: int = 1
+    proxy_slots: int = 3
+
+
+@dataclass(slots=True)
+class Timing:
+    """Coordinator timings, scaled down from the defaults of the integration."""
+
+    debounce: float = 0.2
+    cooldown: float = 1.0
+    backoff_initial: float = 0.5
+    backoff_max: float = 5.0
+    idle_gap: float = 0.5  # before the interval of the notifications is learned
+    min_idle_gap: float = 0.1
+    max_session_duration: int = 30
+
+
+class SimulatedConnectionError(BleakError):
+    """A simulated connection attempt failed."""
+
+    def __init__(self, device: str, reason: str) -> None:
+        super().__init__(f"Connection to {device} failed: {reason}")
+
+
+class _Services:
+    """Service collection of a cuff, looked up by handle or UUID."""
+
+    def __init__(self, record_access: bool) -> None:  # noqa: FBT001
+        characteristics = [(3, BP_MEASUREMENT_UUID, BP_SERVICE_UUID), (7, BATTERY_LEVEL_UUID, BATTERY_SERVICE_UUID)]
+        if record_access:
+            characteristics.append((9, RECORD_ACCESS_CONTROL_POINT_UUID, BP_SERVICE_UUID))
+        self.characteristics = {handle: SimpleNamespace(handle=handle, uuid=uuid, service_uuid=service_uuid)
+                                for handle, uuid, service_uuid in characteristics}
+
+    def get_characteristic(self, specifier: int | str) -> Any:
+        if isinstance(specifier, int):
+            return self.characteristics.get(specifier)
+        return next((char for char in self.characteristics.values() if char.uuid == specifier), None)
+
+
+class SimulatedCuff:
+    """A cuff that stores its measurements and advertises after each one."""
+
+    def __init__(self, index: int, profile: CuffProfile, rng: random.Random) -> None:
+        self.index = index
+        self.profile = profile
+        self.address = f"A4:C1:38:{index >> 16 & 0xFF:02X}:{index >> 8 & 0xFF:02X}:{index & 0xFF:02X}"
+        self.name = f"{SUPPORTED_NAME_PREFIX}{index:04d}"
+        self.manufacturer_id = sorted(MANUFACTURER_IDS)[index % len(MANUFACTURER_IDS)]
+        self.source = f"proxy_{index % profile.proxies}"
+        self.ble_device = BLEDevice(self.address, self.name, {"source": self.source})
+        self.rng = rng
+        self.frames: list[bytes] = []
+        # Loop time of each measurement by its device timestamp, for the delivery delay
+        self.measured_at: dict[str, float] = {}
+        self.awake = False
+        self.battery = rng.randrange(20, 100)
+        # The backlog ends about now, the clock runs faster than real time
+        self.clock_start = datetime.now().replace(second=0, microsecond=0) - profile.backlog * MEASUREMENT_SPACING
+
+    def measure(self, now: float | None = None) -> bytes:
+        """Take a measurement and store it."""
+        timestamp = self.clock_start + len(self.frames) * MEASUREMENT_SPACING
+        data = bytearray(build_frame(self.rng, 0x1E))
+        struct.pack_into("<HBBBBB", data, 7, timestamp.year, timestamp.month, timestamp.day,
+                         timestamp.hour, timestamp.minute, timestamp.second)
+        data[16] = 1 + len(self.frames) % self.profile.users
+        self.frames.append(bytes(data))
+        if now is not None:
+            self.measured_at[timestamp.isoformat()] = now
+        return self.frames[-1]
+
+    def service_info(self, now: float) -> bluetooth.BluetoothServiceInfoBleak:
+        """Return the current advertisement."""
+        return bluetooth.BluetoothServiceInfoBleak(
+            name=self.name,
+            address=self.address,
+            rssi=self.rng.randrange(-90, -50),
+            manufacturer_data={self.manufacturer_id: b"\x00\x01"},
+            service_data={},
+            service_uuids=[BP_SERVICE_UUID],
+            source=self.source,
+            device=self.ble_device,
+            advertisement=None,
+            connectable=True,
+            time=now,
+            tx_power=None,
+        )
+
+
+class SimulatedBleakClient:
+    """Connection to a simulated cuff, used in place of `BleakClientWithServiceCache`."""
+
+    def __init__(self, cuff: SimulatedCuff, on_disconnect: Callable[[], None], stats: LoadStats) -> None:
+        self.cuff = cuff
+        self.services = _Services(cuff.profile.record_access)
+        self._on_disconnect = on_disconnect
+        self._stats = stats
+        self._callbacks: dict[str, Callable[[Any, bytearray], None]] = {}
+        self._senders: set[asyncio.Task[None]] = set()
+        self.connected = True
+
+    def _send(self, frames: list[bytes], after: bytes | None = None) -> None:
+        async def send() -> None:
+            for frame in frames:
+                await asyncio.sleep(self.cuff.profile.notification_interval)
+                self._stats.notifications += 1
+                self._callbacks[BP_MEASUREMENT_UUID](None, bytearray(frame))
+            if after is not None:
+                self._callbacks[RECORD_ACCESS_CONTROL_POINT_UUID](None, bytearray(after))
+
+        task = asyncio.get_running_loop().create_task(send())
+        self._senders.add(task)
+        task.add_done_callback(self._senders.discard)
+
+    async def start_notify(self, char: Any, callback: Callable[[Any, bytearray], None]) -> None:
+        """Subscribe; without record access control point the memory is sent right away."""
+        uuid = getattr(char, "uuid", char)
+        self._callbacks[uuid] = callback
+        if uuid == BP_MEASUREMENT_UUID and not self.cuff.profile.record_access:
+            self._send(self.cuff.frames[-self.cuff.profile.memory:])
+
+    async def stop_notify(self, char: Any) -> None:
+        self._callbacks.pop(getattr(char, "uuid", char), None)
+
+    async def read_gatt_char(self, _char: Any) -> bytearray:
+        return bytearray((self.cuff.battery,))
+
+    async def write_gatt_char(self, _char: Any, data: bytes, response: bool) -> None:  # noqa: ARG002, FBT001
+        """Answer a record access request for all records or those at or after a time."""
+        selected = self.cuff.frames
+        if data[1] == 0x03:  # noqa: PLR2004, greater or equal to the user facing time
+            since = struct.unpack_from("<H5B", data, 3)
+            selected = [frame for frame in selected if struct.unpack_from("<H5B", frame, 7) >= since]
+        if data[0] == 0x04:  # noqa: PLR2004, number of records
+            self._callbacks[RECORD_ACCESS_CONTROL_POINT_UUID](
+                None, bytearray(bytes((0x05, 0)) + len(selected).to_bytes(2, "little")))
+        else:
+            self._send(selected, after=bytes((0x06, 0, data[0], 0x01)))
+
+    async def clear_cache(self) -> None:
+        """Nothing is cached."""
+
+    async def disconnect(self) -> None:
+        if not self.connected:
+            return
+        self.connected = False
+        for task in list(self._senders):
+            task.cancel()
+        self._on_disconnect()
+
+
+@dataclass(slots=True)
+class LoadStats:
+    """Counters of the simulation."""
+
+    measurements: int = 0
+    advertisements: int = 0
+    unrecognised_advertisements: int = 0
+    notifications: int = 0
+    connections: int = 0
+    injected_failures: int = 0
+    not_connectable: int = 0
+    slots_exhausted: int = 0
+    events: int = 0
+    state_writes: int = 0
+    delivery_delay: Histogram = field(default_factory=lambda: Histogram(DURATION_BOUNDS))
+    loop_lag: Histogram = field(default_factory=lambda: Histogram(LAG_BOUNDS))
+
+
+class SimulatedProxy:
+    """Bluetooth proxies with a limited number of connection slots each."""
+
+    def __init__(self, cuffs: dict[str, SimulatedCuff], profile: CuffProfile, stats: LoadStats,
+                 rng: random.Random) -> None:
+        self.cuffs = cuffs
+        self.profile = profile
+        self.stats = stats
+        self.rng = rng
+        self.active: dict[str, int] = {}
+
+    async def establish_connection(self, _client_class: type, device: BLEDevice, _name: str,
+                                   **_kwargs: Any) -> SimulatedBleakClient:
+        """Connect to a cuff, used in place of `bleak_retry_connector.establish_connection`."""
+        cuff = self.cuffs[device.address]
+        source = cuff.source
+        if self.active.get(source, 0) >= self.profile.proxy_slots:
+            self.stats.slots_exhausted += 1
+            raise SimulatedConnectionError(cuff.name, f"{source} has no free connection slot")
+        self.active[source] = self.active.get(source, 0) + 1
+        try:
+            await asyncio.sleep(self.profile.connect_delay + self.rng.uniform(0, self.profile.connect_jitter))
+        except asyncio.CancelledError:
+            self.active[source] -= 1
+            raise
+        error = self._connect_error(cuff)
+        if error is not None:
+            self.active[source] -= 1
+            raise error
+        self.stats.connections += 1
+
+        def release() -> None:
+            self.active[source] -= 1
+
+        return SimulatedBleakClient(cuff, release, self.stats)
+
+    def _connect_error(self, cuff: SimulatedCuff) -> SimulatedConnectionError | None:
+        if self.rng.random() < self.profile.failure_rate:
+            self.stats.injected_failures += 1
+            return SimulatedConnectionError(cuff.name, "injected failure")
+        if not cuff.awake:
+            self.stats.not_connectable += 1
+            return SimulatedConnectionError(cuff.name, "not advertising")
+        return None
+
+    def ble_device_from_address(self, _hass: HomeAssistant, address: str, connectable: bool = True) -> BLEDevice | None:  # noqa: FBT001, FBT002, ARG002
+        """Return the device of a known cuff, used in place of `bluetooth.async_ble_device_from_address`."""
+        cuff = self.cuffs.get(address)
+        return cuff.ble_device if cuff is not None else None
+
+    def last_service_info(self, _hass: HomeAssistant, address: str,
+                          connectable: bool = True) -> bluetooth.BluetoothServiceInfoBleak | None:  # noqa: FBT001, FBT002, ARG002
+        """Return the latest advertisement of a known cuff, used in place of `bluetooth.async_last_service_info`."""
+        cuff = self.cuffs.get(address)
+        return cuff.service_info(time.monotonic()) if cuff is not None else None
+
+
+@dataclass(slots=True)
+class LoadReport:
+    """Result of a load run."""
+
+    devices: int
+    duration: float
+    delivered: int
+    stats: LoadStats
+    sessions: dict[str, int]
+    memory_per_device: float | None = None  # KiB
+    memory_peak: float | None = None  # KiB
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the report as plain values."""
+        return {
+            "devices": self.devices,
+            "duration_s": round(self.duration, 2),
+            "measurements": self.stats.measurements,
+            "delivered": self.delivered,
+            "delivered_per_s": round(self.delivered / self.duration, 2),
+            "notifications_per_s": round(self.stats.notifications / self.duration, 2),
+            "advertisements": self.stats.advertisements,
+            "unrecognised_advertisements": self.stats.unrecognised_advertisements,
+            "connections": self.stats.connections,
+            "injected_failures": self.stats.injected_failures,
+            "not_connectable": self.stats.not_connectable,
+            "slots_exhausted": self.stats.slots_exhausted,
+            "events": self.stats.events,
+            "state_writes": self.stats.state_writes,
+            "sessions": self.sessions,
+            "delivery_delay_s": self.stats.delivery_delay.as_dict(),
+            "loop_lag_ms": self.stats.loop_lag.as_dict(),
+            "memory_per_device_kib": self.memory_per_device,
+            "memory_peak_kib": self.memory_peak,
+        }
+
+
+class LoadHarness:
+    """Run N simulated cuffs against real coordinators and entities.
+
+    Use as async context manager; the Bluetooth functions of Home Assistant
+    and the connection establishment are replaced while it is entered. Each
+    cuff gets a config entry, its entities are set up by the sensor platform
+    of the integration and added through an entity platform, so `hass` needs
+    the integration loader and a loaded entity registry (see `run_load`).
+    """
+
+    def __init__(  # noqa: PLR0913
+            self,
+            hass: HomeAssistant,
+            devices: int,
+            profile: CuffProfile | None = None,
+            timing: Timing | None = None,
+            *,
+            seed: int = 0,
+            trace_memory: bool = False,
+    ) -> None:
+        self.hass = hass
+        self.profile = profile or CuffProfile()
+        self.timing = timing or Timing()
+        self.rng = random.Random(seed)
+        self.trace_memory = trace_memory
+        self.stats = LoadStats()
+        self.cuffs = {cuff.address: cuff for cuff in (SimulatedCuff(index, self.profile, random.Random(seed + index))
+                                                      for index in range(devices))}
+        for cuff in self.cuffs.values():
+            for _ in range(self.profile.backlog):
+                cuff.measure()
+        self.proxy = SimulatedProxy(self.cuffs, self.profile, self.stats, self.rng)
+        self.matcher = AdvertisementMatcher()
+        self.coordinators: dict[str, sensor.MedisanaCoordinator] = {}
+        self.entries: dict[str, ConfigEntry] = {}
+        self.platforms: list[EntityPlatform] = []
+        self._callbacks: dict[str, Callable[[bluetooth.BluetoothServiceInfoBleak, Any], None]] = {}
+        self._exit_stack = ExitStack()
+        self._stopping = False
+        self._memory_baseline = 0
+
+    def _register_callback(self, _hass: HomeAssistant, callback: Callable[..., None],
+                           matcher: dict[str, Any], _mode: Any) -> Callable[[], None]:
+        address = matcher["address"]
+        self._callbacks[address] = callback
+        return lambda: self._callbacks.pop(address, None)
+
+    async def _setup_entry(self, cuff: SimulatedCuff) -> None:
+        """Set up a cuff like `async_setup_entry` of the integration, with scaled down timings."""
+        entry = ConfigEntry(
+            data={},
+            discovery_keys=MappingProxyType({}),
+            domain=DOMAIN,
+            minor_version=1,
+            options={CONF_MAX_SESSION_DURATION: self.timing.max_session_duration},
+            source=SOURCE_BLUETOOTH,
+            subentries_data=None,
+            title=cuff.name,
+            unique_id=cuff.address,
+            version=1,
+        )
+        coordinator = sensor.MedisanaCoordinator(self.hass, cuff.address, entry.options)
+        coordinator.scheduler = ConnectionScheduler(
+            coordinator.connect_and_subscribe,
+            name=cuff.name,
+            debounce=self.timing.debounce,
+            cooldown=self.timing.cooldown,
+            backoff_initial=self.timing.backoff_initial,
+            backoff_max=self.timing.backoff_max,
+        )
+        self.hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+        self.coordinators[cuff.address] = coordinator
+        self.entries[cuff.address] = entry
+
+        platform = EntityPlatform(hass=self.hass, logger=_LOGGER, domain="sensor", platform_name=DOMAIN,
+                                  platform=None, scan_interval=timedelta(seconds=30), entity_namespace=None)
+        self.platforms.append(platform)
+
+        @callback
+        def add_entities(entities: Iterable[Entity]) -> None:
+            self.hass.async_create_task(platform.async_add_entities(entities))
+
+        await sensor.async_setup_entry(self.hass, entry, add_entities)
+
+    async def __aenter__(self) -> LoadHarness:
+        """Replace the Bluetooth functions and create the coordinators and entities."""
+        if self.trace_memory:
+            tracemalloc.start()
+            self._memory_baseline = tracemalloc.get_traced_memory()[0]
+        stack = self._exit_stack
+        stack.enter_context(patch.object(bluetooth, "async_register_callback", self._register_callback))
+        stack.enter_context(patch.object(bluetooth, "async_ble_device_from_address",
+                                         self.proxy.ble_device_from_address))
+        stack.enter_context(patch.object(bluetooth, "async_last_service_info", self.proxy.last_service_info))
+        stack.enter_context(patch.object(sensor, "establish_connection", self.proxy.establish_connection))
+        stack.enter_context(patch.object(session, "DEFAULT_IDLE_GAP", self.timing.idle_gap))
+        stack.enter_context(patch.object(session, "MIN_IDLE_GAP", self.timing.min_idle_gap))
+        stack.callback(self.hass.bus.async_listen(EVENT_MEASUREMENT, self._measurement_event))
+        for event_type in (EVENT_STATE_CHANGED, EVENT_STATE_REPORTED):
+            stack.callback(self.hass.bus.async_listen(event_type, self._state_written, self._is_sensor))
+        for cuff in self.cuffs.values():
+            await self._setup_entry(cuff)
+        await self.hass.async_block_till_done()
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        """Unload the entities, config entries and coordinators and restore the Bluetooth functions."""
+        for platform in self.platforms:
+            await platform.async_reset()
+        for address, coordinator in self.coordinators.items():
+            entry = self.entries[address]
+            # As Home Assistant does when unloading the entry
+            await entry._async_process_on_unload(self.hass)
+            await coordinator.async_will_remove_from_hass()
+            self.hass.data[DOMAIN].pop(entry.entry_id, None)
+        self._exit_stack.close()
+        if self.trace_memory:
+            tracemalloc.stop()
+
+    @callback
+    def _is_sensor(self, event_data: dict[str, Any]) -> bool:
+        return bool(event_data["entity_id"].startswith("sensor."))
+
+    def _state_written(self, _event: Event) -> None:
+        self.stats.state_writes += 1
+
+    def _measurement_event(self, event: Event) -> None:
+        self.stats.events += 1
+        measured_at = self.cuffs[event.data["address"]].measured_at.pop(event.data["timestamp"], None)
+        if measured_at is not None:
+            self.stats.delivery_delay.add(self.hass.loop.time() - measured_at)
+
+    def advertise(self, cuff: SimulatedCuff) -> None:
+        """Deliver an advertisement of a cuff to the matcher and the coordinator."""
+        service_info = cuff.service_info(time.monotonic())
+        self.stats.advertisements += 1
+        if not self.matcher.supported(service_info):
+            self.stats.unrecognised_advertisements += 1
+            return
+        callback = self._callbacks.get(cuff.address)
+        if callback is not None:
+            callback(service_info, bluetooth.BluetoothChange.ADVERTISEMENT)
+
+    async def _run_cuff(self, cuff: SimulatedCuff) -> None:
+        loop = asyncio.get_running_loop()
+        profile = self.profile
+        # The cuffs measure at different times
+        await asyncio.sleep(cuff.rng.uniform(0, profile.measurement_interval))
+        while not self._stopping:
+            cuff.measure(loop.time())
+            self.stats.measurements += 1
+            cuff.awake = True
+            until = loop.time() + profile.advertising_window
+            while loop.time() < until:
+                self.advertise(cuff)
+                await asyncio.sleep(profile.advertisement_interval * cuff.rng.uniform(0.8, 1.2))
+            cuff.awake = False
+            await asyncio.sleep(max(profile.measurement_interval - profile.advertising_window, 0.0))
+
+    async def _monitor_loop_lag(self, interval: float = 0.01) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            self.stats.loop_lag.add((loop.time() - start - interval) * 1000)
+
+    async def run(self, duration: float, drain: float = 10.0) -> LoadReport:
+        """Let the cuffs measure for `duration` seconds, wait up to `drain` seconds for the sessions to end.
+
+        Cuffs that measured before the end still advertise for their whole window.
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        tasks = [loop.create_task(self._run_cuff(cuff)) for cuff in self.cuffs.values()]
+        monitor = loop.create_task(self._monitor_loop_lag())
+        await asyncio.sleep(duration)
+        self._stopping = True
+        # Cuffs sleeping until their next measurement are stopped right away
+        for task, cuff in zip(tasks, self.cuffs.values(), strict=True):
+            if not cuff.awake:
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        deadline = loop.time() + drain
+        while loop.time() < deadline and any(c.scheduler.busy for c in self.coordinators.values()):
+            await asyncio.sleep(0.05)
+        monitor.cancel()
+        await asyncio.gather(monitor, return_exceptions=True)
+        elapsed = loop.time() - start
+
+        sessions = {"started": 0, "coalesced": 0, "failed": 0}
+        for coordinator in self.coordinators.values():
+            stats = coordinator.scheduler.stats
+            sessions["started"] += stats["sessions_started"]
+            sessions["coalesced"] += stats["sessions_coalesced"]
+            sessions["failed"] += stats["sessions_failed"]
+        report = LoadReport(
+            devices=len(self.cuffs),
+            duration=elapsed,
+            delivered=sum(coordinator.aggregates.count() for coordinator in self.coordinators.values()),
+            stats=self.stats,
+            sessions=sessions,
+        )
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            report.memory_per_device = round((current - self._memory_baseline) / len(self.cuffs) / 1024, 1)
+            report.memory_peak = round(peak / 1024, 1)
+        return report
+
+
+async def run_load(devices: int, duration: float, profile: CuffProfile | None = None,
+                   timing: Timing | None = None, *, trace_memory: bool = False) -> LoadReport:
+    """Run a load test in a fresh Home Assistant instance."""
+    hass = HomeAssistant(tempfile.mkdtemp())
+    loader.async_setup(hass)
+    await er.async_load(hass)
+    try:
+        async with LoadHarness(hass, devices, profile, timing, trace_memory=trace_memory) as harness:
+            return await harness.run(duration)
+    finally:
+        await hass.async_stop(force=True)
+
+
+def main() -> int:
+    """Run load tests for each number of devices and print a summary."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--devices", type=int, nargs="+", default=[1, 10, 100])
+    arg_parser.add_argument("--duration", type=float, default=20.0, help="seconds the cuffs measure")
+    arg_parser.add_argument("--measurement-interval", type=float, default=10.0)
+    arg_parser.add_argument("--burst", type=int, default=60, help="stored measurements sent per connection")
+    arg_parser.add_argument("--failure-rate", type=float, default=0.0, help="share of failing connection attempts")
+    arg_parser.add_argument("--connect-delay", type=float, default=0.1)
+    arg_parser.add_argument("--proxies", type=int, default=1)
+    arg_parser.add_argument("--record-access", action="store_true", help="cuffs with a record access control point")
+    arg_parser.add_argument("--memory", action="store_true", help="trace allocations (slows the run down)")
+    args = arg_parser.parse_args()
+    # Injected failures are logged with a traceback by the coordinator
+    logging.getLogger(sensor.__package__).setLevel(logging.CRITICAL)
+
+    print(f"{'devices':>7} {'delivered/s':>11} {'notif/s':>8} {'delay mean':>10} {'delay max':>9} "
+          f"{'lag mean':>8} {'lag max':>8} {'failed':>6} {'KiB/dev':>8}")
+    for devices in args.devices:
+        profile = CuffProfile(
+            measurement_interval=args.measurement_interval,
+            memory=args.burst,
+            failure_rate=args.failure_rate,
+            connect_delay=args.connect_delay,
+            proxies=args.proxies,
+            record_access=args.record_access,
+        )
+        report = asyncio.run(run_load(devices, args.duration, profile, trace_memory=args.memory)).as_dict()
+        delay, lag = report["delivery_delay_s"], report["loop_lag_ms"]
+        print(f"{devices:>7} {report['delivered_per_s']:>11.1f} {report['notifications_per_s']:>8.1f} "
+              f"{delay['mean'] or 0:>10.2f} {delay['max'] or 0:>9.2f} {lag['mean'] or 0:>8.2f} {lag['max'] or 0:>8.1f} "
+              f"{report['sessions']['failed']:>6} {report['memory_per_device_kib'] or 0:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""Benchmark suite for the hot paths of the integration.
+
+Measures, on synthetic corpora from `benchmarks.corpus`:
+
+- `parse_blood_pressure` and `parse_measurement` on frames covering every flag combination
+- discovery matching of an advertisement storm and ranking of the picker candidates
+- `notification_handler` of the coordinator through the update fan-out to all entities,
+  for new and for resent measurements
+- growth of the measurement history beyond 10k records, and adds to a full history
+
+Results are in µs per operation. `--save` stores them as baseline, `--check`
+compares a run with the baseline and fails if a case got slower than the
+tolerance allows. Baselines are only comparable on the same machine.
+
+Run from the repository root:
+
+    python -m benchmarks.suite [--check | --save]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+from datetime import datetime
+import json
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+from custom_components.medisana_blood_pressure import sensor
+from custom_components.medisana_blood_pressure.medisana_bp.history import (
+    MeasurementHistory,
+)
+from custom_components.medisana_blood_pressure.medisana_bp.matcher import (
+    AdvertisementMatcher,
+    rank_candidates,
+)
+from custom_components.medisana_blood_pressure.medisana_bp.parser import (
+    parse_blood_pressure,
+    parse_measurement,
+)
+from custom_components.medisana_blood_pressure.medisana_bp.reading import (
+    MeasurementRecord,
+)
+from homeassistant.components import bluetooth
+from homeassistant.core import HomeAssistant
+
+from .corpus import build_advertisement_storm, build_corpus, build_memory_dump
+
+BASELINE = Path(__file__).with_name("baseline.json")
+MAC_ADDRESS = "AA:BB:CC:DD:EE:FF"
+RECEIVED = datetime(2025, 9, 1, 12, 0, 0)
+
+
+def best_of(repeat: int, run: Callable[[], int]) -> float:
+    """Return the best time per operation in µs; `run` returns its number of operations."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operations = run()
+        best = min(best, (time.perf_counter() - start) / operations)
+    return best * 1e6
+
+
+def bench_parser(repeat: int) -> dict[str, float]:
+    """Time the frame parser."""
+    corpus = build_corpus(10_000)
+
+    def run() -> int:
+        for frame in corpus:
+            parse_blood_pressure(frame)
+        return len(corpus)
+
+    def run_measurement() -> int:
+        for frame in corpus:
+            parse_measurement(frame, RECEIVED)
+        return len(corpus)
+
+    return {
+        "parse_blood_pressure": best_of(repeat, run),
+        "parse_measurement": best_of(repeat, run_measurement),
+    }
+
+
+def bench_discovery(repeat: int) -> dict[str, float]:
+    """Time matching an advertisement storm and ranking the picker candidates."""
+    storm = build_advertisement_storm(20_000)
+    latest = list({advertisement.address: advertisement for advertisement in storm}.values())
+
+    def run_storm() -> int:
+        matcher = AdvertisementMatcher()
+        for advertisement in storm:
+            matcher.supported(advertisement)
+        return len(storm)
+
+    def run_rank() -> int:
+        rank_candidates(latest)
+        return 1
+
+    return {
+        "supported_storm": best_of(repeat, run_storm),
+        "rank_candidates_200": best_of(repeat, run_rank),
+    }
+
+
+def bench_history(repeat: int) -> dict[str, float]:
+    """Time growing the history to 20k records, in order and out of order, and adding them to a full history."""
+    records = [parse_measurement(frame, RECEIVED) for frame in build_memory_dump(20_000)]
+    shuffled = random.Random(0).sample(records, len(records))
+
+    def run(ordered: list[MeasurementRecord]) -> Callable[[], int]:
+        def add_all() -> int:
+            history = MeasurementHistory(max_records=len(ordered), max_age=None)
+            for record in ordered:
+                history.add(record)
+            return len(ordered)
+        return add_all
+
+    history = MeasurementHistory(max_records=len(records), max_age=None)
+    for record in records:
+        history.add(record)
+
+    def run_full() -> int:
+        # The second half of the records each evicts the oldest one
+        history = MeasurementHistory(max_records=len(records) // 2, max_age=None)
+        for record in records:
+            history.add(record)
+        return len(records)
+
+    def run_views() -> int:
+        for _ in range(1000):
+            history.latest_for_user(1)
+            history.as_dict(10)
+        return 1000
+
+    return {
+        "history_add_20k": best_of(repeat, run(records)),
+        "history_add_20k_shuffled": best_of(repeat, run(shuffled)),
+        "history_add_20k_full": best_of(repeat, run_full),
+        "history_views_20k": best_of(repeat, run_views),
+    }
+
+
+async def _bench_coordinator(repeat: int) -> dict[str, float]:
+    hass = HomeAssistant(tempfile.mkdtemp())
+    with patch.object(bluetooth, "async_register_callback", return_value=lambda: None):
+        coordinator = sensor.MedisanaCoordinator(hass, MAC_ADDRESS, {})
+    # As set by the advertisement and a previous battery read
+    coordinator._rssi = -60
+    coordinator.battery.update(b"\x5a", 0.0)
+
+    entities = [cls(coordinator) for cls in (sensor.MbpsMeanArterial, sensor.MbpsRssi, sensor.MbpsPulse,
+                                             sensor.MbpsSystolic, sensor.MbpsDiastolic, sensor.MbpsUserId,
+                                             sensor.MbpsLastMeasurement, sensor.MbpsBattery)]
+    entities += [cls(coordinator, user_id=user_id) for user_id in (1, 2) for cls in sensor.USER_SENSORS]
+    for index, entity in enumerate(entities):
+        entity.hass = hass
+        entity.entity_id = f"sensor.medisana_bench_{index}"
+
+        def write_state(entity: sensor.SensorEntity = entity) -> None:
+            hass.states.async_set(entity.entity_id, str(entity.native_value), entity.extra_state_attributes)
+
+        entity.async_write_ha_state = write_state  # type: ignore[method-assign]
+        coordinator.async_add_listener(entity._handle_coordinator_update)
+
+    dump = build_memory_dump(500)
+    offset = 0
+
+    def run_new() -> int:
+        # Every repetition transfers measurements the coordinator has not seen yet
+        nonlocal offset
+        offset += 1
+        for frame in dump:
+            data = bytearray(frame)
+            data[13] = offset % 60
+            coordinator.notification_handler(None, data)  # type: ignore[arg-type]
+        coordinator._async_publish_update()
+        return len(dump)
+
+    def run_resent() -> int:
+        for frame in dump:
+            coordinator.notification_handler(None, bytearray(frame))  # type: ignore[arg-type]
+        coordinator._async_publish_update()
+        return len(dump)
+
+    results = {
+        "notification_new_fanout": best_of(repeat, run_new),
+        "notification_resent": best_of(repeat, run_resent),
+    }
+    await coordinator.async_will_remove_from_hass()
+    await hass.async_stop(force=True)
+    return results
+
+
+def bench_coordinator(repeat: int) -> dict[str, float]:
+    """Time notifications through the coordinator and the update fan-out to all entities."""
+    return asyncio.run(_bench_coordinator(repeat))
+
+
+BENCHMARKS = (bench_parser, bench_discovery, bench_history, bench_coordinator)
+
+
+def main() -> int:
+    """Run the suite, print the results and compare them with the baseline."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--save", action="store_true", help="store the results as baseline")
+    arg_parser.add_argument("--check", action="store_true", help="fail if a case is slower than the baseline")
+    arg_parser.add_argument("--tolerance", type=float, default=0.5,
+                            help="allowed slowdown relative to the baseline (default: 0.5 = 50%%)")
+    arg_parser.add_argument("--baseline", type=Path, default=BASELINE)
+    args = arg_parser.parse_args()
+
+    results: dict[str, float] = {}
+    for benchmark in BENCHMARKS:
+        results.update(benchmark(args.repeat))
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    regressions = []
+    for name, value in results.items():
+        line = f"{name:>28}: {value:10.3f} µs"
+        if name in baseline:
+            ratio = value / baseline[name]
+            line += f"  ({ratio:5.2f}x baseline)"
+            if ratio > 1 + args.tolerance:
+                regressions.append(name)
+        print(line)
+
+    if args.save:
+        args.baseline.write_text(json.dumps({name: round(value, 4) for name, value in results.items()}, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+    if args.check and regressions:
+        print(f"Slower than the baseline: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
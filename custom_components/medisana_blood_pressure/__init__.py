@@ -6,14 +6,17 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN
-from .sensor import MedisanaCoordinator
+from .const import DATA_CONNECTION_POOL, DOMAIN
+from .medisana_bp.archive import FrameArchive
+from .sensor import MedisanaCoordinator, archive_path
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:#noqa ARG001
     """Set up via configuration.yaml (nicht verwendet)."""
+    async_setup_services(hass)
     return True  # Oder False, wenn du nur config flow unterstützen möchtest
 
 
@@ -24,15 +27,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
 
     mac_address = str(entry.unique_id).upper()
-    coordinator = MedisanaCoordinator(hass, mac_address)
+    coordinator = MedisanaCoordinator(hass, mac_address, entry.options)
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await coordinator.async_config_entry_first_refresh()
 
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     coordinator: MedisanaCoordinator = hass.data[DOMAIN].get(entry.entry_id)
@@ -42,5 +51,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_forward_entry_unload(entry, "sensor")
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id, None)
+        if not hass.data[DOMAIN]:
+            # The last monitor was unloaded
+            hass.data.pop(DATA_CONNECTION_POOL, None)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the measurement archive when the config entry is removed."""
+    archive = FrameArchive(archive_path(hass, str(entry.unique_id).upper()))
+    await hass.async_add_executor_job(archive.remove)
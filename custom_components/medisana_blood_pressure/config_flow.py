@@ -9,12 +9,37 @@ from homeassistant.components.bluetooth import (
     BluetoothServiceInfoBleak,
     async_discovered_service_info,
 )
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import callback
 import voluptuous as vol
 
-from .const import DOMAIN
-from .medisana_bp import MedisanaBPBluetoothDeviceData
+from .const import (
+    CONF_ADAPTIVE_SESSION,
+    CONF_BATTERY_REFRESH_INTERVAL,
+    CONF_BATTERY_REFRESH_SESSIONS,
+    CONF_DEBUG_LOGGING,
+    CONF_HISTORY_MAX_AGE,
+    CONF_HISTORY_SIZE,
+    CONF_IMPORT_STATISTICS,
+    CONF_MAX_SESSION_DURATION,
+    DEFAULT_ADAPTIVE_SESSION,
+    DEFAULT_BATTERY_REFRESH_INTERVAL,
+    DEFAULT_BATTERY_REFRESH_SESSIONS,
+    DEFAULT_DEBUG_LOGGING,
+    DEFAULT_HISTORY_MAX_AGE,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_IMPORT_STATISTICS,
+    DEFAULT_MAX_SESSION_DURATION,
+    DOMAIN,
+)
+from .medisana_bp import MedisanaBPBluetoothDeviceData, helpers, matcher
+from .medisana_bp.supported_devices import DEVICE_TITLE
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,6 +55,12 @@ class MedisanaBPConfigFlow(ConfigFlow, domain=DOMAIN):
         self._discovered_device: MedisanaBPBluetoothDeviceData | None = None
         self._discovered_devices: dict[str, str] = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:  # noqa ARG004
+        """Return the options flow."""
+        return MedisanaBPOptionsFlow()
+
     async def async_step_bluetooth(
         self, discovery_info: BluetoothServiceInfoBleak
     ) -> ConfigFlowResult:
@@ -37,12 +68,11 @@ class MedisanaBPConfigFlow(ConfigFlow, domain=DOMAIN):
         _LOGGER.debug("MedisanaBPConfigFlow async_step_bluetooth")
         await self.async_set_unique_id(discovery_info.address)
         self._abort_if_unique_id_configured()
-        device = MedisanaBPBluetoothDeviceData()
-        if not device.supported(discovery_info):
-            _LOGGER.warning(f"Device {discovery_info} is not supported")
+        if not matcher.supported(discovery_info):
+            _LOGGER.warning("Device %s is not supported", discovery_info.name)
             return self.async_abort(reason="not_supported")
         self._discovery_info = discovery_info
-        self._discovered_device = device
+        self._discovered_device = MedisanaBPBluetoothDeviceData()
         return await self.async_step_bluetooth_confirm()
 
     async def async_step_bluetooth_confirm(
@@ -74,20 +104,19 @@ class MedisanaBPConfigFlow(ConfigFlow, domain=DOMAIN):
             address = user_input[CONF_ADDRESS]
             await self.async_set_unique_id(address, raise_on_progress=False)
             self._abort_if_unique_id_configured()
-            return self.async_create_entry(
-                title=self._discovered_devices[address], data={}
-            )
+            return self.async_create_entry(title=DEVICE_TITLE, data={})
 
-        current_addresses = self._async_current_ids()
-        for discovery_info in async_discovered_service_info(self.hass,connectable= False):
-            address = discovery_info.address
-            if address in current_addresses or address in self._discovered_devices:
-                continue
-            device = MedisanaBPBluetoothDeviceData()
-            if device.supported(discovery_info):
-                self._discovered_devices[address] = (
-                    device.title or device.get_device_name() or discovery_info.name
-                )
+        if not self._discovered_devices:
+            # The verdicts of the shared matcher are cached per address, only
+            # advertisements that changed since the last scan are matched again
+            candidates = matcher.rank_candidates(
+                async_discovered_service_info(self.hass, connectable=False),
+                exclude=self._async_current_ids(),
+            )
+            self._discovered_devices = {
+                info.address: f"{info.name or DEVICE_TITLE} ({helpers.mask_mac(info.address)}, {info.rssi} dBm)"
+                for info in candidates
+            }
 
         if not self._discovered_devices:
             _LOGGER.debug("No discovered devices found")
@@ -99,4 +128,56 @@ class MedisanaBPConfigFlow(ConfigFlow, domain=DOMAIN):
             data_schema=vol.Schema(
                 {vol.Required(CONF_ADDRESS): vol.In(self._discovered_devices)}
             ),
-        )
\ No newline at end of file
+        )
+
+
+class MedisanaBPOptionsFlow(OptionsFlow):
+    """Handle the options of a MedisanaBP config entry."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the connection and history options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_ADAPTIVE_SESSION,
+                        default=options.get(CONF_ADAPTIVE_SESSION, DEFAULT_ADAPTIVE_SESSION),
+                    ): bool,
+                    vol.Required(
+                        CONF_MAX_SESSION_DURATION,
+                        default=options.get(CONF_MAX_SESSION_DURATION, DEFAULT_MAX_SESSION_DURATION),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=300)),
+                    vol.Required(
+                        CONF_HISTORY_SIZE,
+                        default=options.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100000)),
+                    vol.Required(
+                        CONF_HISTORY_MAX_AGE,
+                        default=options.get(CONF_HISTORY_MAX_AGE, DEFAULT_HISTORY_MAX_AGE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=36500)),
+                    vol.Required(
+                        CONF_BATTERY_REFRESH_INTERVAL,
+                        default=options.get(CONF_BATTERY_REFRESH_INTERVAL, DEFAULT_BATTERY_REFRESH_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=8760)),
+                    vol.Required(
+                        CONF_BATTERY_REFRESH_SESSIONS,
+                        default=options.get(CONF_BATTERY_REFRESH_SESSIONS, DEFAULT_BATTERY_REFRESH_SESSIONS),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+                    vol.Required(
+                        CONF_IMPORT_STATISTICS,
+                        default=options.get(CONF_IMPORT_STATISTICS, DEFAULT_IMPORT_STATISTICS),
+                    ): bool,
+                    vol.Required(
+                        CONF_DEBUG_LOGGING,
+                        default=options.get(CONF_DEBUG_LOGGING, DEFAULT_DEBUG_LOGGING),
+                    ): bool,
+                }
+            ),
+        )
@@ -1,5 +1,55 @@
 """Constants for MedisanaBP BLE."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.util.hass_dict import HassKey
+
+if TYPE_CHECKING:
+    from .medisana_bp.pool import ConnectionPool
 
 DOMAIN = "medisana_blood_pressure"
-BP_MEASUREMENT_UUID = "00002a35-0000-1000-8000-00805f9b34fb"
-CHARACTERISTIC_BATTERY = "00002a19-0000-1000-8000-00805f9b34fb"
+# Connection pool shared by all monitors, hass.data[DOMAIN] only holds the coordinators by config entry id
+DATA_CONNECTION_POOL: HassKey[ConnectionPool] = HassKey(f"{DOMAIN}_connection_pool")
+
+# New measurements are written to the archive in batches after this delay (seconds)
+ARCHIVE_WRITE_DELAY = 10
+
+# Measurements received within this window (seconds) are published with one coordinator update
+UPDATE_BATCH_WINDOW = 1
+
+# Fired once for every received measurement
+EVENT_MEASUREMENT = f"{DOMAIN}_measurement"
+
+# Dispatched with the new user ids once measurements of users without entities arrive
+SIGNAL_NEW_USERS = f"{DOMAIN}_new_users_{{}}"
+
+# Number of measurements exposed as attributes of the last measurement sensor
+LAST_MEASUREMENT_ATTRIBUTE_RECORDS = 10
+
+# Services
+SERVICE_GET_MEASUREMENTS = "get_measurements"
+SERVICE_DUMP_FRAMES = "dump_frames"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_OFFSET = "offset"
+ATTR_LIMIT = "limit"
+MAX_PAGE_SIZE = 1000
+
+# Options
+CONF_ADAPTIVE_SESSION = "adaptive_session"
+CONF_MAX_SESSION_DURATION = "max_session_duration"
+CONF_HISTORY_SIZE = "history_size"
+CONF_HISTORY_MAX_AGE = "history_max_age"
+CONF_DEBUG_LOGGING = "debug_logging"
+CONF_IMPORT_STATISTICS = "import_statistics"
+CONF_BATTERY_REFRESH_INTERVAL = "battery_refresh_interval"
+CONF_BATTERY_REFRESH_SESSIONS = "battery_refresh_sessions"
+
+DEFAULT_ADAPTIVE_SESSION = True
+DEFAULT_MAX_SESSION_DURATION = 60
+DEFAULT_HISTORY_SIZE = 1000
+DEFAULT_HISTORY_MAX_AGE = 365  # days, 0 keeps records of any age
+DEFAULT_DEBUG_LOGGING = False
+DEFAULT_IMPORT_STATISTICS = False
+DEFAULT_BATTERY_REFRESH_INTERVAL = 24  # hours, 0 disables the interval
+DEFAULT_BATTERY_REFRESH_SESSIONS = 0  # sessions, 0 disables the session count
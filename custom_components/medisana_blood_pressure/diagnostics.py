@@ -0,0 +1,71 @@
+"""Diagnostics support for Medisana Blood Pressure."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ADDRESS, CONF_NAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .medisana_bp import helpers
+
+if TYPE_CHECKING:
+    from .sensor import MedisanaCoordinator
+
+TO_REDACT = {CONF_ADDRESS, CONF_NAME}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return the connection metrics and the state of the coordinator."""
+    diagnostics = {
+        "entry": {CONF_ADDRESS: entry.unique_id, CONF_NAME: entry.title, **entry.data},
+        "options": dict(entry.options),
+    }
+    coordinator: MedisanaCoordinator | None = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if coordinator is None:
+        # The entry is not loaded, e.g. its setup failed
+        return async_redact_data(diagnostics, TO_REDACT)
+
+    history = coordinator.history
+    return async_redact_data({
+        **diagnostics,
+        "device": helpers.mask_mac(coordinator.mac_address),
+        "scheduler": {
+            **coordinator.scheduler.stats,
+            "failures_by_error": dict(coordinator.scheduler.failures_by_error),
+            "busy": coordinator.scheduler.busy,
+        },
+        "session": {
+            "adaptive": coordinator.session_timer.adaptive,
+            "max_duration": coordinator.session_timer.max_duration,
+            "idle_gap": coordinator.session_timer.idle_gap,
+            "interval": coordinator.session_timer.interval,
+        },
+        "battery": {
+            "level": coordinator.battery.level,
+            "reads": coordinator.battery.reads,
+            "refresh_interval": coordinator.battery.refresh_interval,
+            "refresh_sessions": coordinator.battery.refresh_sessions,
+        },
+        "connection_pool": coordinator.pool.as_dict(),
+        "gatt_service_filter": coordinator.gatt_layout.service_filter,
+        "metrics": coordinator.metrics.as_dict(hass.loop.time()),
+        "history": {
+            "records": len(history),
+            "max_records": history.max_records,
+            "latest_timestamp": history.latest_timestamp.isoformat() if history.latest_timestamp else None,
+            "users": sorted(user_id for user_id in history.users if user_id is not None),
+            "memory_bytes": history.memory_usage(),
+        },
+        "measurement_counts": {
+            "all": coordinator.aggregates.count(),
+            **{f"user_{user_id}": coordinator.aggregates.count(user_id) for user_id in sorted(coordinator.user_ids)},
+        },
+        "deduplicator": {
+            "frames": len(coordinator.deduplicator),
+            "suppressed": coordinator.deduplicator.suppressed,
+        },
+        "raw_frames": len(coordinator.debug_log.frames()),
+    }, TO_REDACT)
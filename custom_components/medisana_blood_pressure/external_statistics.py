@@ -0,0 +1,119 @@
+"""Import of Medisana Blood Pressure measurements into long-term statistics."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfPressure
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .medisana_bp.history import MeasurementHistory
+from .medisana_bp.hourly import hour_start, hourly_statistics
+from .medisana_bp.reading import MeasurementRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+# Field of the record, name and unit of the statistic
+STATISTICS = (
+    ("systolic", "Systolic Pressure", UnitOfPressure.MMHG),
+    ("diastolic", "Diastolic Pressure", UnitOfPressure.MMHG),
+    ("mean_arterial_pressure", "Mean Arterial Pressure", UnitOfPressure.MMHG),
+    ("pulse_rate", "Heart Rate", "bpm"),
+)
+
+
+def to_utc(time: datetime) -> datetime:
+    """Convert a naive local time of the device to UTC."""
+    return dt_util.as_utc(time.replace(tzinfo=dt_util.get_default_time_zone()))
+
+
+def statistic_id(mac_address: str, key: str, user_id: int | None) -> str:
+    """Return the id of the external statistic of a field and user."""
+    object_id = f"{mac_address.replace(':', '').lower()}_{key}"
+    return f"{DOMAIN}:{object_id}" if user_id is None else f"{DOMAIN}:{object_id}_user_{user_id}"
+
+
+@callback
+def async_import_statistics(
+        hass: HomeAssistant,
+        mac_address: str,
+        history: MeasurementHistory,
+        records: Iterable[MeasurementRecord] | None = None,
+) -> int:
+    """Recompute the hours of `records` (default: all) from the history and import them.
+
+    An hour that already has statistics is overwritten. Returns the number of
+    imported hourly statistics.
+    """
+    if "recorder" not in hass.config.components:
+        _LOGGER.debug("Recorder not loaded, measurements are not imported into statistics")
+        return 0
+
+    if records is None:
+        selected = list(history)
+    else:
+        hours = {hour_start(to_utc(record.time)) for record in records}
+        if not hours:
+            return 0
+        # Hours are UTC, the history is sorted by naive local time
+        start = dt_util.as_local(min(hours)).replace(tzinfo=None) - timedelta(hours=1)
+        end = dt_util.as_local(max(hours)).replace(tzinfo=None) + timedelta(hours=2)
+        selected = [record for record in history.between(start, end) if hour_start(to_utc(record.time)) in hours]
+
+    imported = 0
+    for key, name, unit in STATISTICS:
+        for user_id, statistics in hourly_statistics(selected, key, to_utc).items():
+            metadata = StatisticMetaData(
+                mean_type=StatisticMeanType.ARITHMETIC,
+                has_sum=False,
+                name=f"Medisana {name}" if user_id is None else f"Medisana {name} User {user_id}",
+                source=DOMAIN,
+                statistic_id=statistic_id(mac_address, key, user_id),
+                unit_of_measurement=unit,
+            )
+            async_add_external_statistics(hass, metadata, [
+                StatisticData(start=statistic.start, mean=statistic.mean, min=statistic.minimum,
+                              max=statistic.maximum)
+                for statistic in statistics
+            ])
+            imported += len(statistics)
+    return imported
+
+
+async def async_import_new_statistics(hass: HomeAssistant, mac_address: str, history: MeasurementHistory) -> int:
+    """Import the hours of the history from the newest already imported hour on.
+
+    Older hours are not overwritten, their measurements may have left the
+    bounded history. Without imported statistics the whole history is
+    imported, e.g. right after the option was enabled. Returns the number of
+    imported hourly statistics.
+    """
+    if "recorder" not in hass.config.components:
+        _LOGGER.debug("Recorder not loaded, measurements are not imported into statistics")
+        return 0
+
+    # Every measurement has a systolic value and is part of the statistics of all users
+    systolic_id = statistic_id(mac_address, "systolic", None)
+    last = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, 1, systolic_id, False, {"mean"})  # noqa: FBT003
+    if not last.get(systolic_id):
+        return async_import_statistics(hass, mac_address, history)
+    newest = dt_util.utc_from_timestamp(last[systolic_id][0]["start"])
+
+    # The newest imported hour is recomputed, it may have got further measurements
+    start = dt_util.as_local(newest).replace(tzinfo=None) - timedelta(hours=1)
+    records = [record for record in history.between(start, datetime.max) if to_utc(record.time) >= newest]
+    return async_import_statistics(hass, mac_address, history, records)
@@ -1,10 +1,15 @@
 """Parser for MedisanaBloodPressure BLE devices."""
 from __future__ import annotations
 
-from .parser import MedisanaBPBluetoothDeviceData
+from .client import MedisanaBPClient
+from .parser import MedisanaBPBluetoothDeviceData, parse_measurement
+from .reading import MeasurementRecord
 
 __version__ = "0.3.0"
 
 __all__ = [
+    "MeasurementRecord",
     "MedisanaBPBluetoothDeviceData",
+    "MedisanaBPClient",
+    "parse_measurement",
 ]
@@ -0,0 +1,228 @@
+"""Rolling aggregates of Medisana Blood Pressure measurements.
+
+Means over the last days, morning and evening means, extremes and counts are
+kept as running sums in one bucket per day, so adding a measurement is O(1)
+and a summary only touches the buckets of its window, never the history.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any
+
+from .reading import MeasurementRecord
+
+WINDOWS = (7, 30)  # days
+MAX_WINDOW = max(WINDOWS)
+# Hours of the day (device time) of morning and evening measurements
+MORNING_HOURS = range(4, 12)
+EVENING_HOURS = range(17, 24)
+
+
+@dataclass(slots=True)
+class Sums:
+    """Running sums of the measured values."""
+
+    count: int = 0
+    systolic: float = 0.0
+    diastolic: float = 0.0
+    pulse_count: int = 0
+    pulse_rate: float = 0.0
+
+    def add(self, record: MeasurementRecord, sign: int = 1) -> None:
+        """Add a record, or remove it with `sign=-1`."""
+        self.count += sign
+        self.systolic += sign * record.systolic
+        self.diastolic += sign * record.diastolic
+        if record.pulse_rate is not None:
+            self.pulse_count += sign
+            self.pulse_rate += sign * record.pulse_rate
+
+    def merge(self, other: Sums, sign: int = 1) -> None:
+        """Add the sums of `other`, or remove them with `sign=-1`."""
+        self.count += sign * other.count
+        self.systolic += sign * other.systolic
+        self.diastolic += sign * other.diastolic
+        self.pulse_count += sign * other.pulse_count
+        self.pulse_rate += sign * other.pulse_rate
+
+    def means(self) -> dict[str, float | None]:
+        """Return the mean of each value, None without measurements."""
+        return {
+            "systolic": round(self.systolic / self.count, 1) if self.count else None,
+            "diastolic": round(self.diastolic / self.count, 1) if self.count else None,
+            "pulse_rate": round(self.pulse_rate / self.pulse_count, 1) if self.pulse_count else None,
+        }
+
+
+def _add_to_periods(sums: DayBucket | _Window, record: MeasurementRecord) -> None:
+    """Add a record to the total and to the morning or evening sums."""
+    sums.total.add(record)
+    hour = record.time.hour
+    if hour in MORNING_HOURS:
+        sums.morning.add(record)
+    elif hour in EVENING_HOURS:
+        sums.evening.add(record)
+
+
+@dataclass(slots=True)
+class DayBucket:
+    """Sums and extremes of the measurements of one day."""
+
+    total: Sums = field(default_factory=Sums)
+    morning: Sums = field(default_factory=Sums)
+    evening: Sums = field(default_factory=Sums)
+    minimum: dict[str, float] = field(default_factory=dict)
+    maximum: dict[str, float] = field(default_factory=dict)
+
+    def add(self, record: MeasurementRecord) -> None:
+        """Add a record measured on this day."""
+        _add_to_periods(self, record)
+        for key, value in (("systolic", record.systolic), ("diastolic", record.diastolic),
+                           ("pulse_rate", record.pulse_rate)):
+            if value is None:
+                continue
+            if key not in self.minimum or value < self.minimum[key]:
+                self.minimum[key] = value
+            if key not in self.maximum or value > self.maximum[key]:
+                self.maximum[key] = value
+
+
+class _Window:
+    """Running sums of the buckets of the last `days` days."""
+
+    __slots__ = ("days", "evening", "morning", "total")
+
+    def __init__(self, days: int) -> None:
+        self.days = days
+        self.total = Sums()
+        self.morning = Sums()
+        self.evening = Sums()
+
+    def add(self, record: MeasurementRecord) -> None:
+        _add_to_periods(self, record)
+
+    def merge(self, bucket: DayBucket, sign: int = 1) -> None:
+        self.total.merge(bucket.total, sign)
+        self.morning.merge(bucket.morning, sign)
+        self.evening.merge(bucket.evening, sign)
+
+    def clear(self) -> None:
+        self.total = Sums()
+        self.morning = Sums()
+        self.evening = Sums()
+
+
+class _UserAggregates:
+    """Day buckets and rolling windows of one user, ending at `today`."""
+
+    def __init__(self, today: date) -> None:
+        self.today = today
+        self.buckets: dict[date, DayBucket] = {}
+        self.windows = {days: _Window(days) for days in WINDOWS}
+        self.count = 0
+
+    def advance(self, today: date) -> None:
+        """Move the end of the windows forward and drop the buckets that left them."""
+        if today <= self.today:
+            return
+        shift = (today - self.today).days
+        # Only the days leaving a window are looked at, not all buckets
+        for window in self.windows.values():
+            if shift >= window.days:
+                window.clear()
+                continue
+            first = self.today - timedelta(days=window.days - 1)
+            for offset in range(shift):
+                bucket = self.buckets.get(first + timedelta(days=offset))
+                if bucket is not None:
+                    window.merge(bucket, -1)
+        if shift >= MAX_WINDOW:
+            self.buckets.clear()
+        else:
+            first = self.today - timedelta(days=MAX_WINDOW - 1)
+            for offset in range(shift):
+                self.buckets.pop(first + timedelta(days=offset), None)
+        self.today = today
+
+    def add(self, record: MeasurementRecord) -> None:
+        """Add a record; records older than the longest window or dated after their receipt are only counted."""
+        self.count += 1
+        day = record.time.date()
+        if day > record.received.date():
+            # The clock of the device is ahead, the windows must not move past today
+            return
+        self.advance(day)
+        age = (self.today - day).days
+        if age >= MAX_WINDOW:
+            return
+        bucket = self.buckets.get(day)
+        if bucket is None:
+            bucket = self.buckets[day] = DayBucket()
+        bucket.add(record)
+        for window in self.windows.values():
+            if age < window.days:
+                window.add(record)
+
+    def summary(self, days: int) -> dict[str, Any]:
+        """Return the means, extremes and counts of the window of `days` days."""
+        window = self.windows[days]
+        oldest = self.today - timedelta(days=days - 1)
+        buckets = [bucket for day, bucket in self.buckets.items() if day >= oldest]
+        return {
+            "count": window.total.count,
+            "mean": window.total.means(),
+            "morning_mean": window.morning.means(),
+            "evening_mean": window.evening.means(),
+            "minimum": _extreme((bucket.minimum for bucket in buckets), min),
+            "maximum": _extreme((bucket.maximum for bucket in buckets), max),
+        }
+
+
+def _extreme(values: Iterable[dict[str, float]], pick: Any) -> dict[str, float | None]:
+    result: dict[str, float | None] = dict.fromkeys(("systolic", "diastolic", "pulse_rate"))
+    for daily in values:
+        for key, value in daily.items():
+            current = result[key]
+            result[key] = value if current is None else pick(current, value)
+    return result
+
+
+class MeasurementAggregates:
+    """Rolling aggregates of all users together and of each user.
+
+    `None` as user id stands for the measurements of all users, including
+    those without a user id. Days are the dates of the naive local device
+    time; windows end at the newest measurement or at the day passed to
+    `summary`, whichever is later.
+    """
+
+    def __init__(self) -> None:
+        self._users: dict[int | None, _UserAggregates] = {}
+
+    def add(self, record: MeasurementRecord) -> None:
+        """Add a new measurement."""
+        self._user(None, record).add(record)
+        if record.user_id is not None:
+            self._user(record.user_id, record).add(record)
+
+    def _user(self, user_id: int | None, record: MeasurementRecord) -> _UserAggregates:
+        aggregates = self._users.get(user_id)
+        if aggregates is None:
+            aggregates = self._users[user_id] = _UserAggregates(min(record.time, record.received).date())
+        return aggregates
+
+    def count(self, user_id: int | None = None) -> int:
+        """Return the number of measurements added of a user, of all users for None."""
+        aggregates = self._users.get(user_id)
+        return aggregates.count if aggregates is not None else 0
+
+    def summary(self, user_id: int | None, days: int, today: date) -> dict[str, Any] | None:
+        """Return the aggregates of the last `days` days of a user, None without measurements."""
+        aggregates = self._users.get(user_id)
+        if aggregates is None:
+            return None
+        aggregates.advance(today)
+        return aggregates.summary(days)
@@ -0,0 +1,138 @@
+"""Persistent archive of received Medisana Blood Pressure measurement frames.
+
+Frames are appended to a binary file with fixed-size entries, so the latest
+entries can be read by seeking from the end of the file: loading the tail of
+the archive costs the same regardless of how many readings it holds. The
+raw frame is stored, records are decoded again with the parser when loaded.
+
+All methods do blocking file I/O.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
+import logging
+from pathlib import Path
+import struct
+from typing import NamedTuple
+
+_LOGGER = logging.getLogger(__name__)
+
+# Longest Blood Pressure Measurement frame: flags, 3 SFLOAT, timestamp, pulse, user id, status
+MAX_FRAME_LENGTH = 19
+# received (seconds since EPOCH), rssi, battery, frame length, frame
+_ENTRY = struct.Struct(f"<dbBB{MAX_FRAME_LENGTH}s")
+ENTRY_SIZE = _ENTRY.size
+_EPOCH = datetime(1970, 1, 1)
+_NO_RSSI = -128
+_NO_BATTERY = 0xFF
+_READ_CHUNK = 4096
+
+
+class ArchivedFrame(NamedTuple):
+    """A raw measurement frame with the time and link quality it was received with."""
+
+    frame: bytes
+    received: datetime
+    rssi: int | None = None
+    battery: int | None = None
+
+
+def _pack(entry: ArchivedFrame) -> bytes:
+    return _ENTRY.pack(
+        (entry.received - _EPOCH).total_seconds(),
+        _NO_RSSI if entry.rssi is None else max(min(entry.rssi, 127), -127),
+        _NO_BATTERY if entry.battery is None else max(min(entry.battery, 254), 0),
+        len(entry.frame),
+        entry.frame,
+    )
+
+
+def _unpack(data: bytes, offset: int = 0) -> ArchivedFrame:
+    seconds, rssi, battery, length, frame = _ENTRY.unpack_from(data, offset)
+    return ArchivedFrame(
+        frame=frame[:length],
+        received=_EPOCH + timedelta(seconds=seconds),
+        rssi=None if rssi == _NO_RSSI else rssi,
+        battery=None if battery == _NO_BATTERY else battery,
+    )
+
+
+class FrameArchive:
+    """Append-only file of fixed-size measurement frame entries."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self._checked = False
+
+    def __len__(self) -> int:
+        """Return the number of archived frames."""
+        try:
+            return self.path.stat().st_size // ENTRY_SIZE
+        except FileNotFoundError:
+            return 0
+
+    def _check(self) -> None:
+        """Cut off a partially written entry, e.g. after a power loss."""
+        if self._checked:
+            return
+        self._checked = True
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size % ENTRY_SIZE:
+            _LOGGER.warning(f"Discarding incomplete entry at the end of {self.path}")
+            with self.path.open("r+b") as file:
+                file.truncate(size - size % ENTRY_SIZE)
+
+    def append(self, entries: Iterable[ArchivedFrame]) -> int:
+        """Append entries to the archive and return the number written.
+
+        Frames longer than `MAX_FRAME_LENGTH` are skipped.
+        """
+        self._check()
+        data = bytearray()
+        for entry in entries:
+            if not 0 < len(entry.frame) <= MAX_FRAME_LENGTH:
+                _LOGGER.warning(f"Not archiving frame of unexpected length {len(entry.frame)}")
+                continue
+            data += _pack(entry)
+        if not data:
+            return 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("ab") as file:
+            file.write(data)
+        return len(data) // ENTRY_SIZE
+
+    def read_tail(self, count: int) -> list[ArchivedFrame]:
+        """Return the latest `count` entries, oldest first."""
+        self._check()
+        if count <= 0:
+            return []
+        try:
+            with self.path.open("rb") as file:
+                size = file.seek(0, 2)
+                start = max(size // ENTRY_SIZE - count, 0) * ENTRY_SIZE
+                file.seek(start)
+                data = file.read(size - start)
+        except FileNotFoundError:
+            return []
+        return [_unpack(data, offset) for offset in range(0, len(data) - ENTRY_SIZE + 1, ENTRY_SIZE)]
+
+    def __iter__(self) -> Iterator[ArchivedFrame]:
+        """Iterate over all entries, oldest first, reading the file in chunks."""
+        self._check()
+        try:
+            file = self.path.open("rb")
+        except FileNotFoundError:
+            return
+        with file:
+            while data := file.read(ENTRY_SIZE * _READ_CHUNK):
+                for offset in range(0, len(data) - ENTRY_SIZE + 1, ENTRY_SIZE):
+                    yield _unpack(data, offset)
+
+    def remove(self) -> None:
+        """Delete the archive file."""
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,151 @@
+"""Batch decoder for archived Medisana Blood Pressure measurement frames.
+
+Decodes many Blood Pressure Measurement (0x2A35) frames at once into columnar
+NumPy arrays. Intended for offline reprocessing of stored cuff dumps; the
+integration itself does not import this module, so NumPy is only required
+where the batch API is used.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+from .parser import (
+    _SFLOAT_MANTISSA,
+    _SFLOAT_SCALE,
+    FLAG_MEASUREMENT_STATUS,
+    FLAG_PULSE_RATE,
+    FLAG_TIMESTAMP,
+    FLAG_USER_ID,
+    InvalidFrameError,
+)
+
+# Marker for absent integer fields (user id, measurement status)
+MISSING = -1
+
+_MANTISSA_TABLE = np.array(_SFLOAT_MANTISSA, dtype=np.float64)
+_SCALE_TABLE = np.array(_SFLOAT_SCALE, dtype=np.float64)
+
+
+@dataclass(frozen=True)
+class BloodPressureBatch:
+    """Columnar measurements; index `i` belongs to the `i`-th input frame.
+
+    Absent pulse rates are NaN, absent or invalid timestamps NaT and absent
+    user ids and measurement states `MISSING`.
+    """
+
+    flags: npt.NDArray[np.uint8]
+    systolic: npt.NDArray[np.float64]
+    diastolic: npt.NDArray[np.float64]
+    mean_arterial_pressure: npt.NDArray[np.float64]
+    pulse_rate: npt.NDArray[np.float64]
+    user_id: npt.NDArray[np.int16]
+    measurement_status: npt.NDArray[np.int32]
+    timestamp: npt.NDArray[np.datetime64]
+
+    def __len__(self) -> int:
+        """Return the number of decoded frames."""
+        return len(self.flags)
+
+
+def _u16(buf: npt.NDArray[np.uint8], pos: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+    return buf[pos].astype(np.int64) | (buf[pos + 1].astype(np.int64) << 8)
+
+
+def _sfloat(raw: npt.NDArray[np.int64]) -> npt.NDArray[np.float64]:
+    # Same tables as the scalar parser, so both return bit-identical values
+    return _MANTISSA_TABLE[raw & 0x0FFF] * _SCALE_TABLE[raw >> 12]
+
+
+def _timestamps(
+        buf: npt.NDArray[np.uint8], pos: npt.NDArray[np.int64], present: npt.NDArray[np.bool_]
+) -> npt.NDArray[np.datetime64]:
+    year = _u16(buf, pos)
+    month, day, hour, minute, second = (buf[pos + i].astype(np.int64) for i in range(2, 7))
+
+    months = (year - 1970) * 12 + (month - 1)
+    month_start = months.astype("datetime64[M]").astype("datetime64[D]")
+    days_in_month = ((months + 1).astype("datetime64[M]").astype("datetime64[D]") - month_start).astype(np.int64)
+    valid = (
+        present & (year >= 1) & (year <= 9999) & (month >= 1) & (month <= 12)  # noqa PLR2004
+        & (day >= 1) & (day <= days_in_month)
+        & (hour < 24) & (minute < 60) & (second < 60)  # noqa PLR2004
+    )
+
+    seconds = (day - 1) * 86400 + hour * 3600 + minute * 60 + second
+    result = month_start.astype("datetime64[s]") + seconds.astype("timedelta64[s]")
+    result[~valid] = np.datetime64("NaT")
+    return result
+
+
+def _pack(frames: Sequence[bytes]) -> tuple[npt.NDArray[np.uint8], npt.NDArray[np.int64]]:
+    lengths = np.fromiter((len(frame) for frame in frames), dtype=np.int64, count=len(frames))
+    offsets = np.zeros(len(frames), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=offsets[1:])
+    return np.frombuffer(b"".join(frames), dtype=np.uint8), offsets
+
+
+def parse_blood_pressure_batch(
+        frames: Sequence[bytes] | bytes | bytearray | memoryview,
+        offsets: Sequence[int] | npt.NDArray[np.integer] | None = None,
+) -> BloodPressureBatch:
+    """Decode many blood pressure frames into columnar arrays.
+
+    `frames` is either a sequence of single frames or one packed buffer; for
+    a packed buffer `offsets` holds the start of every frame in ascending
+    order. The field layout of each frame is derived from its flags byte.
+    Raises `InvalidFrameError` for the first frame that is shorter than
+    announced by its flags.
+    """
+    if offsets is None:
+        if isinstance(frames, bytes | bytearray | memoryview):
+            msg = "offsets are required for a packed buffer"
+            raise TypeError(msg)
+        buf, starts = _pack(frames)
+    else:
+        buf = np.frombuffer(frames, dtype=np.uint8)  # type: ignore[arg-type]
+        starts = np.asarray(offsets, dtype=np.int64)
+
+    ends = np.append(starts[1:], len(buf))
+    empty = np.nonzero((starts >= ends) | (starts < 0))[0]
+    if len(empty):
+        raise InvalidFrameError(int(empty[0]))
+
+    flags = buf[starts]
+    has_timestamp = (flags & FLAG_TIMESTAMP) != 0
+    has_pulse = (flags & FLAG_PULSE_RATE) != 0
+    has_user = (flags & FLAG_USER_ID) != 0
+    has_status = (flags & FLAG_MEASUREMENT_STATUS) != 0
+
+    # Field positions follow from the flags of each frame, so frames of all
+    # layouts are decoded in one pass and in input order, without grouping
+    # them by flags byte and scattering the groups back
+    pulse_pos = starts + 7 + 7 * has_timestamp
+    user_pos = pulse_pos + 2 * has_pulse
+    status_pos = user_pos + has_user
+    frame_end = status_pos + 2 * has_status
+    short = np.nonzero(frame_end > ends)[0]
+    if len(short):
+        raise InvalidFrameError(int(short[0]))
+
+    # Absent fields are read from position 0 and masked afterwards
+    zero = np.zeros_like(starts)
+    pulse = _sfloat(_u16(buf, np.where(has_pulse, pulse_pos, zero)))
+    user_id = buf[np.where(has_user, user_pos, zero)].astype(np.int16)
+    status = _u16(buf, np.where(has_status, status_pos, zero)).astype(np.int32)
+
+    return BloodPressureBatch(
+        flags=flags,
+        systolic=_sfloat(_u16(buf, starts + 1)),
+        diastolic=_sfloat(_u16(buf, starts + 3)),
+        mean_arterial_pressure=_sfloat(_u16(buf, starts + 5)),
+        pulse_rate=np.where(has_pulse, pulse, np.nan),
+        user_id=np.where(has_user, user_id, np.int16(MISSING)),
+        measurement_status=np.where(has_status, status, np.int32(MISSING)),
+        timestamp=_timestamps(buf, np.where(has_timestamp, starts + 7, zero), has_timestamp),
+    )
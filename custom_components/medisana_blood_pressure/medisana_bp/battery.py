@@ -0,0 +1,57 @@
+"""Cached battery level of a Medisana Blood Pressure device.
+
+The battery level changes slowly, while every GATT read costs time in the
+short connectable window of the cuff. The level is therefore only read again
+after a refresh interval or a number of sessions.
+"""
+
+from __future__ import annotations
+
+DEFAULT_REFRESH_INTERVAL = 24 * 3600.0  # seconds
+DEFAULT_REFRESH_SESSIONS = 0
+
+
+class BatteryCache:
+    """Battery level with a refresh policy.
+
+    A refresh is due if no level is known, `refresh_interval` seconds passed
+    since the last read, or `refresh_sessions` sessions passed since the last
+    read. A limit of 0 disables that condition; with both disabled the level
+    is read in every session.
+    """
+
+    def __init__(
+            self,
+            refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+            refresh_sessions: int = DEFAULT_REFRESH_SESSIONS,
+    ) -> None:
+        self.refresh_interval = refresh_interval
+        self.refresh_sessions = refresh_sessions
+        self.level: int | None = None
+        self.reads = 0
+        self._updated = 0.0
+        self._sessions = 0
+
+    def due(self, now: float) -> bool:
+        """Count a session and return True if the level should be read in it."""
+        self._sessions += 1
+        if self.level is None:
+            return True
+        if not self.refresh_interval and not self.refresh_sessions:
+            return True
+        return bool(
+            (self.refresh_interval and now - self._updated >= self.refresh_interval)
+            or (self.refresh_sessions and self._sessions >= self.refresh_sessions)
+        )
+
+    def update(self, payload: bytes | bytearray | None, now: float) -> int | None:
+        """Store the level read from the Battery Level characteristic (0x2A19) and return it.
+
+        An empty payload keeps the cached level.
+        """
+        if payload:
+            self.level = min(payload[0], 100)
+            self.reads += 1
+            self._updated = now
+            self._sessions = 0
+        return self.level
@@ -0,0 +1,185 @@
+"""Standalone async client for Medisana Blood Pressure devices.
+
+The client connects to a cuff, subscribes to the Blood Pressure Measurement
+characteristic and yields the transferred records, without Home Assistant:
+
+    client = MedisanaBPClient(ble_device)
+    async for record in client.stream():
+        print(record)
+
+One `stream()` is one GATT session. It ends when the cuff has transferred
+its stored records (see `AdaptiveSessionTimer`); keep the client for further
+sessions, so the GATT layout, the battery level and the already yielded
+frames are remembered. Devices with a Record Access Control Point are only
+asked for the records since the newest yielded one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+import contextlib
+from datetime import datetime
+import logging
+import struct
+
+from bleak import BleakError, BleakGATTCharacteristic
+from bleak.backends.device import BLEDevice
+from bleak_retry_connector import BleakClientWithServiceCache, establish_connection
+
+from . import racp
+from .battery import BatteryCache
+from .dedup import FrameDeduplicator
+from .gatt import GattLayout
+from .helpers import mask_mac
+from .parser import parse_measurement
+from .reading import MeasurementRecord
+from .session import AdaptiveSessionTimer
+from .supported_devices import (
+    BATTERY_LEVEL_UUID,
+    BP_MEASUREMENT_UUID,
+    RECORD_ACCESS_CONTROL_POINT_UUID,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Frames buffered for a slow consumer before further frames are dropped
+DEFAULT_MAX_QUEUED = 256
+
+
+class MedisanaBPClient:
+    """Connect to a Medisana Blood Pressure device and stream its measurements.
+
+    Notifications cannot be paused, so backpressure is applied by buffering
+    at most `max_queued` raw frames for the consumer. Frames arriving while
+    the buffer is full are dropped and counted in `dropped`; they are not
+    marked as seen, so the cuff sends them again in the next session. A
+    session that dropped frames does not move `last_timestamp`, so a device
+    with a Record Access Control Point is asked for the dropped records again.
+    Frames are only parsed when the consumer takes them.
+    """
+
+    def __init__(  # noqa PLR0913
+            self,
+            ble_device: BLEDevice,
+            *,
+            max_queued: int = DEFAULT_MAX_QUEUED,
+            session_timer: AdaptiveSessionTimer | None = None,
+            battery: BatteryCache | None = None,
+            deduplicate: bool = True,
+            ble_device_callback: Callable[[], BLEDevice] | None = None,
+    ) -> None:
+        self.ble_device = ble_device
+        self.max_queued = max_queued
+        self.session_timer = session_timer or AdaptiveSessionTimer()
+        self.battery = battery or BatteryCache()
+        self.deduplicator = FrameDeduplicator() if deduplicate else None
+        self.gatt_layout = GattLayout((BP_MEASUREMENT_UUID, BATTERY_LEVEL_UUID, RECORD_ACCESS_CONTROL_POINT_UUID))
+        self.last_timestamp: datetime | None = None
+        self.dropped = 0
+        # Newest yielded timestamp, also of sessions that dropped frames
+        self._newest: datetime | None = None
+        self._ble_device_callback = ble_device_callback
+        self._name = str(mask_mac(ble_device.address))
+
+    async def stream(self) -> AsyncIterator[MeasurementRecord]:
+        """Connect, yield the records sent by the device and disconnect.
+
+        Connection errors (`BleakError`, `TimeoutError`) are raised after the
+        records received so far were yielded. Leaving the loop early or
+        cancelling the consumer disconnects from the device.
+        """
+        queue: asyncio.Queue[tuple[bytes, datetime] | None] = asyncio.Queue()
+        dropped = self.dropped
+        session = asyncio.create_task(self._session(queue))
+        try:
+            while (item := await queue.get()) is not None:
+                frame, received = item
+                try:
+                    record = parse_measurement(frame, received, battery=self.battery.level)
+                except (struct.error, IndexError):
+                    _LOGGER.warning("Skipping malformed frame %s from %s", frame.hex(), self._name)
+                    continue
+                if record.timestamp is not None and (self._newest is None or record.timestamp > self._newest):
+                    self._newest = record.timestamp
+                yield record
+            await session
+        finally:
+            if not session.done():
+                session.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await session
+            # Dropped frames may be older than the newest yielded one, they are requested again
+            # until a session without dropped frames
+            if self.dropped == dropped:
+                self.last_timestamp = self._newest
+
+    async def _session(self, queue: asyncio.Queue[tuple[bytes, datetime] | None]) -> None:
+        """Run one GATT session, put the received frames and finally None into `queue`."""
+
+        def notification_handler(_sender: BleakGATTCharacteristic, data: bytearray) -> None:
+            self.session_timer.notify()
+            frame = bytes(data)
+            # The queue is unbounded so that the final None always fits, the limit is enforced here
+            if queue.qsize() >= self.max_queued:
+                self.dropped += 1
+                return
+            if self.deduplicator is not None and self.deduplicator.seen(frame):
+                return
+            # Naive local time, like the clock of the device
+            queue.put_nowait((frame, datetime.now()))
+
+        dropped = self.dropped
+        try:
+            service_filter = self.gatt_layout.service_filter
+            client = await establish_connection(
+                BleakClientWithServiceCache,
+                self.ble_device,
+                self._name,
+                ble_device_callback=self._ble_device_callback,
+                services=service_filter,
+            )
+            try:
+                if service_filter is None:
+                    self.gatt_layout.learn(client.services)
+                measurement_char = self.gatt_layout.resolve(client.services, BP_MEASUREMENT_UUID)
+                if measurement_char is None:
+                    self.gatt_layout.invalidate()
+                    await client.clear_cache()
+
+                self.session_timer.start()
+                await client.start_notify(measurement_char or BP_MEASUREMENT_UUID, notification_handler)
+                loop = asyncio.get_running_loop()
+                if self.battery.due(loop.time()):
+                    await self._read_battery(client, loop.time())
+                if not await self._request_records(client):
+                    await self.session_timer.wait()
+                await client.stop_notify(measurement_char or BP_MEASUREMENT_UUID)
+            finally:
+                await client.disconnect()
+        finally:
+            queue.put_nowait(None)
+        if self.dropped > dropped:
+            _LOGGER.warning("Dropped %d frames of %s, the consumer is too slow", self.dropped - dropped, self._name)
+
+    async def _request_records(self, client: BleakClientWithServiceCache) -> bool:
+        """Request the records since the newest yielded one; return True once the device sent all of them."""
+        racp_char = self.gatt_layout.resolve(client.services, RECORD_ACCESS_CONTROL_POINT_UUID)
+        if racp_char is None:
+            return False
+        try:
+            await racp.request_records(client, racp_char, self.last_timestamp, self.session_timer.max_duration)
+        except (racp.RecordAccessError, BleakError, TimeoutError) as err:
+            _LOGGER.debug("Record access of %s failed, waiting for the pushed records: %s", self._name, err)
+            return False
+        return True
+
+    async def _read_battery(self, client: BleakClientWithServiceCache, now: float) -> None:
+        """Read the battery level; a missing characteristic or failed read keeps the cached level."""
+        battery_char = self.gatt_layout.resolve(client.services, BATTERY_LEVEL_UUID)
+        if battery_char is None:
+            return
+        try:
+            self.battery.update(await client.read_gatt_char(battery_char), now)
+        except BleakError as err:
+            _LOGGER.debug("Reading the battery level of %s failed: %s", self._name, err)
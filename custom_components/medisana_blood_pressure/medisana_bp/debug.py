@@ -0,0 +1,102 @@
+"""Per-device debug logging for Medisana Blood Pressure devices.
+
+Every device logs to its own child logger, so debug output can be enabled for
+a single monitor. Messages are rate limited per call site and only formatted
+when the debug level is enabled. The latest raw frames are kept in a ring
+buffer regardless of the log level and can be dumped on demand.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime
+import logging
+import time
+from typing import Any, NamedTuple
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_FRAMES = 100
+DEFAULT_RATE_LIMIT = 20  # messages per call site and interval
+DEFAULT_RATE_INTERVAL = 60.0  # seconds
+
+
+class HexFrame:
+    """Log argument that hex-formats a frame only when the message is emitted."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes | bytearray) -> None:
+        self.data = data
+
+    def __str__(self) -> str:
+        """Return the frame as hex string."""
+        return self.data.hex()
+
+
+class RawFrame(NamedTuple):
+    """A raw frame as received from the device."""
+
+    received: datetime
+    frame: bytes
+
+
+class DeviceDebugLog:
+    """Rate limited, lazily formatted debug logger with a ring buffer of raw frames.
+
+    `enabled` sets the device logger to DEBUG; otherwise the level is
+    inherited from the integration logger.
+    """
+
+    def __init__(  # noqa PLR0913
+            self,
+            name: str,
+            *,
+            enabled: bool = False,
+            max_frames: int = DEFAULT_MAX_FRAMES,
+            rate_limit: int = DEFAULT_RATE_LIMIT,
+            rate_interval: float = DEFAULT_RATE_INTERVAL,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.logger = _LOGGER.getChild(name)
+        self.rate_limit = rate_limit
+        self.rate_interval = rate_interval
+        self._clock = clock
+        # format string -> [window start, messages logged, messages suppressed]
+        self._windows: dict[str, list[Any]] = {}
+        self._frames: deque[RawFrame] = deque(maxlen=max_frames)
+        self.enabled = enabled
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if debug logging is enabled for the device."""
+        return self.logger.level == logging.DEBUG
+
+    @enabled.setter
+    def enabled(self, enabled: bool) -> None:
+        self.logger.setLevel(logging.DEBUG if enabled else logging.NOTSET)
+
+    def debug(self, msg: str, *args: Any) -> None:
+        """Log a debug message with %-style arguments, at most `rate_limit` times per interval."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        now = self._clock()
+        window = self._windows.get(msg)
+        if window is None or now - window[0] >= self.rate_interval:
+            if window is not None and window[2]:
+                self.logger.debug("Suppressed %d messages like '%s'", window[2], msg)
+            window = self._windows[msg] = [now, 0, 0]
+        if window[1] >= self.rate_limit:
+            window[2] += 1
+            return
+        window[1] += 1
+        self.logger.debug(msg, *args)
+
+    def record_frame(self, frame: bytes, received: datetime) -> None:
+        """Keep a raw frame in the ring buffer."""
+        self._frames.append(RawFrame(received, frame))
+
+    def frames(self) -> list[RawFrame]:
+        """Return the buffered raw frames, oldest first."""
+        return list(self._frames)
@@ -0,0 +1,50 @@
+"""Duplicate detection for Medisana Blood Pressure measurement frames.
+
+The cuffs resend their whole memory on every connection. Recognising frames
+that were already processed avoids parsing and publishing them again.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+
+from .parser import FLAG_TIMESTAMP
+
+DEFAULT_MAX_FRAMES = 1000
+
+
+class FrameDeduplicator:
+    """Bounded index of already processed measurement frames.
+
+    A frame is identified by its raw bytes, which contain user id, timestamp
+    and all measured values. Frames without a timestamp cannot be told apart
+    from a new measurement with equal values and are never suppressed. The
+    least recently seen frames are forgotten first.
+    """
+
+    def __init__(self, max_frames: int = DEFAULT_MAX_FRAMES) -> None:
+        self.max_frames = max_frames
+        self.suppressed = 0
+        self._frames: OrderedDict[bytes, None] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of indexed frames."""
+        return len(self._frames)
+
+    def add(self, frame: bytes) -> None:
+        """Index a frame without counting it, e.g. when restoring the history."""
+        if not frame or not frame[0] & FLAG_TIMESTAMP:
+            return
+        self._frames[frame] = None
+        self._frames.move_to_end(frame)
+        if len(self._frames) > self.max_frames:
+            self._frames.popitem(last=False)
+
+    def seen(self, frame: bytes) -> bool:
+        """Return True for an already indexed frame, otherwise index it."""
+        if frame in self._frames:
+            self._frames.move_to_end(frame)
+            self.suppressed += 1
+            return True
+        self.add(frame)
+        return False
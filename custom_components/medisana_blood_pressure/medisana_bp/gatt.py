@@ -0,0 +1,90 @@
+"""Cached GATT layout of a Medisana Blood Pressure device.
+
+The cuff is only connectable for a few seconds after a measurement, and a
+full service discovery takes a large share of that. After the first
+connection the services that contain the used characteristics and the
+handles of the characteristics are remembered: later connections only
+discover these services and look the characteristics up by handle.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import logging
+from typing import Protocol
+
+from bleak import BleakGATTCharacteristic
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ServiceCollection(Protocol):
+    """The part of `BleakGATTServiceCollection` used by the cache."""
+
+    def get_characteristic(self, specifier: int | str) -> BleakGATTCharacteristic | None:
+        """Return a characteristic by handle or UUID."""
+
+
+class GattLayout:
+    """Services and characteristic handles learned from a full service discovery.
+
+    A characteristic whose cached handle cannot be resolved any more, e.g.
+    after a firmware update, invalidates the layout so that the next
+    connection discovers all services again.
+    """
+
+    def __init__(self, characteristics: Iterable[str]) -> None:
+        self.characteristics = tuple(characteristics)
+        self._handles: dict[str, int] = {}
+        self._services: frozenset[str] = frozenset()
+        self._learned = False
+
+    @property
+    def learned(self) -> bool:
+        """Return True if the layout of the device is known."""
+        return self._learned
+
+    @property
+    def service_filter(self) -> list[str] | None:
+        """Return the services to discover on connect, None for a full discovery."""
+        return sorted(self._services) if self._learned and self._services else None
+
+    def learn(self, services: ServiceCollection) -> None:
+        """Remember the services and handles of the characteristics.
+
+        Must only be called with the result of a full service discovery.
+        """
+        handles = {}
+        service_uuids = set()
+        for uuid in self.characteristics:
+            characteristic = services.get_characteristic(uuid)
+            if characteristic is not None:
+                handles[uuid] = characteristic.handle
+                service_uuids.add(characteristic.service_uuid)
+        self._handles = handles
+        self._services = frozenset(service_uuids)
+        self._learned = True
+        _LOGGER.debug(f"Learned GATT layout: services {sorted(service_uuids)}, handles {handles}")
+
+    def invalidate(self) -> None:
+        """Forget the layout; the next connection discovers all services."""
+        self._handles = {}
+        self._services = frozenset()
+        self._learned = False
+
+    def resolve(self, services: ServiceCollection, uuid: str) -> BleakGATTCharacteristic | None:
+        """Return a characteristic of a connected device by its cached handle.
+
+        Returns None for a characteristic the device does not have.
+        """
+        if not self._learned:
+            return services.get_characteristic(uuid)
+        handle = self._handles.get(uuid)
+        if handle is None:
+            return None
+        characteristic = services.get_characteristic(handle)
+        if characteristic is None or characteristic.uuid != uuid:
+            _LOGGER.debug(f"Cached handle {handle} of {uuid} is stale, invalidating the GATT layout")
+            self.invalidate()
+            return services.get_characteristic(uuid)
+        return characteristic
@@ -0,0 +1,162 @@
+"""Bounded measurement history for Medisana Blood Pressure devices."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterator, KeysView
+from datetime import datetime, timedelta
+from itertools import count, islice
+import sys
+from typing import Any
+
+from .reading import MeasurementRecord
+
+DEFAULT_MAX_RECORDS = 1000
+DEFAULT_MAX_AGE = timedelta(days=365)
+
+
+class MeasurementHistory:
+    """Time-sorted, size- and age-limited store of measurement records.
+
+    Records are kept in ascending time order, so the latest record, overall
+    and of each user, is available in O(1). The age limit applies relative to
+    the latest record. A record with the same timestamp and user as a stored
+    one replaces it; devices resend their whole memory on every connection.
+    Records without a timestamp never replace each other.
+
+    Evicted records stay in front of the stored ones until they make up a
+    tenth of the lists, so a full history does not shift all records on
+    every add.
+    """
+
+    def __init__(
+            self,
+            max_records: int = DEFAULT_MAX_RECORDS,
+            max_age: timedelta | None = DEFAULT_MAX_AGE,
+    ) -> None:
+        self.max_records = max_records
+        self.max_age = max_age
+        self._keys: list[tuple[datetime, int]] = []
+        self._records: list[MeasurementRecord] = []
+        # Index of the oldest stored record, the records before it are evicted
+        self._start = 0
+        self._by_timestamp: dict[tuple[datetime, int | None], MeasurementRecord] = {}
+        self._latest_by_user: dict[int | None, MeasurementRecord] = {}
+        self._sequence = count()
+
+    def __len__(self) -> int:
+        """Return the number of stored records."""
+        return len(self._records) - self._start
+
+    def __iter__(self) -> Iterator[MeasurementRecord]:
+        """Iterate over the records from the oldest to the latest."""
+        return islice(self._records, self._start, None)
+
+    def __reversed__(self) -> Iterator[MeasurementRecord]:
+        """Iterate over the records from the latest to the oldest."""
+        return islice(reversed(self._records), len(self))
+
+    @property
+    def latest(self) -> MeasurementRecord | None:
+        """Return the latest record."""
+        return self._records[-1] if len(self) else None
+
+    @property
+    def latest_timestamp(self) -> datetime | None:
+        """Return the newest device timestamp, i.e. of the last record synced from the device."""
+        # Records without a timestamp are sorted by their receive time, which is later than most timestamps
+        return next((record.timestamp for record in reversed(self) if record.timestamp is not None), None)
+
+    @property
+    def users(self) -> KeysView[int | None]:
+        """Return the user ids with stored records, None for records without user id."""
+        return self._latest_by_user.keys()
+
+    def latest_for_user(self, user_id: int | None) -> MeasurementRecord | None:
+        """Return the latest record of a user."""
+        return self._latest_by_user.get(user_id)
+
+    def add(self, record: MeasurementRecord) -> bool:
+        """Add a record; return False if it replaced a stored one or was too old to keep."""
+        if record.timestamp is not None:
+            known = self._by_timestamp.get((record.timestamp, record.user_id))
+            if known is not None:
+                index = self._index_of(known)
+                self._records[index] = record
+                self._by_timestamp[(record.timestamp, record.user_id)] = record
+                if self._latest_by_user.get(record.user_id) is known:
+                    self._latest_by_user[record.user_id] = record
+                return False
+
+        key = (record.time, next(self._sequence))
+        index = bisect_right(self._keys, key, self._start)
+        self._keys.insert(index, key)
+        self._records.insert(index, record)
+        if record.timestamp is not None:
+            self._by_timestamp[(record.timestamp, record.user_id)] = record
+
+        self._evict()
+        if self._index_of(record) < 0:
+            return False
+        latest = self._latest_by_user.get(record.user_id)
+        if latest is None or record.time >= latest.time:
+            self._latest_by_user[record.user_id] = record
+        return True
+
+    def _index_of(self, record: MeasurementRecord) -> int:
+        time = record.time
+        index = bisect_right(self._keys, (time, -1), self._start)
+        while index < len(self._records) and self._keys[index][0] == time:
+            if self._records[index] is record:
+                return index
+            index += 1
+        return -1
+
+    def _evict(self) -> None:
+        end = self._start + max(len(self) - self.max_records, 0)
+        if self.max_age is not None:
+            # Relative to the newest record, so a cuff with an unset clock keeps its readings
+            end = max(end, bisect_right(self._keys, (self._keys[-1][0] - self.max_age, -1), self._start))
+        if end == self._start:
+            return
+        for record in islice(self._records, self._start, end):
+            if record.timestamp is not None:
+                self._by_timestamp.pop((record.timestamp, record.user_id), None)
+            # Records are evicted oldest first: a user's latest record goes with the last one of the user
+            if self._latest_by_user.get(record.user_id) is record:
+                del self._latest_by_user[record.user_id]
+        self._start = end
+        if self._start > len(self._records) // 10:
+            del self._keys[:self._start]
+            del self._records[:self._start]
+            self._start = 0
+
+    def memory_usage(self) -> int:
+        """Return the approximate memory used by the history and its records in bytes."""
+        size = sum(sys.getsizeof(container) for container in
+                   (self._keys, self._records, self._by_timestamp, self._latest_by_user))
+        if self._records:
+            # Records and keys all have the same layout
+            size += len(self._records) * (sys.getsizeof(self._records[0]) + sys.getsizeof(self._keys[0]))
+        return size
+
+    def recent(self, count: int) -> list[MeasurementRecord]:
+        """Return the latest `count` records, oldest first."""
+        return self._records[max(len(self._records) - count, self._start):] if count > 0 else []
+
+    def between(self, start: datetime, end: datetime) -> list[MeasurementRecord]:
+        """Return the records with `start <= time < end`, oldest first."""
+        return self._records[bisect_right(self._keys, (start, -1), self._start):
+                             bisect_right(self._keys, (end, -1), self._start)]
+
+    def page(self, offset: int, limit: int) -> list[MeasurementRecord]:
+        """Return up to `limit` records, latest first, skipping the latest `offset`."""
+        end = len(self._records) - offset
+        if end <= self._start or limit <= 0:
+            return []
+        return self._records[max(end - limit, self._start):end][::-1]
+
+    def as_dict(self, count: int | None = None) -> dict[str, dict[str, Any]]:
+        """Return the latest `count` (default: all) records keyed by their ISO formatted time."""
+        records = self._records[self._start:] if count is None else self.recent(count)
+        return {record.time.isoformat(): record.as_dict() for record in records}
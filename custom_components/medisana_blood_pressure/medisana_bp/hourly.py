@@ -0,0 +1,56 @@
+"""Hourly statistics of Medisana Blood Pressure measurements.
+
+Long-term statistics are stored per hour. The hour of a measurement is
+taken from its device timestamp, so a backlog transferred days later still
+ends up in the hours it was measured in.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from statistics import fmean
+from typing import NamedTuple
+
+from .reading import MeasurementRecord
+
+
+class HourlyStatistic(NamedTuple):
+    """Mean, minimum and maximum of the values measured in one hour."""
+
+    start: datetime
+    mean: float
+    minimum: float
+    maximum: float
+
+
+def hour_start(time: datetime) -> datetime:
+    """Return the start of the hour of `time`."""
+    return time.replace(minute=0, second=0, microsecond=0)
+
+
+def hourly_statistics(
+        records: Iterable[MeasurementRecord],
+        key: str,
+        to_utc: Callable[[datetime], datetime],
+) -> dict[int | None, list[HourlyStatistic]]:
+    """Return the hourly statistics of a field of all users under None and of each user, sorted by hour.
+
+    Records without user id are only part of the statistics of all users.
+    `to_utc` converts the naive local time of a record to UTC; the hours are
+    UTC hours, as in the recorder.
+    """
+    buckets: dict[tuple[int | None, datetime], list[float]] = {}
+    for record in records:
+        value = record.get(key)
+        if value is None:
+            continue
+        start = hour_start(to_utc(record.time))
+        buckets.setdefault((None, start), []).append(value)
+        if record.user_id is not None:
+            buckets.setdefault((record.user_id, start), []).append(value)
+
+    statistics: dict[int | None, list[HourlyStatistic]] = {}
+    for (user_id, start), values in sorted(buckets.items(), key=lambda item: item[0][1]):
+        statistics.setdefault(user_id, []).append(HourlyStatistic(start, fmean(values), min(values), max(values)))
+    return statistics
@@ -0,0 +1,129 @@
+"""Advertisement matcher for supported Medisana Blood Pressure devices.
+
+Discovery calls the matcher for every advertisement a proxy forwards, so the
+supported ids are normalized once and the verdict is cached per address
+until the advertised name, manufacturer ids or service UUIDs change.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Collection, Iterable
+from functools import lru_cache
+import logging
+from typing import Any
+
+from .helpers import mask_mac
+from .supported_devices import (
+    MANUFACTURER_IDS,
+    SUPPORTED_NAME_PREFIX,
+    SUPPORTED_SERVICE_UUIDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_ADDRESSES = 256
+
+# Bluetooth Base UUID 00000000-0000-1000-8000-00805f9b34fb, 16 and 32 bit UUIDs are shifted by 96 bit
+_BASE_UUID = 0x0000000000001000800000805F9B34FB
+_SHORT_UUID_SHIFT = 96
+
+
+@lru_cache(maxsize=1024)
+def uuid_to_int(uuid: str) -> int | None:
+    """Return a 16, 32 or 128 bit UUID string as 128 bit int, None if it is malformed."""
+    digits = uuid.replace("-", "")
+    try:
+        value = int(digits, 16)
+    except ValueError:
+        return None
+    if len(digits) <= 8:  # noqa PLR2004
+        return _BASE_UUID | value << _SHORT_UUID_SHIFT
+    return value
+
+
+_SUPPORTED_UUIDS = frozenset(uuid_to_int(uuid) for uuid in SUPPORTED_SERVICE_UUIDS)
+_MANUFACTURER_IDS = frozenset(MANUFACTURER_IDS)
+
+_Signature = tuple[str | None, tuple[int, ...], tuple[str, ...]]
+
+
+def _signature(service_info: Any) -> _Signature:
+    return (
+        service_info.name,
+        tuple(getattr(service_info, "manufacturer_data", None) or ()),
+        tuple(getattr(service_info, "service_uuids", None) or ()),
+    )
+
+
+def _match(signature: _Signature) -> bool:
+    name, manufacturer_ids, uuids = signature
+    return bool(
+        (name and name.startswith(SUPPORTED_NAME_PREFIX))
+        or not _MANUFACTURER_IDS.isdisjoint(manufacturer_ids)
+        or any(uuid_to_int(uuid) in _SUPPORTED_UUIDS for uuid in uuids)
+    )
+
+
+class AdvertisementMatcher:
+    """Match advertisements against the supported devices, caching the verdict per address.
+
+    The verdict is only computed and logged again when the advertisement of an
+    address changes. The least recently seen addresses are forgotten first.
+    """
+
+    def __init__(self, max_addresses: int = DEFAULT_MAX_ADDRESSES) -> None:
+        self.max_addresses = max_addresses
+        self._verdicts: OrderedDict[str, tuple[_Signature, bool]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached addresses."""
+        return len(self._verdicts)
+
+    def supported(self, service_info: Any) -> bool:
+        """Return True if the advertisement belongs to a supported device."""
+        signature = _signature(service_info)
+        address = getattr(service_info, "address", None)
+        if address is None:
+            return _match(signature)
+
+        cached = self._verdicts.get(address)
+        if cached is not None and cached[0] == signature:
+            self._verdicts.move_to_end(address)
+            return cached[1]
+
+        verdict = _match(signature)
+        self._verdicts[address] = (signature, verdict)
+        self._verdicts.move_to_end(address)
+        if len(self._verdicts) > self.max_addresses:
+            self._verdicts.popitem(last=False)
+        _LOGGER.debug("Advertisement of %s (%s) supported: %s", mask_mac(address), signature[0], verdict)
+        return verdict
+
+    def clear(self) -> None:
+        """Forget all cached verdicts."""
+        self._verdicts.clear()
+
+
+_MATCHER = AdvertisementMatcher()
+
+
+def supported(service_info: Any) -> bool:
+    """Return True if the advertisement belongs to a supported device, using the shared matcher."""
+    return _MATCHER.supported(service_info)
+
+
+def rank_candidates(service_infos: Iterable[Any], exclude: Collection[str | None] = ()) -> list[Any]:
+    """Return the supported advertisements, strongest signal and most recently seen first.
+
+    Only the latest advertisement of an address is kept, addresses in `exclude` are skipped.
+    """
+    candidates: dict[str, Any] = {}
+    for service_info in service_infos:
+        address = service_info.address
+        if address in exclude or not supported(service_info):
+            continue
+        known = candidates.get(address)
+        if known is None or service_info.time > known.time:
+            candidates[address] = service_info
+    return sorted(candidates.values(), key=lambda info: (info.rssi, info.time), reverse=True)
@@ -0,0 +1,139 @@
+"""Runtime metrics of a Medisana Blood Pressure device connection.
+
+The metrics are cheap enough to be recorded on every notification and
+advertisement: histograms have fixed buckets and the advertisement rate is
+counted in one bucket per second. Times are monotonic seconds, e.g. from
+`loop.time()`.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Sequence
+from typing import Any
+
+# Upper bounds of the histogram buckets, a last bucket collects larger values
+PARSE_LATENCY_BOUNDS = (1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, 1000.0)  # µs
+NOTIFICATION_BOUNDS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+DURATION_BOUNDS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)  # seconds
+RATE_WINDOW = 60  # seconds
+
+
+class Histogram:
+    """Histogram with fixed buckets that also keeps count, sum, min, max and the last value."""
+
+    __slots__ = ("bounds", "buckets", "count", "last", "maximum", "minimum", "total")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.minimum: float | None = None
+        self.maximum: float | None = None
+        self.last: float | None = None
+
+    def add(self, value: float) -> None:
+        """Record a value."""
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.last = value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the recorded values."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram with buckets keyed by their upper bound."""
+        buckets = {f"<={bound:g}": count for bound, count in zip(self.bounds, self.buckets, strict=False)}
+        buckets[f">{self.bounds[-1]:g}"] = self.buckets[-1]
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.minimum,
+            "max": self.maximum,
+            "last": self.last,
+            "buckets": buckets,
+        }
+
+
+class RateMeter:
+    """Number of events within the last `window` seconds, counted per second."""
+
+    def __init__(self, window: int = RATE_WINDOW) -> None:
+        self.window = window
+        self.total = 0
+        self._seconds: deque[list[int]] = deque()
+
+    def add(self, now: float) -> None:
+        """Record an event at monotonic time `now`."""
+        self.total += 1
+        second = int(now)
+        if self._seconds and self._seconds[-1][0] == second:
+            self._seconds[-1][1] += 1
+        else:
+            self._seconds.append([second, 1])
+            self._expire(second)
+
+    def _expire(self, second: int) -> None:
+        while self._seconds and self._seconds[0][0] <= second - self.window:
+            self._seconds.popleft()
+
+    def rate(self, now: float) -> float:
+        """Return the events per minute within the window ending at `now`."""
+        self._expire(int(now))
+        return sum(count for _, count in self._seconds) * 60 / self.window
+
+
+class ConnectionMetrics:
+    """Timing of the advertisements, sessions and notifications of one device."""
+
+    def __init__(self) -> None:
+        self.parse_latency = Histogram(PARSE_LATENCY_BOUNDS)
+        self.notifications_per_session = Histogram(NOTIFICATION_BOUNDS)
+        self.session_duration = Histogram(DURATION_BOUNDS)
+        self.time_to_first_notification = Histogram(DURATION_BOUNDS)
+        self.queue_wait = Histogram(DURATION_BOUNDS)
+        self.advertisements = RateMeter()
+        self._session_started: float | None = None
+        self._requested_at: float | None = None
+
+    def session_started(self, now: float, requested_at: float | None) -> None:
+        """Record the start of a session requested by an advertisement at `requested_at`."""
+        self._session_started = now
+        self._requested_at = requested_at
+
+    def notification(self, now: float) -> None:
+        """Record a notification; the first one of a session completes the time to first notification."""
+        if self._requested_at is not None:
+            self.time_to_first_notification.add(now - self._requested_at)
+            self._requested_at = None
+
+    def session_finished(self, now: float, notifications: int) -> None:
+        """Record the end of a session."""
+        if self._session_started is not None:
+            self.session_duration.add(now - self._session_started)
+            self._session_started = None
+        self._requested_at = None
+        self.notifications_per_session.add(notifications)
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        """Return all metrics."""
+        return {
+            "parse_latency_us": self.parse_latency.as_dict(),
+            "notifications_per_session": self.notifications_per_session.as_dict(),
+            "session_duration_s": self.session_duration.as_dict(),
+            "time_to_first_notification_s": self.time_to_first_notification.as_dict(),
+            "queue_wait_s": self.queue_wait.as_dict(),
+            "advertisements": {
+                "total": self.advertisements.total,
+                "per_minute": self.advertisements.rate(now),
+            },
+        }
@@ -10,15 +10,22 @@ import struct
 from bluetooth_sensor_state_data import BluetoothData
 from habluetooth import BluetoothServiceInfo, BluetoothServiceInfoBleak
 
-from .supported_devices import (
-    MANUFACTURER_IDS,
-    SUPPORTED_NAME_PREFIX,
-    SUPPORTED_SERVICE_UUIDS,
-)
+from . import matcher
+from .reading import MeasurementRecord
+from .supported_devices import DEVICE_TITLE
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class InvalidFrameError(ValueError):
+    """A measurement frame is shorter than announced by its flags."""
+
+    def __init__(self, index: int | None = None) -> None:
+        where = "Frame" if index is None else f"Frame {index}"
+        super().__init__(f"{where} is shorter than announced by its flags")
+        self.index = index
+
+
 
 class MedisanaBPBluetoothDeviceData(BluetoothData):
     """Data for MedisanaBP BLE sensors."""
@@ -45,93 +52,131 @@ class MedisanaBPBluetoothDeviceData(BluetoothData):
         - Devices with known manufacturer IDs (18498, 31256)
         - Devices advertising standard Blood Pressure Service (0x1810 / UUID 00001810-0000-1000-8000-00805f9b34fb)
         - Devices with any service UUID in SUPPORTED_SERVICE_UUIDS
-        """
-        # Name-based check
-        name_supported = bool(service_info.name and service_info.name.startswith(SUPPORTED_NAME_PREFIX))
 
-        # Manufacturer-based check
-        manufacturer_ids = getattr(service_info, "manufacturer_data", {}).keys()
-        manufacturer_supported = any(mid in MANUFACTURER_IDS for mid in manufacturer_ids)
-
-        # Service UUID check
-        uuids = getattr(service_info, "service_uuids", []) or []
-        service_supported = any(uuid.lower() in SUPPORTED_SERVICE_UUIDS for uuid in uuids)
-
-        is_supported = name_supported or manufacturer_supported or service_supported
-        _LOGGER.warning("supported?: %s -> %s", service_info, is_supported)
-        return is_supported
+        The verdict is cached per address, see `matcher.AdvertisementMatcher`.
+        """
+        return matcher.supported(service_info)
 
     @property
     def title(self)->str:
-        return "Medisana Blutdruckmesser"
+        return DEVICE_TITLE
 
     def get_device_name(self, device_id:str|None = None)->str|None: #NOQA ARG002
         return "Medisana BP"
 
 
-def parse_blood_pressure(data: bytes) -> dict[str,int|float|str|datetime|None]: #noqa PLR0915
-    """Parse blood pressure data from Medisana BP."""
-    offset = 0
-    flags = data[offset]
-    offset += 1
-
-    result:dict[str,int|float|str|datetime|None] = {}
-
-    # unit_kpa = (flags & 0x01) != 0
-    time_stamp_present = (flags & 0x02) != 0
-    pulse_rate_present = (flags & 0x04) != 0
-    user_id_present = (flags & 0x08) != 0
-    measurement_status_present = (flags & 0x10) != 0
-
-    def parse_sfloat(b:bytes)->float|int:
-        raw = struct.unpack('<H', b)[0]
-        mantissa = raw & 0x0FFF
-        exponent = (raw & 0xF000) >> 12
-        if exponent >= 0x8:#noqa PLR2004
-            exponent = exponent - 0x10
-        if mantissa >= 0x800: #noqa PLR2004
-            mantissa = mantissa - 0x1000
-        return float(mantissa) * pow(10, exponent)
-
-    result['systolic'] = parse_sfloat(data[offset:offset+2])
-    offset += 2
-    result['diastolic'] = parse_sfloat(data[offset:offset+2])
-    offset += 2
-    result['mean_arterial_pressure'] = parse_sfloat(data[offset:offset+2])
-    offset += 2
-
-    if time_stamp_present:
-        year = int(struct.unpack('<H', data[offset:offset+2])[0])
-        month = int(data[offset+2])
-        day = int(data[offset+3])
-        hour = int(data[offset+4])
-        minute = int(data[offset+5])
-        second = int(data[offset+6])
-        offset += 7
+# Flags of the Blood Pressure Measurement characteristic (0x2A35)
+FLAG_UNIT_KPA = 0x01
+FLAG_TIMESTAMP = 0x02
+FLAG_PULSE_RATE = 0x04
+FLAG_USER_ID = 0x08
+FLAG_MEASUREMENT_STATUS = 0x10
+
+
+def _build_layouts() -> tuple[struct.Struct, ...]:
+    """Return one precompiled frame layout per combination of the optional fields.
+
+    The layouts are indexed by `(flags >> 1) & 0x0F`.
+    """
+    layouts = []
+    for index in range(16):
+        flags = index << 1
+        fmt = "<B3H"  # flags, systolic, diastolic, mean arterial pressure
+        if flags & FLAG_TIMESTAMP:
+            fmt += "H5B"  # year, month, day, hour, minute, second
+        if flags & FLAG_PULSE_RATE:
+            fmt += "H"
+        if flags & FLAG_USER_ID:
+            fmt += "B"
+        if flags & FLAG_MEASUREMENT_STATUS:
+            fmt += "H"
+        layouts.append(struct.Struct(fmt))
+    return tuple(layouts)
+
+
+_LAYOUTS = _build_layouts()
+# SFLOAT = 4 bit signed exponent, 12 bit signed mantissa
+_SFLOAT_MANTISSA = tuple(float(m - 0x1000 if m >= 0x800 else m) for m in range(0x1000))  # noqa PLR2004
+_SFLOAT_SCALE = tuple(pow(10, e - 0x10 if e >= 0x8 else e) for e in range(0x10))  # noqa PLR2004
+
+
+def _decode(
+        data: bytes | bytearray | memoryview,
+) -> tuple[float, float, float, datetime | None, float | None, int | None, int | None]:
+    """Decode a frame into systolic, diastolic, mean arterial pressure, timestamp, pulse rate, user id and status.
+
+    The whole frame is decoded with a single precompiled layout selected by
+    the flags byte; SFLOAT values are scaled with lookup tables.
+    """
+    flags = data[0]
+    values = _LAYOUTS[(flags >> 1) & 0x0F].unpack_from(data)
+    mantissa = _SFLOAT_MANTISSA
+    scale = _SFLOAT_SCALE
+    index = 4
+
+    timestamp: datetime | None = None
+    if flags & FLAG_TIMESTAMP:
         try:
-            result['timestamp'] = datetime(year, month, day, hour, minute, second)
-        except Exception as e:
+            timestamp = datetime(*values[4:10])
+        except ValueError as e:
             _LOGGER.warning(f"Invalid Timestamp: {e}")
-            result['timestamp'] = None
-    else:
-        result['timestamp'] = None
-
-    if pulse_rate_present:
-        result['pulse_rate'] = parse_sfloat(data[offset:offset+2])
-        offset += 2
-    else:
-        result['pulse_rate'] = None
-
-    if user_id_present:
-        result['user_id'] = data[offset]
-        offset += 1
-    else:
-        result['user_id'] = None
-
-    if measurement_status_present:
-        result['measurement_status'] = struct.unpack('<H', data[offset:offset+2])[0]
-        offset += 2
-    else:
-        result['measurement_status'] = None
-
-    return result
\ No newline at end of file
+        index = 10
+
+    pulse_rate: float | None = None
+    if flags & FLAG_PULSE_RATE:
+        raw = values[index]
+        pulse_rate = mantissa[raw & 0x0FFF] * scale[raw >> 12]
+        index += 1
+
+    user_id: int | None = None
+    if flags & FLAG_USER_ID:
+        user_id = values[index]
+        index += 1
+
+    measurement_status: int | None = None
+    if flags & FLAG_MEASUREMENT_STATUS:
+        measurement_status = values[index]
+
+    systolic = values[1]
+    diastolic = values[2]
+    mean_arterial_pressure = values[3]
+    return (
+        mantissa[systolic & 0x0FFF] * scale[systolic >> 12],
+        mantissa[diastolic & 0x0FFF] * scale[diastolic >> 12],
+        mantissa[mean_arterial_pressure & 0x0FFF] * scale[mean_arterial_pressure >> 12],
+        timestamp,
+        pulse_rate,
+        user_id,
+        measurement_status,
+    )
+
+
+def parse_measurement(
+        data: bytes | bytearray | memoryview,
+        received: datetime,
+        rssi: int | None = None,
+        battery: int | None = None,
+) -> MeasurementRecord:
+    """Parse a Blood Pressure Measurement frame (0x2A35) into a record.
+
+    `received` is the naive local time the frame arrived at.
+    """
+    return MeasurementRecord(*_decode(data), received, rssi, battery)
+
+
+def parse_blood_pressure(data: bytes | bytearray | memoryview) -> dict[str,int|float|str|datetime|None]:
+    """Parse blood pressure data from Medisana BP into a dict.
+
+    Prefer `parse_measurement`, which returns a compact typed record.
+    """
+    systolic, diastolic, mean_arterial_pressure, timestamp, pulse_rate, user_id, measurement_status = _decode(data)
+    return {
+        "systolic": systolic,
+        "diastolic": diastolic,
+        "mean_arterial_pressure": mean_arterial_pressure,
+        "timestamp": timestamp,
+        "pulse_rate": pulse_rate,
+        "user_id": user_id,
+        "measurement_status": measurement_status,
+    }
+
@@ -0,0 +1,145 @@
+"""Connection slots shared by all Medisana Blood Pressure devices.
+
+A Bluetooth adapter or proxy can only hold a few connections at a time.
+When several cuffs are reachable through the same proxy, uncoordinated
+connection attempts take each other's slots and time out. The pool limits
+the concurrent GATT sessions per adapter and queues the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+import heapq
+from itertools import count
+import logging
+from typing import Any
+
+from .metrics import DURATION_BOUNDS, Histogram
+
+_LOGGER = logging.getLogger(__name__)
+
+# ESPHome proxies have three connection slots, one is left for other integrations
+DEFAULT_MAX_SESSIONS = 2
+# A cuff is only connectable for a short time after a measurement
+DEFAULT_MAX_WAIT = 30.0
+
+# Lower values are served first
+PRIORITY_MEASUREMENT = 0  # the device just advertised a new measurement
+PRIORITY_RETRY = 1  # a failed session is retried
+
+
+class QueueTimeoutError(TimeoutError):
+    """No connection slot of the adapter became free in time."""
+
+    def __init__(self, adapter: str, wait: float) -> None:
+        super().__init__(f"No free connection slot on {adapter} within {wait:.0f} s")
+
+
+@dataclass
+class _Adapter:
+    """Sessions of one adapter; waiters are (priority, sequence, future) tuples."""
+
+    active: int = 0
+    waiters: list[tuple[int, int, asyncio.Future[None]]] = field(default_factory=list)
+    max_queued: int = 0
+    sessions: int = 0
+
+
+class ConnectionPool:
+    """Limit the concurrent GATT sessions per adapter and grant free slots by priority.
+
+    Requests of the same priority are served first come, first served. Each
+    device has at most one pending request (see `ConnectionScheduler`), so
+    no device can monopolise an adapter.
+    """
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_SESSIONS, max_wait: float = DEFAULT_MAX_WAIT) -> None:
+        self.max_sessions = max_sessions
+        self.max_wait = max_wait
+        self.wait_time = Histogram(DURATION_BOUNDS)
+        self.timeouts = 0
+        self._adapters: dict[str, _Adapter] = {}
+        self._sequence = count()
+
+    def queued(self, adapter: str | None = None) -> int:
+        """Return the number of waiting requests, of one adapter or of all."""
+        if adapter is not None:
+            return len(self._adapters[adapter].waiters) if adapter in self._adapters else 0
+        return sum(len(state.waiters) for state in self._adapters.values())
+
+    def active(self, adapter: str | None = None) -> int:
+        """Return the number of running sessions, of one adapter or of all."""
+        if adapter is not None:
+            return self._adapters[adapter].active if adapter in self._adapters else 0
+        return sum(state.active for state in self._adapters.values())
+
+    @asynccontextmanager
+    async def session(self, adapter: str, priority: int = PRIORITY_MEASUREMENT) -> AsyncIterator[float]:
+        """Hold a connection slot of `adapter` and yield the time waited for it in seconds.
+
+        Raises `QueueTimeoutError` if no slot became free within `max_wait`.
+        """
+        loop = asyncio.get_running_loop()
+        state = self._adapters.setdefault(adapter, _Adapter())
+        requested = loop.time()
+        if state.active < self.max_sessions and not state.waiters:
+            state.active += 1
+        else:
+            await self._wait(state, adapter, priority)
+        waited = loop.time() - requested
+        self.wait_time.add(waited)
+        state.sessions += 1
+        try:
+            yield waited
+        finally:
+            self._release(state)
+
+    async def _wait(self, state: _Adapter, adapter: str, priority: int) -> None:
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(state.waiters, (priority, next(self._sequence), future))
+        state.max_queued = max(state.max_queued, len(state.waiters))
+        _LOGGER.debug(f"Waiting for a connection slot on {adapter}, {len(state.waiters)} queued")
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.max_wait)
+        except (TimeoutError, asyncio.CancelledError) as err:
+            if future.done() and not future.cancelled():
+                # The slot was granted just now, pass it on
+                self._release(state)
+            else:
+                future.cancel()
+                state.waiters = [waiter for waiter in state.waiters if waiter[2] is not future]
+                heapq.heapify(state.waiters)
+            if isinstance(err, TimeoutError):
+                self.timeouts += 1
+                raise QueueTimeoutError(adapter, self.max_wait) from None
+            raise
+
+    def _release(self, state: _Adapter) -> None:
+        while state.waiters:
+            _, _, future = heapq.heappop(state.waiters)
+            if not future.done():
+                # The slot is handed over, the number of active sessions is unchanged
+                future.set_result(None)
+                return
+        state.active -= 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state and the wait times of the pool."""
+        return {
+            "max_sessions": self.max_sessions,
+            "max_wait": self.max_wait,
+            "timeouts": self.timeouts,
+            "wait_time_s": self.wait_time.as_dict(),
+            "adapters": {
+                adapter: {
+                    "active": state.active,
+                    "queued": len(state.waiters),
+                    "max_queued": state.max_queued,
+                    "sessions": state.sessions,
+                }
+                for adapter, state in self._adapters.items()
+            },
+        }
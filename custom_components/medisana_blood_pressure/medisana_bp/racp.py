@@ -0,0 +1,153 @@
+"""Record Access Control Point (0x2A52) of Medisana Blood Pressure devices.
+
+Without a request the cuff sends its stored records when the measurement
+notifications are subscribed, which is often its whole memory. Devices with a
+Record Access Control Point can instead be asked for the records from a given
+time on, and confirm when all of them were sent, so the session can end
+without waiting for an idle gap.
+
+Blood pressure records carry no sequence number, so records are selected by
+their user facing time (the timestamp of the frame).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import logging
+import struct
+from typing import NamedTuple
+
+from bleak import BleakClient, BleakGATTCharacteristic
+
+_LOGGER = logging.getLogger(__name__)
+
+# Op codes
+OP_REPORT_STORED_RECORDS = 0x01
+OP_REPORT_NUMBER_OF_RECORDS = 0x04
+OP_NUMBER_OF_RECORDS_RESPONSE = 0x05
+OP_RESPONSE_CODE = 0x06
+
+# Operators
+OPERATOR_NULL = 0x00
+OPERATOR_ALL_RECORDS = 0x01
+OPERATOR_GREATER_OR_EQUAL = 0x03
+
+FILTER_USER_FACING_TIME = 0x02
+
+# Response codes
+RESPONSE_SUCCESS = 0x01
+RESPONSE_OP_CODE_NOT_SUPPORTED = 0x02
+RESPONSE_OPERATOR_NOT_SUPPORTED = 0x04
+RESPONSE_NO_RECORDS_FOUND = 0x06
+RESPONSE_OPERAND_NOT_SUPPORTED = 0x09
+# The device cannot select records like this, but may support other requests
+_UNSUPPORTED = frozenset({RESPONSE_OP_CODE_NOT_SUPPORTED, RESPONSE_OPERATOR_NOT_SUPPORTED,
+                          RESPONSE_OPERAND_NOT_SUPPORTED})
+
+_TIME = struct.Struct("<HBBBBB")
+
+
+class RecordAccessError(Exception):
+    """The device rejected a Record Access Control Point request."""
+
+    def __init__(self, request: int, code: int) -> None:
+        super().__init__(f"Record access request {request:#04x} failed with response code {code:#04x}")
+        self.request = request
+        self.code = code
+
+    @property
+    def unsupported(self) -> bool:
+        """Return True if the device does not support the request."""
+        return self.code in _UNSUPPORTED
+
+
+class RacpResponse(NamedTuple):
+    """An indication of the Record Access Control Point."""
+
+    op_code: int
+    request: int | None = None
+    value: int = 0
+
+
+def build_request(op_code: int, since: datetime | None) -> bytes:
+    """Return a request for all records, or for the records at or after `since`."""
+    if since is None:
+        return bytes((op_code, OPERATOR_ALL_RECORDS))
+    return bytes((op_code, OPERATOR_GREATER_OR_EQUAL, FILTER_USER_FACING_TIME)) + _TIME.pack(
+        since.year, since.month, since.day, since.hour, since.minute, since.second)
+
+
+def parse_response(data: bytes | bytearray) -> RacpResponse:
+    """Parse an indication of the Record Access Control Point."""
+    op_code = data[0]
+    if op_code == OP_NUMBER_OF_RECORDS_RESPONSE:
+        return RacpResponse(op_code, OP_REPORT_NUMBER_OF_RECORDS, int.from_bytes(data[2:4], "little"))
+    if op_code == OP_RESPONSE_CODE:
+        return RacpResponse(op_code, data[2], data[3])
+    return RacpResponse(op_code)
+
+
+class RecordAccessControlPoint:
+    """Requests to the Record Access Control Point of a connected device."""
+
+    def __init__(self, client: BleakClient, characteristic: BleakGATTCharacteristic) -> None:
+        self._client = client
+        self._characteristic = characteristic
+        self._responses: asyncio.Queue[RacpResponse] = asyncio.Queue()
+
+    async def start(self) -> None:
+        """Subscribe to the indications with the responses."""
+        await self._client.start_notify(self._characteristic, self._indication)
+
+    def _indication(self, _sender: BleakGATTCharacteristic, data: bytearray) -> None:
+        self._responses.put_nowait(parse_response(data))
+
+    async def _request(self, request: bytes, timeout: float) -> RacpResponse:
+        await self._client.write_gatt_char(self._characteristic, request, response=True)
+        response = await asyncio.wait_for(self._responses.get(), timeout)
+        if response.op_code == OP_RESPONSE_CODE and response.value not in (RESPONSE_SUCCESS,
+                                                                          RESPONSE_NO_RECORDS_FOUND):
+            raise RecordAccessError(request[0], response.value)
+        return response
+
+    async def count(self, since: datetime | None, timeout: float) -> int:
+        """Return the number of records at or after `since`."""
+        response = await self._request(build_request(OP_REPORT_NUMBER_OF_RECORDS, since), timeout)
+        return response.value if response.op_code == OP_NUMBER_OF_RECORDS_RESPONSE else 0
+
+    async def report(self, since: datetime | None, timeout: float) -> None:
+        """Request the records at or after `since` and wait until the device sent all of them.
+
+        The records arrive as notifications of the measurement characteristic.
+        """
+        await self._request(build_request(OP_REPORT_STORED_RECORDS, since), timeout)
+
+
+async def request_records(
+        client: BleakClient,
+        characteristic: BleakGATTCharacteristic,
+        since: datetime | None,
+        timeout: float,
+) -> int | None:
+    """Request the records stored at or after `since` and wait until they were sent.
+
+    Returns the number of requested records, None if the device cannot count
+    them. Raises `RecordAccessError` if the device rejects the request and
+    `TimeoutError` if counting and sending the records take longer than
+    `timeout` seconds together.
+    """
+    racp = RecordAccessControlPoint(client, characteristic)
+    # One deadline for both requests, a slow count leaves less time for the report
+    async with asyncio.timeout(timeout):
+        await racp.start()
+        try:
+            count: int | None = await racp.count(since, timeout)
+        except RecordAccessError as err:
+            if not err.unsupported:
+                raise
+            count = None
+        _LOGGER.debug(f"Requesting {count} records since {since}")
+        if count != 0:
+            await racp.report(since, timeout)
+    return count
@@ -0,0 +1,65 @@
+"""Typed record of a Medisana Blood Pressure measurement."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, NamedTuple
+
+
+class MeasurementRecord(NamedTuple):
+    """A single blood pressure measurement together with the link quality.
+
+    `received` is the naive local time the frame arrived at, comparable with
+    the naive local timestamps of the device. Records are immutable, so the
+    history and the entities can share them. A NamedTuple is used instead of
+    a frozen dataclass because it is about three times faster to create.
+    """
+
+    systolic: float
+    diastolic: float
+    mean_arterial_pressure: float
+    timestamp: datetime | None
+    pulse_rate: float | None
+    user_id: int | None
+    measurement_status: int | None
+    received: datetime
+    rssi: int | None = None
+    battery: int | None = None
+
+    @property
+    def time(self) -> datetime:
+        """Return the time the record is sorted by.
+
+        Frames without a timestamp are placed at the time they were received.
+        """
+        return self.timestamp if self.timestamp is not None else self.received
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a field by name, like `dict.get`."""
+        return getattr(self, key, default) if key in self._fields else default
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record in the format of `parse_blood_pressure` plus rssi and battery."""
+        return {
+            "systolic": self.systolic,
+            "diastolic": self.diastolic,
+            "mean_arterial_pressure": self.mean_arterial_pressure,
+            "timestamp": self.timestamp,
+            "pulse_rate": self.pulse_rate,
+            "user_id": self.user_id,
+            "measurement_status": self.measurement_status,
+            "rssi": self.rssi,
+            "battery": self.battery,
+        }
+
+    def as_json(self) -> dict[str, Any]:
+        """Return `as_dict` with the timestamp as ISO 8601 string, for events and service responses."""
+        data = self.as_dict()
+        if self.timestamp is not None:
+            data["timestamp"] = self.timestamp.isoformat()
+        return data
+
+    def __repr__(self) -> str:
+        """Return a short representation for logging."""
+        return (f"MeasurementRecord({self.time}, {self.systolic}/{self.diastolic}, "
+                f"pulse={self.pulse_rate}, user={self.user_id})")
@@ -0,0 +1,148 @@
+"""Connection scheduling for Medisana Blood Pressure devices.
+
+A cuff advertises several times per second while it is awake. Starting a GATT
+session for every advertisement floods the Bluetooth adapter (or proxy) with
+overlapping connection attempts. The scheduler collapses such bursts into a
+single session per device and backs off after failed attempts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+import contextlib
+import logging
+
+from bleak import BleakError
+
+_LOGGER = logging.getLogger(__name__)
+
+# Wait this long after the first advertisement before connecting, so that the
+# whole advertisement burst is collapsed into one session.
+DEFAULT_DEBOUNCE = 1.0
+# Ignore advertisements for this long after a successful session; the cuff
+# keeps advertising for a while after it has transferred its data.
+DEFAULT_COOLDOWN = 30.0
+DEFAULT_BACKOFF_INITIAL = 5.0
+DEFAULT_BACKOFF_MAX = 300.0
+
+
+class ConnectionScheduler:
+    """Single-flight scheduler for the GATT sessions of one device.
+
+    `request` may be called for every advertisement. At most one session is
+    pending or running at any time; all further requests are coalesced into
+    it. After a `BleakError` or `TimeoutError` the next session is delayed
+    with an exponential backoff.
+    """
+
+    def __init__(  # noqa PLR0913
+            self,
+            session: Callable[[], Awaitable[None]],
+            name: str,
+            debounce: float = DEFAULT_DEBOUNCE,
+            cooldown: float = DEFAULT_COOLDOWN,
+            backoff_initial: float = DEFAULT_BACKOFF_INITIAL,
+            backoff_max: float = DEFAULT_BACKOFF_MAX,
+    ) -> None:
+        self._session = session
+        self._name = name
+        self._debounce = debounce
+        self._cooldown = cooldown
+        self._backoff_initial = backoff_initial
+        self._backoff_max = backoff_max
+
+        self._timer: asyncio.TimerHandle | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._not_before = 0.0
+        self._failures = 0
+        self._cancelled = False
+
+        self.sessions_started = 0
+        self.sessions_coalesced = 0
+        self.sessions_failed = 0
+        self.failures_by_error: Counter[str] = Counter()
+        # Loop time of the request the pending or running session was scheduled for
+        self.requested_at: float | None = None
+
+    @property
+    def busy(self) -> bool:
+        """Return True if a session is pending or running."""
+        return self._timer is not None or (self._task is not None and not self._task.done())
+
+    @property
+    def retrying(self) -> bool:
+        """Return True if the pending or running session retries a failed one."""
+        return self._failures > 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the session counters."""
+        return {
+            "sessions_started": self.sessions_started,
+            "sessions_coalesced": self.sessions_coalesced,
+            "sessions_failed": self.sessions_failed,
+        }
+
+    def request(self) -> None:
+        """Request a session, collapsing it with a pending or running one.
+
+        Must be called from the event loop.
+        """
+        if self._cancelled:
+            return
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self.busy or (self._failures == 0 and now < self._not_before):
+            self.sessions_coalesced += 1
+            return
+
+        # During a backoff the session is scheduled for the end of the backoff window
+        delay = max(self._debounce, self._not_before - now)
+        self.requested_at = now
+        self._timer = loop.call_later(delay, self._start_session)
+
+    def _start_session(self) -> None:
+        self._timer = None
+        if self._cancelled:
+            return
+        self.sessions_started += 1
+        self._task = asyncio.get_running_loop().create_task(
+            self._run_session(), name=f"medisana_bp session {self._name}"
+        )
+
+    async def _run_session(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            await self._session()
+        except (BleakError, TimeoutError) as err:
+            self._record_failure(loop.time(), err)
+        except Exception as err:
+            _LOGGER.exception(f"Unexpected error in session with {self._name}")
+            self._record_failure(loop.time(), err)
+        else:
+            self._failures = 0
+            self._not_before = loop.time() + self._cooldown
+
+    def _record_failure(self, now: float, err: BaseException) -> None:
+        self.sessions_failed += 1
+        self.failures_by_error[type(err).__name__] += 1
+        self._failures += 1
+        backoff = min(self._backoff_initial * 2 ** (self._failures - 1), self._backoff_max)
+        self._not_before = now + backoff
+        _LOGGER.debug(f"Session with {self._name} failed ({type(err).__name__}), "
+                      f"next attempt in {backoff:.0f} s")
+
+    async def async_cancel(self) -> None:
+        """Cancel pending and running sessions; further requests are ignored."""
+        self._cancelled = True
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        self._task = None
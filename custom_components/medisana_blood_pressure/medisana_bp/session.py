@@ -0,0 +1,100 @@
+"""Session length control for Medisana Blood Pressure devices.
+
+After connecting, a cuff sends its stored records as a quick series of
+notifications and then goes quiet. Keeping the link open for a fixed time
+wastes a connection slot of the adapter; the adaptive timer ends the session
+once no notification arrived for a while after the last one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+
+DEFAULT_MAX_DURATION = 60.0
+DEFAULT_FIRST_NOTIFICATION_TIMEOUT = 20.0
+DEFAULT_IDLE_GAP = 5.0
+MIN_IDLE_GAP = 1.0
+MAX_IDLE_GAP = 10.0
+# The idle gap is this multiple of the learned inter-notification interval
+IDLE_GAP_FACTOR = 4.0
+# Weight of a new interval sample in the exponential moving average
+INTERVAL_SMOOTHING = 0.2
+
+
+class AdaptiveSessionTimer:
+    """Decide when a notification session has drained the device backlog.
+
+    The typical interval between two notifications of a record dump is
+    learned across sessions. A session ends when no notification arrived for
+    a multiple of that interval, when no notification arrived at all within
+    `first_notification_timeout`, or after `max_duration` at the latest.
+    """
+
+    def __init__(
+            self,
+            max_duration: float = DEFAULT_MAX_DURATION,
+            first_notification_timeout: float = DEFAULT_FIRST_NOTIFICATION_TIMEOUT,
+            *,
+            adaptive: bool = True,
+    ) -> None:
+        self.max_duration = max_duration
+        self.first_notification_timeout = first_notification_timeout
+        self.adaptive = adaptive
+        self.interval: float | None = None
+        self.notifications = 0
+        self._started = 0.0
+        self._last: float | None = None
+        self._first_notification = asyncio.Event()
+
+    @property
+    def idle_gap(self) -> float:
+        """Return the idle time after which the backlog is considered drained."""
+        if self.interval is None:
+            return DEFAULT_IDLE_GAP
+        return min(max(self.interval * IDLE_GAP_FACTOR, MIN_IDLE_GAP), MAX_IDLE_GAP)
+
+    def start(self) -> None:
+        """Start a new session; call before subscribing to notifications."""
+        self._started = asyncio.get_running_loop().time()
+        self._last = None
+        self.notifications = 0
+        self._first_notification.clear()
+
+    def notify(self) -> None:
+        """Record the arrival of a notification.
+
+        Must be called from the event loop.
+        """
+        now = asyncio.get_running_loop().time()
+        if self._last is not None:
+            sample = now - self._last
+            if self.interval is None:
+                self.interval = sample
+            else:
+                self.interval += INTERVAL_SMOOTHING * (sample - self.interval)
+        self._last = now
+        self.notifications += 1
+        self._first_notification.set()
+
+    async def wait(self) -> None:
+        """Wait until the session should be ended."""
+        loop = asyncio.get_running_loop()
+        deadline = self._started + self.max_duration
+
+        while True:
+            if not self.adaptive:
+                wake = deadline
+            elif self._last is None:
+                wake = self._started + self.first_notification_timeout
+            else:
+                wake = self._last + self.idle_gap
+            wake = min(wake, deadline)
+            now = loop.time()
+            if now >= wake:
+                return
+            if self._last is None:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._first_notification.wait(), wake - now)
+            else:
+                await asyncio.sleep(wake - now)
@@ -1,5 +1,8 @@
 """Constants for supported Medisana Blood Pressure devices."""
 
+# Title of the config entries
+DEVICE_TITLE = "Medisana Blutdruckmesser"
+
 # Device name prefix
 SUPPORTED_NAME_PREFIX = "1872B"
 
@@ -11,4 +14,8 @@ SUPPORTED_SERVICE_UUIDS = {
     "00002a35-0000-1000-8000-00805f9b34fb",  # Blood Pressure Measurement characteristic
 }
 # Known manufacturer ids for supported devices
-MANUFACTURER_IDS = {18498, 31256}
\ No newline at end of file
+MANUFACTURER_IDS = {18498, 31256}
+# GATT characteristics read by the client
+BP_MEASUREMENT_UUID = "00002a35-0000-1000-8000-00805f9b34fb"
+BATTERY_LEVEL_UUID = "00002a19-0000-1000-8000-00805f9b34fb"
+RECORD_ACCESS_CONTROL_POINT_UUID = "00002a52-0000-1000-8000-00805f9b34fb"
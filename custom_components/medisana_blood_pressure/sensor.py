@@ -1,35 +1,98 @@
 """Sensor platform for Medisana Blood Pressure."""
 from __future__ import annotations
 
-import asyncio
-from collections.abc import Callable
-from datetime import UTC, datetime
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
 import logging
+import struct
+import time
 from typing import Any
 
-from bleak import BleakClient, BleakError, BleakGATTCharacteristic
+from bleak import BleakError, BleakGATTCharacteristic
+from bleak.backends.device import BLEDevice
+from bleak_retry_connector import BleakClientWithServiceCache, establish_connection
 from homeassistant.components import bluetooth
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
+    StateType,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import SIGNAL_STRENGTH_DECIBELS_MILLIWATT, UnitOfPressure
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import (
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    EntityCategory,
+    UnitOfPressure,
+    UnitOfTime,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later, async_track_time_change
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
 )
-
-from .const import BP_MEASUREMENT_UUID, CHARACTERISTIC_BATTERY, DOMAIN
-from .medisana_bp import helpers, parser
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ARCHIVE_WRITE_DELAY,
+    CONF_ADAPTIVE_SESSION,
+    CONF_BATTERY_REFRESH_INTERVAL,
+    CONF_BATTERY_REFRESH_SESSIONS,
+    CONF_DEBUG_LOGGING,
+    CONF_HISTORY_MAX_AGE,
+    CONF_HISTORY_SIZE,
+    CONF_IMPORT_STATISTICS,
+    CONF_MAX_SESSION_DURATION,
+    DATA_CONNECTION_POOL,
+    DEFAULT_ADAPTIVE_SESSION,
+    DEFAULT_BATTERY_REFRESH_INTERVAL,
+    DEFAULT_BATTERY_REFRESH_SESSIONS,
+    DEFAULT_DEBUG_LOGGING,
+    DEFAULT_HISTORY_MAX_AGE,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_IMPORT_STATISTICS,
+    DEFAULT_MAX_SESSION_DURATION,
+    DOMAIN,
+    EVENT_MEASUREMENT,
+    LAST_MEASUREMENT_ATTRIBUTE_RECORDS,
+    SIGNAL_NEW_USERS,
+    UPDATE_BATCH_WINDOW,
+)
+from .external_statistics import async_import_new_statistics, async_import_statistics
+from .medisana_bp import helpers, parser, racp
+from .medisana_bp.aggregates import WINDOWS, MeasurementAggregates
+from .medisana_bp.archive import ArchivedFrame, FrameArchive
+from .medisana_bp.battery import BatteryCache
+from .medisana_bp.debug import DeviceDebugLog, HexFrame
+from .medisana_bp.dedup import FrameDeduplicator
+from .medisana_bp.gatt import GattLayout
+from .medisana_bp.history import MeasurementHistory
+from .medisana_bp.metrics import ConnectionMetrics
+from .medisana_bp.pool import PRIORITY_MEASUREMENT, PRIORITY_RETRY, ConnectionPool
+from .medisana_bp.reading import MeasurementRecord
+from .medisana_bp.scheduler import ConnectionScheduler
+from .medisana_bp.session import AdaptiveSessionTimer
+from .medisana_bp.supported_devices import (
+    BATTERY_LEVEL_UUID,
+    BP_MEASUREMENT_UUID,
+    RECORD_ACCESS_CONTROL_POINT_UUID,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Polling interval of the diagnostic sensors, all other sensors are pushed by the coordinator
+SCAN_INTERVAL = timedelta(seconds=60)
+
 
 async def async_setup_entry(
         hass: HomeAssistant,
@@ -51,13 +114,39 @@ async def async_setup_entry(
                         MbpsDiastolic(coordinator),
                         MbpsUserId(coordinator),
                         MbpsLastMeasurement(coordinator),
-                        MbpsBattery(coordinator)])
+                        MbpsBattery(coordinator),
+                        *rolling_aggregate_sensors(coordinator),
+                        *(MbpsDiagnostic(coordinator, description) for description in DIAGNOSTIC_SENSORS)])
+
+    @callback
+    def _async_add_user_entities(user_ids: Iterable[int]) -> None:
+        entities: list[SensorEntity] = []
+        for user_id in user_ids:
+            entities.extend(sensor(coordinator, user_id=user_id) for sensor in USER_SENSORS)
+            entities.extend(rolling_aggregate_sensors(coordinator, user_id))
+        async_add_entities(entities)
+
+    _async_add_user_entities(sorted(coordinator.user_ids))
+    entry.async_on_unload(async_dispatcher_connect(
+        hass, SIGNAL_NEW_USERS.format(coordinator.mac_address), _async_add_user_entities))
+
+
+def connection_pool(hass: HomeAssistant) -> ConnectionPool:
+    """Return the connection pool shared by all monitors."""
+    if DATA_CONNECTION_POOL not in hass.data:
+        hass.data[DATA_CONNECTION_POOL] = ConnectionPool()
+    return hass.data[DATA_CONNECTION_POOL]
 
 
-class MedisanaCoordinator(DataUpdateCoordinator):
+def archive_path(hass: HomeAssistant, mac_address: str) -> str:
+    """Return the path of the measurement archive of a device."""
+    return hass.config.path(STORAGE_DIR, f"{DOMAIN}.{mac_address.replace(':', '').lower()}.bin")
+
+
+class MedisanaCoordinator(DataUpdateCoordinator[MeasurementHistory]):
     """Coordinator to manage Medisana BLE updates."""
 
-    def __init__(self, hass: HomeAssistant, mac_address: str):
+    def __init__(self, hass: HomeAssistant, mac_address: str, options: Mapping[str, Any] | None = None):
         super().__init__(
             hass,
             _LOGGER,
@@ -65,11 +154,32 @@ class MedisanaCoordinator(DataUpdateCoordinator):
             update_interval=None  # Polling not necessary, BLE Push via Callback
         )
         self.mac_address = mac_address
-        self._latest_value: dict = {}
+        options = options or {}
+        max_age = options.get(CONF_HISTORY_MAX_AGE, DEFAULT_HISTORY_MAX_AGE)
+        self.history = MeasurementHistory(
+            max_records=options.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE),
+            max_age=timedelta(days=max_age) if max_age else None,
+        )
+        self.deduplicator = FrameDeduplicator(max_frames=self.history.max_records)
+        self.archive = FrameArchive(archive_path(hass, mac_address))
+        self._archive_pending: list[ArchivedFrame] = []
+        self._archive_unsub: CALLBACK_TYPE | None = None
+        self._update_unsub: CALLBACK_TYPE | None = None
+        # Users with entities; users are added on their first measurement
+        self.user_ids: set[int] = set()
+        self._new_user_ids: list[int] = []
         self._last_seen: datetime | None = None
-        self._parsed_data: dict | None = None
+        self.metrics = ConnectionMetrics()
+        self.gatt_layout = GattLayout((BP_MEASUREMENT_UUID, BATTERY_LEVEL_UUID, RECORD_ACCESS_CONTROL_POINT_UUID))
+        self.debug_log = DeviceDebugLog(
+            str(helpers.mask_mac(mac_address)),
+            enabled=options.get(CONF_DEBUG_LOGGING, DEFAULT_DEBUG_LOGGING),
+        )
         self._rssi: int | None = None
-        self._battery: int | None = None
+        self.battery = BatteryCache(
+            refresh_interval=options.get(CONF_BATTERY_REFRESH_INTERVAL, DEFAULT_BATTERY_REFRESH_INTERVAL) * 3600,
+            refresh_sessions=options.get(CONF_BATTERY_REFRESH_SESSIONS, DEFAULT_BATTERY_REFRESH_SESSIONS),
+        )
 
         self.device_info: DeviceInfo = DeviceInfo(manufacturer="Medisana",
                                                   model="BP BLE Device",
@@ -77,6 +187,18 @@ class MedisanaCoordinator(DataUpdateCoordinator):
                                                   serial_number=None,
                                                   identifiers={("medisana_blood_pressure", self.mac_address)},
                                                   )
+        self.session_timer = AdaptiveSessionTimer(
+            max_duration=options.get(CONF_MAX_SESSION_DURATION, DEFAULT_MAX_SESSION_DURATION),
+            adaptive=options.get(CONF_ADAPTIVE_SESSION, DEFAULT_ADAPTIVE_SESSION),
+        )
+        # Measurements go to the long-term statistics at their device time instead of the recorder's
+        self.import_statistics: bool = options.get(CONF_IMPORT_STATISTICS, DEFAULT_IMPORT_STATISTICS)
+        self._statistics_pending: list[MeasurementRecord] = []
+        self.aggregates = MeasurementAggregates()
+        self.pool = connection_pool(hass)
+        self.scheduler = ConnectionScheduler(self.connect_and_subscribe,
+                                             name=str(helpers.mask_mac(self.mac_address)))
+
         self._unsub: Callable[[], None] | None = None
         self._unsub = bluetooth.async_register_callback(
             hass,
@@ -89,68 +211,231 @@ class MedisanaCoordinator(DataUpdateCoordinator):
         _LOGGER.debug(f"Coordinator initialized: {id(self)}")
 
     def notification_handler(self, sender: BleakGATTCharacteristic, data: bytearray) -> None:
-        _LOGGER.debug(f"Notification from {sender}: {data.hex()}")
-        parsed = parser.parse_blood_pressure(data)
+        self.session_timer.notify()
+        self.metrics.notification(self.hass.loop.time())
+        frame = bytes(data)
+        received = dt_util.now().replace(tzinfo=None)
+        self.debug_log.record_frame(frame, received)
+        self.debug_log.debug("Notification from %s: %s", sender, HexFrame(frame))
+        if self.deduplicator.seen(frame):
+            return
 
-        _LOGGER.debug(f"Parsed data: {parsed}")
+        start = time.perf_counter()
+        record = parser.parse_measurement(frame, received, self._rssi, self.battery.level)
+        self.metrics.parse_latency.add((time.perf_counter() - start) * 1e6)
+        self.debug_log.debug("Parsed %s", record)
+        if self.history.add(record):
+            self.aggregates.add(record)
+            self._archive_pending.append(ArchivedFrame(frame, received, self._rssi, self.battery.level))
+            if self.import_statistics:
+                self._statistics_pending.append(record)
+            if self._archive_unsub is None:
+                self._archive_unsub = async_call_later(self.hass, ARCHIVE_WRITE_DELAY, self._async_write_archive)
+
+        if record.user_id is not None and record.user_id not in self.user_ids:
+            self.user_ids.add(record.user_id)
+            self._new_user_ids.append(record.user_id)
 
-        if self._latest_value is None:
-            self._latest_value = {}
+        self._last_seen = datetime.now(UTC)
+        self._fire_measurement_event(record)
 
-        if parsed is not None:
-            self._latest_value[parsed['timestamp']] = parsed
-            self._latest_value[parsed['timestamp']]['rssi'] = self._rssi
-            self._latest_value[parsed['timestamp']]['battery'] = self._battery
+        # A memory dump arrives as a burst of notifications, entities are updated once per burst
+        if self._update_unsub is None:
+            self._update_unsub = async_call_later(self.hass, UPDATE_BATCH_WINDOW, self._async_publish_update)
 
-        self._last_seen = datetime.now(UTC)
-        _LOGGER.debug(f"notification_handler New value for self._latest_value: {self._latest_value}")
-        self.async_set_updated_data(self._latest_value)
+    def _fire_measurement_event(self, record: MeasurementRecord) -> None:
+        """Fire an event for a single received measurement."""
+        self.hass.bus.async_fire(EVENT_MEASUREMENT, {"address": self.mac_address, **record.as_json()})
+
+    @callback
+    def _async_publish_update(self, _now: datetime | None = None) -> None:
+        """Publish the measurements received since the last update to the entities."""
+        if self._update_unsub is None:
+            return
+        self._update_unsub()
+        self._update_unsub = None
+        self.debug_log.debug("Publishing update, history holds %d records", len(self.history))
+        self.async_set_updated_data(self.history)
+        if self._statistics_pending:
+            imported = async_import_statistics(self.hass, self.mac_address, self.history, self._statistics_pending)
+            self.debug_log.debug("Imported %d hourly statistics of %d measurements",
+                                 imported, len(self._statistics_pending))
+            self._statistics_pending = []
+        if self._new_user_ids:
+            _LOGGER.debug(f"Adding entities for users {self._new_user_ids}")
+            async_dispatcher_send(self.hass, SIGNAL_NEW_USERS.format(self.mac_address), self._new_user_ids)
+            self._new_user_ids = []
 
     async def connect_and_subscribe(self) -> None:
         """Connect to the device and subscribe to blood pressure notifications."""
-        _LOGGER.info(f"Connecting to {helpers.mask_mac(self.mac_address)} to start notifications")
+        # The adapter or proxy with the best signal and a free connection slot
+        ble_device = bluetooth.async_ble_device_from_address(self.hass, self.mac_address, connectable=True)
+        if ble_device is None:
+            _LOGGER.warning(f"No connectable Bluetooth adapter or proxy can reach "
+                            f"{helpers.mask_mac(self.mac_address)}")
+            return
 
+        # Sessions of all monitors share the connection slots of the adapters, the scanner
+        # the device was last seen by is the local adapter or the proxy connecting to it
+        service_info = bluetooth.async_last_service_info(self.hass, self.mac_address, connectable=True)
+        adapter = service_info.source if service_info is not None else "unknown"
+        priority = PRIORITY_RETRY if self.scheduler.retrying else PRIORITY_MEASUREMENT
+        async with self.pool.session(adapter, priority) as waited:
+            self.metrics.queue_wait.add(waited)
+            _LOGGER.info(f"Connecting to {helpers.mask_mac(self.mac_address)} via {adapter} "
+                         f"to start notifications")
+            self.metrics.session_started(self.hass.loop.time(), self.scheduler.requested_at)
+            await self._run_session(ble_device)
+
+    async def _run_session(self, ble_device: BLEDevice) -> None:
+        """Connect to the device, transfer the stored records and disconnect."""
+        # Once the layout is known only the services with the used characteristics are discovered
+        service_filter = self.gatt_layout.service_filter
         try:
-            async with BleakClient(self.mac_address) as client:
-                if not client.is_connected:
-                    _LOGGER.error(f"Failed to connect to {helpers.mask_mac(self.mac_address)}")
-                    return
-
-                _LOGGER.debug(f"Connected to {helpers.mask_mac(self.mac_address)}, subscribing to notifications")
-
-                battery_char = client.services.get_characteristic(CHARACTERISTIC_BATTERY)
-                battery_payload = await client.read_gatt_char(battery_char) if battery_char else [0]
-                self._battery = int(battery_payload[0])
-
-                await client.start_notify(BP_MEASUREMENT_UUID, self.notification_handler)
-
-                # Need to wait, else HA will terminate the connection
-                await asyncio.sleep(60)
-
-                await client.stop_notify(BP_MEASUREMENT_UUID)
-                _LOGGER.debug(f"Stopped notifications for {helpers.mask_mac(self.mac_address)}")
+            client = await establish_connection(
+                BleakClientWithServiceCache,
+                ble_device,
+                str(helpers.mask_mac(self.mac_address)),
+                ble_device_callback=lambda: self._ble_device(ble_device),
+                services=service_filter,
+            )
+            try:
+                self.debug_log.debug("Connected with service filter %s, subscribing to notifications",
+                                     service_filter)
+                if service_filter is None:
+                    self.gatt_layout.learn(client.services)
+                measurement_char = self.gatt_layout.resolve(client.services, BP_MEASUREMENT_UUID)
+                if measurement_char is None:
+                    # start_notify fails below, discover all services on the next connection
+                    self.gatt_layout.invalidate()
+                    await client.clear_cache()
+
+                self.session_timer.start()
+                await client.start_notify(measurement_char or BP_MEASUREMENT_UUID, self.notification_handler)
+
+                # Read while the stored records are transferred, not before the subscription
+                if self.battery.due(self.hass.loop.time()):
+                    await self._read_battery(client)
+
+                # Keep the connection until the stored records are transferred; a device with a record
+                # access control point only sends the new records and confirms the end of the transfer
+                if not await self._request_records(client):
+                    await self.session_timer.wait()
+
+                await client.stop_notify(measurement_char or BP_MEASUREMENT_UUID)
+                self.metrics.session_finished(self.hass.loop.time(), self.session_timer.notifications)
+                self._async_publish_update()
+                self.debug_log.debug("Stopped notifications after %d notifications, %d duplicates suppressed so far",
+                                     self.session_timer.notifications, self.deduplicator.suppressed)
+            finally:
+                await client.disconnect()
 
         except BleakError:
             _LOGGER.exception(f"Failed to connect to Medisana Blood Pressure device "
                               f"{helpers.mask_mac(self.mac_address)}")
+            raise
         except TimeoutError:
             _LOGGER.exception(f"Connection attempt to Medisana Blood Pressure device timed out "
                               f"{helpers.mask_mac(self.mac_address)}")
+            raise
+
+    async def _request_records(self, client: BleakClientWithServiceCache) -> bool:
+        """Request the records since the last synced one; return True once the device sent all of them.
+
+        Returns False if the device has no record access control point or the request failed, the
+        session timer then decides when the pushed records are transferred.
+        """
+        racp_char = self.gatt_layout.resolve(client.services, RECORD_ACCESS_CONTROL_POINT_UUID)
+        if racp_char is None:
+            return False
+        since = self.history.latest_timestamp
+        try:
+            count = await racp.request_records(client, racp_char, since, self.session_timer.max_duration)
+        except (racp.RecordAccessError, BleakError, TimeoutError) as err:
+            self.debug_log.debug("Record access failed, waiting for the pushed records: %s", err)
+            return False
+        self.debug_log.debug("Received %s records since %s", count, since)
+        return True
+
+    async def _read_battery(self, client: BleakClientWithServiceCache) -> None:
+        """Read the battery level; a missing characteristic or failed read keeps the cached level."""
+        battery_char = self.gatt_layout.resolve(client.services, BATTERY_LEVEL_UUID)
+        if battery_char is None:
+            self.debug_log.debug("No battery level characteristic")
+            return
+        try:
+            payload = await client.read_gatt_char(battery_char)
+        except BleakError as err:
+            self.debug_log.debug("Reading the battery level failed: %s", err)
+            return
+        previous = self.battery.level
+        level = self.battery.update(payload, self.hass.loop.time())
+        self.debug_log.debug("Battery level %s", level)
+        if level != previous and self._update_unsub is None:
+            # No measurements are pending in a session of duplicates, the battery sensor is updated on its own
+            self.async_set_updated_data(self.history)
+
+    def _ble_device(self, fallback: BLEDevice) -> BLEDevice:
+        """Return the current best path to the device for a connection retry."""
+        return bluetooth.async_ble_device_from_address(self.hass, self.mac_address, connectable=True) or fallback
 
     @callback
     def _bluetooth_callback(self, service_info: bluetooth.BluetoothServiceInfoBleak, _: Any) -> None:
-        _LOGGER.debug(f"BLE device data received from: {service_info.address}")
-        _LOGGER.debug(f"Got service_info: {service_info}")
-
+        self.debug_log.debug("Advertisement received, RSSI %s", service_info.rssi)
+        self.metrics.advertisements.add(self.hass.loop.time())
         self._rssi = service_info.rssi
-        self.hass.async_create_task(self.connect_and_subscribe())
+        self.scheduler.request()
 
-        _LOGGER.debug(f"Parsed Data in callback: {self._parsed_data}")
+    async def _async_write_archive(self, _now: datetime | None = None) -> None:
+        """Append the measurements received since the last write to the archive."""
+        self._archive_unsub = None
+        entries, self._archive_pending = self._archive_pending, []
+        if not entries:
+            return
+        try:
+            await self.hass.async_add_executor_job(self.archive.append, entries)
+        except OSError:
+            _LOGGER.exception(f"Failed to archive {len(entries)} measurements of "
+                              f"{helpers.mask_mac(self.mac_address)}")
 
-    async def _async_update_data(self) -> dict[Any, Any]:
+    def _load_archive(self) -> list[tuple[bytes, MeasurementRecord]]:
+        """Decode the archived measurements that fit into the history."""
+        records = []
+        for entry in self.archive.read_tail(self.history.max_records):
+            try:
+                record = parser.parse_measurement(entry.frame, entry.received, entry.rssi, entry.battery)
+            except (struct.error, IndexError):
+                _LOGGER.warning(f"Skipping undecodable archived frame {entry.frame.hex()}")
+                continue
+            records.append((entry.frame, record))
+        return records
+
+    async def _async_setup(self) -> None:
+        """Restore the history from the archive."""
+        try:
+            records = await self.hass.async_add_executor_job(self._load_archive)
+        except OSError:
+            _LOGGER.exception(f"Failed to load the measurement archive of {helpers.mask_mac(self.mac_address)}")
+            return
+        for frame, record in records:
+            self.deduplicator.add(frame)
+            if self.history.add(record):
+                self.aggregates.add(record)
+        self.user_ids.update(user_id for user_id in self.history.users if user_id is not None)
+        _LOGGER.debug(f"Restored {len(self.history)} measurements from {self.archive.path}")
+        if self.import_statistics:
+            # Also imports the measurements received before the option was enabled or while it was disabled
+            await async_import_new_statistics(self.hass, self.mac_address, self.history)
+
+    @property
+    def measurement_state_class(self) -> SensorStateClass | None:
+        """Return the state class of the measured values, None if they are imported into statistics."""
+        return None if self.import_statistics else SensorStateClass.MEASUREMENT
+
+    async def _async_update_data(self) -> MeasurementHistory:
         """Fetch latest data."""
-        _LOGGER.debug(f"_async_update_data returning {self._latest_value}")
-        return self._latest_value
+        _LOGGER.debug(f"_async_update_data returning {len(self.history)} records")
+        return self.history
 
     async def async_will_remove_from_hass(self) -> None:
         """Cleanup on unload."""
@@ -158,11 +443,24 @@ class MedisanaCoordinator(DataUpdateCoordinator):
             self._unsub()
             self._unsub = None
 
+        await self.scheduler.async_cancel()
+
+        if self._update_unsub is not None:
+            self._update_unsub()
+            self._update_unsub = None
+        if self._archive_unsub is not None:
+            self._archive_unsub()
+        await self._async_write_archive()
+
         _LOGGER.debug(f"Unsubscribed BLE callback for {helpers.mask_mac(self.mac_address)}")
 
 
-class MedisanaRestoreSensor(CoordinatorEntity, SensorEntity, RestoreEntity):
-    """Base class for Medisana-Sensors with RestoreEntity-Capability."""
+class MedisanaRestoreSensor(CoordinatorEntity[MedisanaCoordinator], SensorEntity, RestoreEntity):
+    """Base class for Medisana-Sensors with RestoreEntity-Capability.
+
+    With a `user_id` the sensor only shows the measurements of that user,
+    otherwise the latest measurement of any user.
+    """
 
     def __init__(  # noqa plr0913
             self,
@@ -173,20 +471,40 @@ class MedisanaRestoreSensor(CoordinatorEntity, SensorEntity, RestoreEntity):
             unit: str | None = None,
             device_class: SensorDeviceClass | None = None,
             state_class: SensorStateClass | None = SensorStateClass.MEASUREMENT,
+            user_id: int | None = None,
     ) -> None:
         super().__init__(coordinator)
-        self._attr_name = name
-        self._attr_unique_id = f"medisana_bp_{unique_id_suffix}_{coordinator.mac_address}"
+        if user_id is None:
+            self._attr_name = name
+            self._attr_unique_id = f"medisana_bp_{unique_id_suffix}_{coordinator.mac_address}"
+        else:
+            self._attr_name = f"{name} User {user_id}"
+            self._attr_unique_id = f"medisana_bp_{unique_id_suffix}_user_{user_id}_{coordinator.mac_address}"
         self._attr_native_unit_of_measurement = unit
         self._attr_device_class = device_class
         self._attr_state_class = state_class
         self._native_value: int | str | float | None = None
         self._data_key = data_key
+        self._user_id = user_id
+        self._record: MeasurementRecord | None = None
         self.device_info = coordinator.device_info
 
+    def _latest_record(self) -> MeasurementRecord | None:
+        if not self.coordinator.data:
+            return None
+        if self._user_id is None:
+            return self.coordinator.data.latest
+        return self.coordinator.data.latest_for_user(self._user_id)
+
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
 
+        # Entities of a new user are added after its first measurement was published
+        latest = self._latest_record()
+        if latest is not None and latest.get(self._data_key) is not None:
+            self._record = latest
+            self._native_value = latest.get(self._data_key)
+
         if self._native_value is not None:
             return
 
@@ -199,16 +517,22 @@ class MedisanaRestoreSensor(CoordinatorEntity, SensorEntity, RestoreEntity):
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        if not self.coordinator.data:
-            _LOGGER.warning("No data received from coordinator")
+        latest = self._latest_record()
+        if latest is None:
+            if self._user_id is None:
+                # Also after a battery read before the first measurement
+                _LOGGER.debug("No data received from coordinator")
+            return
+        if latest is self._record:
+            # Only older measurements or measurements of other users arrived
             return
+        self._record = latest
 
-        key = max(self.coordinator.data.keys())
-        value = self.coordinator.data[key].get(self._data_key)
+        value = latest.get(self._data_key)
 
         if value is not None:
             self._native_value = value
-            _LOGGER.debug(f"Update {self._attr_name} updated: {self._native_value}")
+            _LOGGER.debug("Update %s updated: %s", self._attr_name, self._native_value)
         else:
             _LOGGER.warning(f"Update {self._attr_name} not available in data")
 
@@ -220,7 +544,12 @@ class MedisanaRestoreSensor(CoordinatorEntity, SensorEntity, RestoreEntity):
 
 
 class MbpsBattery(MedisanaRestoreSensor):
-    """Sensor containing Battery data."""
+    """Sensor containing Battery data.
+
+    Shows the cached level of the coordinator instead of the level stored with
+    the latest measurement, which is missing for measurements received before
+    the battery read of a session.
+    """
 
     def __init__(self, coordinator: MedisanaCoordinator) -> None:
         super().__init__(
@@ -232,11 +561,25 @@ class MbpsBattery(MedisanaRestoreSensor):
             device_class=SensorDeviceClass.BATTERY,
         )
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self.coordinator.battery.level is not None:
+            self._native_value = self.coordinator.battery.level
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        level = self.coordinator.battery.level
+        if level is None or level == self._native_value:
+            return
+        self._native_value = level
+        _LOGGER.debug("Update %s updated: %s", self._attr_name, self._native_value)
+        self.async_write_ha_state()
+
 
 class MbpsSystolic(MedisanaRestoreSensor):
     """Sensor containing the systolic blood pressure in mmHg."""
 
-    def __init__(self, coordinator: MedisanaCoordinator) -> None:
+    def __init__(self, coordinator: MedisanaCoordinator, user_id: int | None = None) -> None:
         super().__init__(
             coordinator,
             name="Systolic Pressure",
@@ -244,13 +587,15 @@ class MbpsSystolic(MedisanaRestoreSensor):
             data_key="systolic",
             unit=UnitOfPressure.MMHG,
             device_class=SensorDeviceClass.PRESSURE,
+            state_class=coordinator.measurement_state_class,
+            user_id=user_id,
         )
 
 
 class MbpsDiastolic(MedisanaRestoreSensor):
     """Sensor containing the diastolic blood pressure in mmHg."""
 
-    def __init__(self, coordinator: MedisanaCoordinator) -> None:
+    def __init__(self, coordinator: MedisanaCoordinator, user_id: int | None = None) -> None:
         super().__init__(
             coordinator,
             name="Diastolic Pressure",
@@ -258,13 +603,15 @@ class MbpsDiastolic(MedisanaRestoreSensor):
             data_key="diastolic",
             unit=UnitOfPressure.MMHG,
             device_class=SensorDeviceClass.PRESSURE,
+            state_class=coordinator.measurement_state_class,
+            user_id=user_id,
         )
 
 
 class MbpsMeanArterial(MedisanaRestoreSensor):
     """Sensor containing the mean arterial blood pressure in mmHg."""
 
-    def __init__(self, coordinator: MedisanaCoordinator) -> None:
+    def __init__(self, coordinator: MedisanaCoordinator, user_id: int | None = None) -> None:
         super().__init__(
             coordinator,
             name="Mean Arterial Pressure",
@@ -272,20 +619,25 @@ class MbpsMeanArterial(MedisanaRestoreSensor):
             data_key="mean_arterial_pressure",
             unit=UnitOfPressure.MMHG,
             device_class=SensorDeviceClass.PRESSURE,
+            state_class=coordinator.measurement_state_class,
+            user_id=user_id,
         )
 
 
 class MbpsPulse(MedisanaRestoreSensor):
     """Sensor containing the heart rate bpm."""
 
-    def __init__(self, coordinator: MedisanaCoordinator) -> None:
+    def __init__(self, coordinator: MedisanaCoordinator, user_id: int | None = None) -> None:
         super().__init__(
             coordinator,
             name="Heart Rate",
             unique_id_suffix="pulse",
             data_key="pulse_rate",
             unit="bpm",
-            device_class=SensorDeviceClass.FREQUENCY,
+            # bpm is not a unit of the frequency device class
+            device_class=None,
+            state_class=coordinator.measurement_state_class,
+            user_id=user_id,
         )
 
 
@@ -318,7 +670,83 @@ class MbpsUserId(MedisanaRestoreSensor):
         )
 
 
-class MbpsLastMeasurement(CoordinatorEntity, SensorEntity):
+USER_SENSORS = (MbpsSystolic, MbpsDiastolic, MbpsMeanArterial, MbpsPulse)
+
+# Values with rolling means: name, unit and device class
+# bpm is not a unit of the frequency device class, Home Assistant warns about it
+ROLLING_MEANS = {
+    "systolic": ("Systolic Pressure", UnitOfPressure.MMHG, SensorDeviceClass.PRESSURE),
+    "diastolic": ("Diastolic Pressure", UnitOfPressure.MMHG, SensorDeviceClass.PRESSURE),
+    "pulse_rate": ("Heart Rate", "bpm", None),
+}
+
+
+class MbpsRollingMean(MedisanaRestoreSensor):
+    """Sensor containing the mean of a value over the last days.
+
+    The morning and evening means, the extremes and the number of
+    measurements of the window are attributes. The window also moves on at
+    midnight, without new measurements.
+    """
+
+    def __init__(self, coordinator: MedisanaCoordinator, data_key: str, days: int, user_id: int | None = None) -> None:
+        name, unit, device_class = ROLLING_MEANS[data_key]
+        super().__init__(
+            coordinator,
+            name=f"{name} {days}-Day Mean",
+            unique_id_suffix=f"{data_key}_mean_{days}d",
+            data_key=data_key,
+            unit=unit,
+            device_class=device_class,
+            user_id=user_id,
+        )
+        self._days = days
+        self._summary: dict[str, Any] | None = None
+
+    def _update_summary(self) -> None:
+        self._summary = self.coordinator.aggregates.summary(self._user_id, self._days, dt_util.now().date())
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._update_summary()
+        self.async_on_remove(
+            async_track_time_change(self.hass, self._async_midnight, hour=0, minute=0, second=0)
+        )
+
+    @callback
+    def _async_midnight(self, _now: datetime) -> None:
+        self._update_summary()
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._update_summary()
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> float | None:
+        return self._summary["mean"][self._data_key] if self._summary is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        summary = self._summary
+        if summary is None:
+            return {}
+        return {
+            "morning_mean": summary["morning_mean"][self._data_key],
+            "evening_mean": summary["evening_mean"][self._data_key],
+            "minimum": summary["minimum"][self._data_key],
+            "maximum": summary["maximum"][self._data_key],
+            "count": summary["count"],
+        }
+
+
+def rolling_aggregate_sensors(coordinator: MedisanaCoordinator, user_id: int | None = None) -> list[MbpsRollingMean]:
+    """Return the rolling mean sensors of all users together, or of one user."""
+    return [MbpsRollingMean(coordinator, data_key, days, user_id) for days in WINDOWS for data_key in ROLLING_MEANS]
+
+
+class MbpsLastMeasurement(CoordinatorEntity[MedisanaCoordinator], SensorEntity):
     """Sensor containing the last measurement time and the data transferred."""
 
     _attr_name = "Last Measurement"
@@ -335,14 +763,13 @@ class MbpsLastMeasurement(CoordinatorEntity, SensorEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Update the sensor with the latest value."""
-        if not self.coordinator.data:
+        latest = self.coordinator.data.latest if self.coordinator.data else None
+        if latest is None:
             _LOGGER.warning("No data received in MbpsLastMeasurement")
             return
 
-        key = max(self.coordinator.data.keys())
-
-        if key is not None:
-            self._native_value = str(key)
+        if latest.timestamp is not None:
+            self._native_value = str(latest.timestamp)
 
         self.async_write_ha_state()
 
@@ -352,5 +779,98 @@ class MbpsLastMeasurement(CoordinatorEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the state attributes."""
-        return self.coordinator.data
+        """Return the latest measurements; the full history is available via a service."""
+        if not self.coordinator.data:
+            return {}
+        return self.coordinator.data.as_dict(LAST_MEASUREMENT_ATTRIBUTE_RECORDS)
+
+
+def _rounded(value: float | None, digits: int = 2) -> float | None:
+    return None if value is None else round(value, digits)
+
+
+@dataclass(frozen=True, kw_only=True)
+class MedisanaDiagnosticDescription(SensorEntityDescription):
+    """Description of a diagnostic sensor reading the coordinator metrics."""
+
+    value_fn: Callable[[MedisanaCoordinator], StateType]
+
+
+DIAGNOSTIC_SENSORS = (
+    MedisanaDiagnosticDescription(
+        key="advertisement_rate",
+        name="Advertisement Rate",
+        native_unit_of_measurement="1/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda c: _rounded(c.metrics.advertisements.rate(c.hass.loop.time()), 1),
+    ),
+    MedisanaDiagnosticDescription(
+        key="session_duration",
+        name="Last Session Duration",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        value_fn=lambda c: _rounded(c.metrics.session_duration.last),
+    ),
+    MedisanaDiagnosticDescription(
+        key="session_notifications",
+        name="Notifications Last Session",
+        value_fn=lambda c: c.metrics.notifications_per_session.last,
+    ),
+    MedisanaDiagnosticDescription(
+        key="time_to_first_notification",
+        name="Time To First Notification",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        value_fn=lambda c: _rounded(c.metrics.time_to_first_notification.last),
+    ),
+    MedisanaDiagnosticDescription(
+        key="connection_queue_wait",
+        name="Connection Queue Wait",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        value_fn=lambda c: _rounded(c.metrics.queue_wait.last),
+    ),
+    MedisanaDiagnosticDescription(
+        key="connection_queue_depth",
+        name="Connection Queue Depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda c: c.pool.queued(),
+    ),
+    MedisanaDiagnosticDescription(
+        key="failed_sessions",
+        name="Failed Sessions",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.scheduler.sessions_failed,
+    ),
+    MedisanaDiagnosticDescription(
+        key="parse_latency",
+        name="Mean Parse Latency",
+        native_unit_of_measurement=UnitOfTime.MICROSECONDS,
+        value_fn=lambda c: _rounded(c.metrics.parse_latency.mean),
+    ),
+    MedisanaDiagnosticDescription(
+        key="stored_measurements",
+        name="Stored Measurements",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda c: len(c.history),
+    ),
+)
+
+
+class MbpsDiagnostic(SensorEntity):
+    """Diagnostic sensor of the connection metrics, disabled by default and polled."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_should_poll = True
+    entity_description: MedisanaDiagnosticDescription
+
+    def __init__(self, coordinator: MedisanaCoordinator, description: MedisanaDiagnosticDescription) -> None:
+        self.entity_description = description
+        self.coordinator = coordinator
+        self._attr_unique_id = f"medisana_bp_{description.key}_{coordinator.mac_address}"
+        self.device_info = coordinator.device_info
+
+    @property
+    def native_value(self) -> StateType:
+        return self.entity_description.value_fn(self.coordinator)
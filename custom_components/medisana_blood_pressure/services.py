@@ -0,0 +1,91 @@
+"""Services for the Medisana Blood Pressure integration."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_LIMIT,
+    ATTR_OFFSET,
+    DOMAIN,
+    MAX_PAGE_SIZE,
+    SERVICE_DUMP_FRAMES,
+    SERVICE_GET_MEASUREMENTS,
+)
+
+if TYPE_CHECKING:
+    from .sensor import MedisanaCoordinator
+
+GET_MEASUREMENTS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_OFFSET, default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(ATTR_LIMIT, default=100): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_PAGE_SIZE)),
+    }
+)
+
+DUMP_FRAMES_SCHEMA = vol.Schema({vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str) -> MedisanaCoordinator:
+    coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+    if coordinator is None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+            translation_placeholders={"entry_id": entry_id},
+        )
+    return coordinator
+
+
+async def _async_get_measurements(call: ServiceCall) -> ServiceResponse:
+    """Return one page of the measurement history, latest first."""
+    coordinator = _get_coordinator(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    offset = call.data[ATTR_OFFSET]
+    records = coordinator.history.page(offset, call.data[ATTR_LIMIT])
+    return {
+        "total": len(coordinator.history),
+        "offset": offset,
+        "measurements": [record.as_json() for record in records],
+    }
+
+
+async def _async_dump_frames(call: ServiceCall) -> ServiceResponse:
+    """Return the latest raw frames received from the device, oldest first."""
+    coordinator = _get_coordinator(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    return {
+        "frames": [
+            {"received": raw.received.isoformat(), "frame": raw.frame.hex()}
+            for raw in coordinator.debug_log.frames()
+        ],
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_MEASUREMENTS,
+        _async_get_measurements,
+        schema=GET_MEASUREMENTS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DUMP_FRAMES,
+        _async_dump_frames,
+        schema=DUMP_FRAMES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,21 @@
+"""Fixtures shared by the tests that run in a Home Assistant instance."""
+
+from unittest.mock import patch
+
+from homeassistant import loader
+from homeassistant.components import bluetooth
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+import pytest_asyncio
+
+
+@pytest_asyncio.fixture
+async def hass(tmp_path):
+    """Return a Home Assistant instance without Bluetooth manager."""
+    hass = HomeAssistant(str(tmp_path))
+    loader.async_setup(hass)
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    with patch.object(bluetooth, "async_register_callback", lambda *_args: lambda: None):
+        yield hass
+    await hass.async_stop(force=True)
@@ -0,0 +1,60 @@
+"""Blood pressure measurement (0x2A35) frames shared by the tests and benchmarks."""
+
+from datetime import datetime, timedelta
+import struct
+
+FLAG_TIMESTAMP = 0x02
+FLAG_PULSE_RATE = 0x04
+FLAG_USER_ID = 0x08
+FLAG_STATUS = 0x10
+
+
+def build_frame(  # noqa: PLR0913
+        flags=0x1E,
+        *,
+        systolic=120,
+        diastolic=80,
+        mean_arterial_pressure=95,
+        timestamp=(2025, 9, 1, 12, 0, 0),
+        pulse_rate=70,
+        user_id=1,
+        status=0,
+):
+    """Return a frame with the fields announced by `flags`.
+
+    Pressures and pulse rate are raw SFLOAT values, so integers below 0x800
+    are read as themselves. `timestamp` is a (year, month, day, hour,
+    minute, second) tuple or a datetime.
+    """
+    data = bytes([flags]) + struct.pack("<3H", systolic, diastolic, mean_arterial_pressure)
+    if flags & FLAG_TIMESTAMP:
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.timetuple()[:6]
+        data += struct.pack("<HBBBBB", *timestamp)
+    if flags & FLAG_PULSE_RATE:
+        data += struct.pack("<H", pulse_rate)
+    if flags & FLAG_USER_ID:
+        data += bytes([user_id])
+    if flags & FLAG_STATUS:
+        data += struct.pack("<H", status)
+    return data
+
+
+def random_frame(rng, flags, *, invalid_times=False):
+    """Return a frame with random raw values; with `invalid_times` timestamps may be out of range."""
+    if invalid_times:
+        timestamp = (rng.randrange(1990, 2100), rng.randrange(0, 14), rng.randrange(0, 32), rng.randrange(25),
+                     rng.randrange(61), rng.randrange(61))
+    else:
+        timestamp = (rng.randrange(2000, 2100), rng.randrange(1, 13), rng.randrange(1, 29), rng.randrange(24),
+                     rng.randrange(60), rng.randrange(60))
+    return build_frame(flags, systolic=rng.randrange(0x10000), diastolic=rng.randrange(0x10000),
+                       mean_arterial_pressure=rng.randrange(0x10000), timestamp=timestamp,
+                       pulse_rate=rng.randrange(0x10000), user_id=rng.randrange(256), status=rng.randrange(0x10000))
+
+
+def memory_dump(size, users=2):
+    """Return `size` frames with distinct timestamps, of users 1 to `users` in turn, as sent after a connection."""
+    start = datetime(2020, 1, 1, 7, 0)
+    return [build_frame(timestamp=start + timedelta(hours=12 * i, minutes=i % 60), user_id=1 + i % users)
+            for i in range(size)]
@@ -0,0 +1,26 @@
+"""GATT service collections shared by the tests."""
+
+from types import SimpleNamespace
+
+BP_SERVICE = "00001810-0000-1000-8000-00805f9b34fb"
+BATTERY_SERVICE = "0000180f-0000-1000-8000-00805f9b34fb"
+
+
+class FakeServices:
+    """Service collection with lookups by handle and UUID."""
+
+    def __init__(self, *characteristics: SimpleNamespace) -> None:
+        self.characteristics = {characteristic.handle: characteristic for characteristic in characteristics}
+        self.uuid_lookups = 0
+
+    def get_characteristic(self, specifier):
+        """Return a characteristic by handle or UUID."""
+        if isinstance(specifier, int):
+            return self.characteristics.get(specifier)
+        self.uuid_lookups += 1
+        return next((c for c in self.characteristics.values() if c.uuid == specifier), None)
+
+
+def characteristic(handle, uuid, service_uuid):
+    """Create a characteristic-like object."""
+    return SimpleNamespace(handle=handle, uuid=uuid, service_uuid=service_uuid)
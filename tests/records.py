@@ -0,0 +1,33 @@
+"""Measurement records shared by the tests."""
+
+from datetime import datetime
+
+from custom_components.medisana_blood_pressure.medisana_bp.reading import (
+    MeasurementRecord,
+)
+
+RECEIVED = datetime(2025, 9, 1, 12, 0, 0)
+
+
+def make_record(  # noqa: PLR0913
+        timestamp,
+        systolic=120.0,
+        *,
+        diastolic=80.0,
+        pulse_rate=70.0,
+        user_id=1,
+        received=RECEIVED,
+):
+    """Create a record measured at `timestamp`, as the coordinator would from a parsed frame."""
+    return MeasurementRecord(
+        systolic=systolic,
+        diastolic=diastolic,
+        mean_arterial_pressure=95.0,
+        timestamp=timestamp,
+        pulse_rate=pulse_rate,
+        user_id=user_id,
+        measurement_status=0,
+        received=received,
+        rssi=-60,
+        battery=90,
+    )
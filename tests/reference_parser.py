@@ -0,0 +1,81 @@
+"""Field-by-field reference decoder of blood pressure measurement frames."""
+
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+import struct
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_blood_pressure_reference(data: bytes) -> dict[str,int|float|str|datetime|None]: #noqa PLR0915
+    """Parse blood pressure data from Medisana BP, field by field.
+
+    Straightforward but slow decoder that `parse_blood_pressure` replaced,
+    kept to verify it and to measure its speedup.
+    """
+    offset = 0
+    flags = data[offset]
+    offset += 1
+
+    result:dict[str,int|float|str|datetime|None] = {}
+
+    # unit_kpa = (flags & 0x01) != 0
+    time_stamp_present = (flags & 0x02) != 0
+    pulse_rate_present = (flags & 0x04) != 0
+    user_id_present = (flags & 0x08) != 0
+    measurement_status_present = (flags & 0x10) != 0
+
+    def parse_sfloat(b:bytes)->float|int:
+        raw = struct.unpack('<H', b)[0]
+        mantissa = raw & 0x0FFF
+        exponent = (raw & 0xF000) >> 12
+        if exponent >= 0x8:#noqa PLR2004
+            exponent = exponent - 0x10
+        if mantissa >= 0x800: #noqa PLR2004
+            mantissa = mantissa - 0x1000
+        return float(mantissa) * pow(10, exponent)
+
+    result['systolic'] = parse_sfloat(data[offset:offset+2])
+    offset += 2
+    result['diastolic'] = parse_sfloat(data[offset:offset+2])
+    offset += 2
+    result['mean_arterial_pressure'] = parse_sfloat(data[offset:offset+2])
+    offset += 2
+
+    if time_stamp_present:
+        year = int(struct.unpack('<H', data[offset:offset+2])[0])
+        month = int(data[offset+2])
+        day = int(data[offset+3])
+        hour = int(data[offset+4])
+        minute = int(data[offset+5])
+        second = int(data[offset+6])
+        offset += 7
+        try:
+            result['timestamp'] = datetime(year, month, day, hour, minute, second)
+        except Exception as e:
+            _LOGGER.warning(f"Invalid Timestamp: {e}")
+            result['timestamp'] = None
+    else:
+        result['timestamp'] = None
+
+    if pulse_rate_present:
+        result['pulse_rate'] = parse_sfloat(data[offset:offset+2])
+        offset += 2
+    else:
+        result['pulse_rate'] = None
+
+    if user_id_present:
+        result['user_id'] = data[offset]
+        offset += 1
+    else:
+        result['user_id'] = None
+
+    if measurement_status_present:
+        result['measurement_status'] = struct.unpack('<H', data[offset:offset+2])[0]
+        offset += 2
+    else:
+        result['measurement_status'] = None
+
+    return result
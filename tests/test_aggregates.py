@@ -0,0 +1,112 @@
+"""Unit tests for the rolling aggregates of measurements."""
+
+from datetime import date, datetime, timedelta
+import random
+from statistics import fmean
+
+from custom_components.medisana_blood_pressure.medisana_bp.aggregates import (
+    MeasurementAggregates,
+)
+from tests.records import make_record
+
+TODAY = date(2025, 9, 30)
+RECEIVED = datetime(2025, 9, 30, 23, 0)
+
+
+def test_no_measurements():
+    """Users without measurements have no summary."""
+    aggregates = MeasurementAggregates()
+    assert aggregates.summary(None, 7, TODAY) is None
+    assert aggregates.count(1) == 0
+
+
+def test_means_morning_evening_and_extremes():
+    """Means are split into morning and evening, extremes are per value."""
+    aggregates = MeasurementAggregates()
+    aggregates.add(make_record(datetime(2025, 9, 29, 7, 30), 120.0, pulse_rate=60.0, received=RECEIVED))
+    aggregates.add(make_record(datetime(2025, 9, 29, 20, 0), 140.0, pulse_rate=None, received=RECEIVED))
+    aggregates.add(make_record(datetime(2025, 9, 30, 14, 0), 130.0, diastolic=90.0, received=RECEIVED))
+
+    summary = aggregates.summary(1, 7, TODAY)
+    assert summary["count"] == 3  # noqa: PLR2004
+    assert summary["mean"] == {"systolic": 130.0, "diastolic": 83.3, "pulse_rate": 65.0}
+    assert summary["morning_mean"]["systolic"] == 120.0  # noqa: PLR2004
+    assert summary["evening_mean"] == {"systolic": 140.0, "diastolic": 80.0, "pulse_rate": None}
+    assert summary["minimum"] == {"systolic": 120.0, "diastolic": 80.0, "pulse_rate": 60.0}
+    assert summary["maximum"] == {"systolic": 140.0, "diastolic": 90.0, "pulse_rate": 70.0}
+
+
+def test_users_and_all_users():
+    """Records without user id only count for all users together."""
+    aggregates = MeasurementAggregates()
+    aggregates.add(make_record(datetime(2025, 9, 30, 8, 0), 120.0, user_id=1, received=RECEIVED))
+    aggregates.add(make_record(datetime(2025, 9, 30, 8, 5), 140.0, user_id=2, received=RECEIVED))
+    aggregates.add(make_record(datetime(2025, 9, 30, 8, 10), 160.0, user_id=None, received=RECEIVED))
+
+    assert aggregates.count() == 3  # noqa: PLR2004
+    assert aggregates.count(1) == 1
+    assert aggregates.summary(2, 7, TODAY)["mean"]["systolic"] == 140.0  # noqa: PLR2004
+    assert aggregates.summary(None, 7, TODAY)["mean"]["systolic"] == 140.0  # noqa: PLR2004
+
+
+def test_window_moves_on_without_measurements():
+    """Days leave the window when the day passed to the summary advances."""
+    aggregates = MeasurementAggregates()
+    aggregates.add(make_record(datetime(2025, 9, 24, 8, 0), 150.0, received=RECEIVED))
+    aggregates.add(make_record(datetime(2025, 9, 30, 8, 0), 120.0, received=RECEIVED))
+    assert aggregates.summary(1, 7, TODAY)["mean"]["systolic"] == 135.0  # noqa: PLR2004
+
+    summary = aggregates.summary(1, 7, TODAY + timedelta(days=1))
+    assert summary["count"] == 1
+    assert summary["maximum"]["systolic"] == 120.0  # noqa: PLR2004
+    assert aggregates.summary(1, 30, TODAY + timedelta(days=1))["count"] == 2  # noqa: PLR2004
+
+    summary = aggregates.summary(1, 30, TODAY + timedelta(days=40))
+    assert summary["count"] == 0
+    assert summary["mean"]["systolic"] is None
+    assert summary["minimum"]["systolic"] is None
+
+
+def test_out_of_order_records_match_recomputation():
+    """Memory dumps arrive in any order; the running sums equal a full recomputation."""
+    rng = random.Random(42)
+    start = datetime(2025, 8, 1)
+    records = [make_record(start + timedelta(minutes=rng.randrange(60 * 24 * 60)), float(rng.randrange(100, 180)),
+                           received=start + timedelta(days=60))
+               for _ in range(500)]
+    aggregates = MeasurementAggregates()
+    for record in records:
+        aggregates.add(record)
+
+    today = max(record.time for record in records).date()
+    for days in (7, 30):
+        window = [record.systolic for record in records if (today - record.time.date()).days < days]
+        summary = aggregates.summary(1, days, today)
+        assert summary["count"] == len(window)
+        assert summary["mean"]["systolic"] == round(fmean(window), 1)
+        assert summary["minimum"]["systolic"] == min(window)
+        assert summary["maximum"]["systolic"] == max(window)
+    assert aggregates.count(1) == len(records)
+
+
+def test_future_record_does_not_move_windows():
+    """A record dated after its receipt is counted, but keeps the windows and their days."""
+    aggregates = MeasurementAggregates()
+    aggregates.add(make_record(datetime(2025, 9, 29, 8, 0), 120.0, received=RECEIVED))
+    aggregates.add(make_record(datetime(2025, 9, 30, 8, 0), 140.0, received=RECEIVED))
+    aggregates.add(make_record(datetime(2031, 1, 1, 8, 0), 200.0, received=RECEIVED))
+
+    assert aggregates.count(1) == 3  # noqa: PLR2004
+    summary = aggregates.summary(1, 7, TODAY)
+    assert summary["count"] == 2  # noqa: PLR2004
+    assert summary["mean"]["systolic"] == 130.0  # noqa: PLR2004
+    assert summary["maximum"]["systolic"] == 140.0  # noqa: PLR2004
+
+
+def test_future_first_record_starts_at_receipt():
+    """A first record dated after its receipt does not start the windows in the future."""
+    aggregates = MeasurementAggregates()
+    aggregates.add(make_record(datetime(2031, 1, 1, 8, 0), 200.0, received=RECEIVED))
+    aggregates.add(make_record(datetime(2025, 9, 30, 8, 0), 140.0, received=RECEIVED))
+
+    assert aggregates.summary(1, 7, TODAY)["mean"]["systolic"] == 140.0  # noqa: PLR2004
@@ -0,0 +1,72 @@
+"""Unit tests for the persistent measurement frame archive."""
+
+from datetime import datetime, timedelta
+
+from custom_components.medisana_blood_pressure.medisana_bp.archive import (
+    ENTRY_SIZE,
+    ArchivedFrame,
+    FrameArchive,
+)
+from tests.frames import build_frame
+
+NOW = datetime(2025, 9, 1, 12, 0, 0, 500000)
+
+
+def make_frame(minute: int) -> bytes:
+    """Return a timestamped frame."""
+    return build_frame(timestamp=(2025, 9, 1, 12, minute, 0))
+
+
+def test_round_trip(tmp_path):
+    """Test that frames and link quality survive a write and read."""
+    archive = FrameArchive(tmp_path / "archive.bin")
+    entries = [
+        ArchivedFrame(make_frame(0), NOW, rssi=-70, battery=80),
+        ArchivedFrame(bytes(7), NOW + timedelta(seconds=1)),
+    ]
+    assert archive.append(entries) == 2  # noqa: PLR2004
+
+    assert len(archive) == 2  # noqa: PLR2004
+    assert archive.read_tail(10) == entries
+    assert list(archive) == entries
+
+
+def test_read_tail_returns_latest_entries(tmp_path):
+    """Test that only the requested number of latest entries is read."""
+    archive = FrameArchive(tmp_path / "archive.bin")
+    for minute in range(50):
+        archive.append([ArchivedFrame(make_frame(minute), NOW + timedelta(minutes=minute))])
+
+    tail = archive.read_tail(5)
+    assert [entry.frame[12] for entry in tail] == [45, 46, 47, 48, 49]
+    assert archive.read_tail(0) == []
+
+
+def test_missing_file(tmp_path):
+    """Test that a missing archive behaves like an empty one."""
+    archive = FrameArchive(tmp_path / "missing.bin")
+    assert len(archive) == 0
+    assert archive.read_tail(10) == []
+    assert list(archive) == []
+    archive.remove()
+
+
+def test_incomplete_entry_is_discarded(tmp_path):
+    """Test that a partially written entry does not corrupt later appends."""
+    path = tmp_path / "archive.bin"
+    FrameArchive(path).append([ArchivedFrame(make_frame(1), NOW)])
+    with path.open("ab") as file:
+        file.write(b"\x00" * 7)
+
+    archive = FrameArchive(path)
+    archive.append([ArchivedFrame(make_frame(2), NOW)])
+
+    assert path.stat().st_size == 2 * ENTRY_SIZE
+    assert [entry.frame for entry in archive] == [make_frame(1), make_frame(2)]
+
+
+def test_oversized_frame_is_skipped(tmp_path):
+    """Test that frames which do not fit into an entry are not archived."""
+    archive = FrameArchive(tmp_path / "archive.bin")
+    assert archive.append([ArchivedFrame(bytes(20), NOW)]) == 0
+    assert len(archive) == 0
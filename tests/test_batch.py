@@ -0,0 +1,87 @@
+"""Unit tests for the batch blood pressure decoder."""
+
+from datetime import datetime
+import math
+import random
+
+from custom_components.medisana_blood_pressure.medisana_bp.parser import (
+    parse_blood_pressure,
+)
+import pytest
+from tests.frames import build_frame, random_frame
+
+np = pytest.importorskip("numpy")
+
+from custom_components.medisana_blood_pressure.medisana_bp.batch import (  # noqa: E402
+    MISSING,
+    InvalidFrameError,
+    parse_blood_pressure_batch,
+)
+
+
+def assert_matches_scalar_parser(batch, frames):
+    """Compare every row of a batch with the per-frame parser."""
+    assert len(batch) == len(frames)
+    for i, frame in enumerate(frames):
+        expected = parse_blood_pressure(frame)
+        assert batch.systolic[i] == expected["systolic"]
+        assert batch.diastolic[i] == expected["diastolic"]
+        assert batch.mean_arterial_pressure[i] == expected["mean_arterial_pressure"]
+        if expected["pulse_rate"] is None:
+            assert math.isnan(batch.pulse_rate[i])
+        else:
+            assert batch.pulse_rate[i] == expected["pulse_rate"]
+        assert batch.user_id[i] == (MISSING if expected["user_id"] is None else expected["user_id"])
+        assert batch.measurement_status[i] == (
+            MISSING if expected["measurement_status"] is None else expected["measurement_status"]
+        )
+        if expected["timestamp"] is None:
+            assert np.isnat(batch.timestamp[i])
+        else:
+            assert batch.timestamp[i].astype(datetime) == expected["timestamp"]
+
+
+def test_batch_matches_scalar_parser():
+    """Test that a list of frames decodes to the same values as the per-frame parser."""
+    rng = random.Random(1)
+    frames = [random_frame(rng, rng.randrange(0x20), invalid_times=True) for _ in range(2000)]
+    assert_matches_scalar_parser(parse_blood_pressure_batch(frames), frames)
+
+
+@pytest.mark.parametrize("year", [0, 1, 9999, 10000, 0xFFFF])
+def test_timestamp_year_range_matches_scalar_parser(year):
+    """Test that years outside of `datetime` are missing timestamps in both decoders."""
+    frame = build_frame(0x02, timestamp=(year, 12, 31, 23, 59, 59))
+    assert_matches_scalar_parser(parse_blood_pressure_batch([frame]), [frame])
+
+
+def test_packed_buffer_with_offsets():
+    """Test decoding from one packed buffer plus frame offsets."""
+    rng = random.Random(2)
+    frames = [random_frame(rng, flags, invalid_times=True) for flags in range(0x20)]
+    offsets = [0]
+    for frame in frames[:-1]:
+        offsets.append(offsets[-1] + len(frame))
+
+    batch = parse_blood_pressure_batch(b"".join(frames), offsets)
+    assert_matches_scalar_parser(batch, frames)
+
+
+def test_empty_batch():
+    """Test that an empty input yields empty columns."""
+    batch = parse_blood_pressure_batch([])
+    assert len(batch) == 0
+    assert batch.timestamp.dtype == np.dtype("datetime64[s]")
+
+
+def test_truncated_frame_is_rejected():
+    """Test that a frame shorter than its flags announce raises InvalidFrameError."""
+    frames = [bytes([0x00, 120, 0, 80, 0, 95, 0]), bytes([0x02, 120, 0, 80, 0, 95, 0, 0xE7])]
+    with pytest.raises(InvalidFrameError, match="Frame 1"):
+        parse_blood_pressure_batch(frames)
+
+
+def test_packed_buffer_requires_offsets():
+    """Test that a packed buffer without offsets is rejected."""
+    with pytest.raises(TypeError):
+        parse_blood_pressure_batch(bytes(7))
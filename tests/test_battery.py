@@ -0,0 +1,55 @@
+"""Unit tests for the battery level cache."""
+
+from custom_components.medisana_blood_pressure.medisana_bp.battery import BatteryCache
+
+HOUR = 3600.0
+
+
+def test_first_session_reads():
+    """Without a known level every session reads."""
+    cache = BatteryCache(refresh_interval=24 * HOUR)
+    assert cache.due(0.0)
+    assert cache.due(1.0)
+
+
+def test_refresh_interval():
+    """After a read the level is only due again once the interval elapsed."""
+    cache = BatteryCache(refresh_interval=24 * HOUR)
+    assert cache.due(0.0)
+    assert cache.update(b"\x50", 0.0) == 80  # noqa: PLR2004
+    assert not cache.due(HOUR)
+    assert not cache.due(23 * HOUR)
+    assert cache.due(24 * HOUR)
+    assert cache.reads == 1
+
+
+def test_refresh_sessions():
+    """A session limit makes every n-th session read."""
+    cache = BatteryCache(refresh_interval=0, refresh_sessions=3)
+    cache.due(0.0)
+    cache.update(b"\x50", 0.0)
+    assert [cache.due(float(i)) for i in range(1, 4)] == [False, False, True]
+    cache.update(b"\x4f", 4.0)
+    assert not cache.due(5.0)
+
+
+def test_both_limits_disabled_reads_every_session():
+    """With both limits at 0 the cache does not suppress any read."""
+    cache = BatteryCache(refresh_interval=0, refresh_sessions=0)
+    cache.update(b"\x50", 0.0)
+    assert cache.due(0.0)
+
+
+def test_empty_payload_keeps_level():
+    """An empty read neither raises nor clears the cached level."""
+    cache = BatteryCache()
+    assert cache.update(b"", 0.0) is None
+    cache.update(b"\x32", 0.0)
+    assert cache.update(bytearray(), 10.0) == 50  # noqa: PLR2004
+    assert cache.reads == 1
+
+
+def test_level_clamped():
+    """Out of range levels are clamped to 100 %."""
+    cache = BatteryCache()
+    assert cache.update(b"\xff", 0.0) == 100  # noqa: PLR2004
@@ -0,0 +1,269 @@
+"""Unit tests for the standalone streaming client."""
+
+import asyncio
+import struct
+from types import SimpleNamespace
+
+from bleak import BleakError
+from custom_components.medisana_blood_pressure.medisana_bp import (
+    client as client_module,
+    session,
+)
+from custom_components.medisana_blood_pressure.medisana_bp.client import (
+    MedisanaBPClient,
+)
+from custom_components.medisana_blood_pressure.medisana_bp.reading import (
+    MeasurementRecord,
+)
+from custom_components.medisana_blood_pressure.medisana_bp.session import (
+    AdaptiveSessionTimer,
+)
+from custom_components.medisana_blood_pressure.medisana_bp.supported_devices import (
+    BATTERY_LEVEL_UUID,
+    BP_MEASUREMENT_UUID,
+    RECORD_ACCESS_CONTROL_POINT_UUID,
+)
+import pytest
+from tests.frames import build_frame
+from tests.gatt import BATTERY_SERVICE, BP_SERVICE, FakeServices, characteristic
+
+
+class FakeBleakClient:
+    """Connected cuff that sends its memory as a burst of notifications."""
+
+    def __init__(self, frames, interval=0.005) -> None:
+        self.frames = frames
+        self.interval = interval
+        self.services = FakeServices(characteristic(3, BP_MEASUREMENT_UUID, BP_SERVICE),
+                                     characteristic(7, BATTERY_LEVEL_UUID, BATTERY_SERVICE))
+        self.connected = True
+        self.battery_reads = 0
+        self._sender: asyncio.Task | None = None
+
+    async def start_notify(self, _char, callback):
+        """Send the frames in the background."""
+        async def send():
+            for frame in self.frames:
+                await asyncio.sleep(self.interval)
+                callback(None, bytearray(frame))
+        self._sender = asyncio.create_task(send())
+
+    async def stop_notify(self, _char):
+        """Stop sending."""
+        self._sender.cancel()
+
+    async def read_gatt_char(self, _char):
+        """Return a battery level of 80 %."""
+        self.battery_reads += 1
+        return bytearray(b"\x50")
+
+    async def clear_cache(self):
+        """Nothing is cached."""
+
+    async def disconnect(self):
+        """Disconnect and stop sending."""
+        if self._sender is not None:
+            self._sender.cancel()
+        self.connected = False
+
+
+class FakeRacpBleakClient(FakeBleakClient):
+    """Cuff with a record access control point that only sends the requested records."""
+
+    def __init__(self, frames) -> None:
+        super().__init__([])
+        self.stored = frames
+        self.services.characteristics[9] = characteristic(9, RECORD_ACCESS_CONTROL_POINT_UUID, BP_SERVICE)
+        self.requests = []
+        self._callbacks = {}
+
+    async def start_notify(self, char, callback):
+        """Remember the callbacks of the measurement and the record access control point."""
+        self._callbacks[char.uuid] = callback
+
+    async def stop_notify(self, _char):
+        """Nothing is sent in the background."""
+
+    async def write_gatt_char(self, _char, data, response):  # noqa: ARG002
+        """Send the records at or after the requested minute, then confirm."""
+        self.requests.append(bytes(data))
+        selected = self.stored
+        if data[1] == 0x03:  # noqa: PLR2004, greater or equal to the user facing time
+            since = struct.unpack_from("<H5B", data, 3)
+            selected = [stored for stored in self.stored if struct.unpack_from("<H5B", stored, 7) >= since]
+        if data[0] == 0x04:  # noqa: PLR2004
+            answer = bytes((0x05, 0)) + len(selected).to_bytes(2, "little")
+        else:
+            for stored in selected:
+                self._callbacks[BP_MEASUREMENT_UUID](None, bytearray(stored))
+            answer = bytes((0x06, 0, data[0], 0x01))
+        self._callbacks[RECORD_ACCESS_CONTROL_POINT_UUID](None, bytearray(answer))
+
+
+class SlowRacpBleakClient(FakeRacpBleakClient):
+    """Cuff with a record access control point that sends the requested records one by one."""
+
+    async def write_gatt_char(self, char, data, response):
+        """Send the records in the background, then confirm."""
+        if data[0] == 0x04:  # noqa: PLR2004
+            await super().write_gatt_char(char, data, response)
+            return
+        self.requests.append(bytes(data))
+        since = struct.unpack_from("<H5B", data, 3) if data[1] == 0x03 else (0,)  # noqa: PLR2004
+        selected = [stored for stored in self.stored if struct.unpack_from("<H5B", stored, 7) >= since]
+
+        async def send():
+            for stored in selected:
+                await asyncio.sleep(0.002)
+                self._callbacks[BP_MEASUREMENT_UUID](None, bytearray(stored))
+            self._callbacks[RECORD_ACCESS_CONTROL_POINT_UUID](None, bytearray((0x06, 0, data[0], 0x01)))
+        self._sender = asyncio.create_task(send())
+
+
+@pytest.fixture(autouse=True)
+def short_gaps(monkeypatch):
+    """Scale the idle gap limits down so the tests run fast."""
+    monkeypatch.setattr(session, "MIN_IDLE_GAP", 0.02)
+    monkeypatch.setattr(session, "MAX_IDLE_GAP", 0.05)
+    monkeypatch.setattr(session, "DEFAULT_IDLE_GAP", 0.05)
+
+
+@pytest.fixture
+def connect(monkeypatch):
+    """Make `establish_connection` return the given fake clients in turn."""
+    clients = []
+
+    async def establish_connection(_client_class, _device, _name, **_kwargs):
+        fake = clients.pop(0)
+        if isinstance(fake, Exception):
+            raise fake
+        return fake
+
+    monkeypatch.setattr(client_module, "establish_connection", establish_connection)
+    return clients
+
+
+def make_client(**kwargs) -> MedisanaBPClient:
+    """Create a client with a short session."""
+    device = SimpleNamespace(address="AA:BB:CC:DD:EE:FF", name="1872B")
+    kwargs.setdefault("session_timer", AdaptiveSessionTimer(1.0, 0.2))
+    return MedisanaBPClient(device, **kwargs)
+
+
+def frame(user_id: int, minute: int) -> bytes:
+    """Return a timestamped frame of a user."""
+    return build_frame(timestamp=(2025, 9, 1, 8, minute, 0), user_id=user_id)
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_typed_records(connect):
+    """The records of a session are yielded in order and the connection is closed."""
+    fake = FakeBleakClient([frame(1, 0), frame(2, 1)])
+    connect.append(fake)
+    client = make_client()
+
+    records = [record async for record in client.stream()]
+
+    assert all(isinstance(record, MeasurementRecord) for record in records)
+    assert [record.user_id for record in records] == [1, 2]
+    assert records[0].systolic == 120.0  # noqa: PLR2004
+    assert records[-1].battery == 80  # noqa: PLR2004
+    assert not fake.connected
+
+
+@pytest.mark.asyncio
+async def test_resent_frames_skipped_in_later_sessions(connect):
+    """Frames yielded in an earlier session are not yielded again."""
+    connect.extend([FakeBleakClient([frame(1, 0)]), FakeBleakClient([frame(1, 0), frame(1, 5)])])
+    client = make_client()
+
+    first = [record async for record in client.stream()]
+    second = [record async for record in client.stream()]
+
+    assert len(first) == 1
+    assert [record.timestamp.minute for record in second] == [5]
+    assert client.gatt_layout.learned
+
+
+@pytest.mark.asyncio
+async def test_backpressure_drops_frames(connect):
+    """A consumer that falls behind loses the frames beyond the buffer, they are not marked as seen."""
+    frames = [frame(1, minute) for minute in range(10)]
+    connect.extend([FakeBleakClient(frames, interval=0.001), FakeBleakClient(frames, interval=0.001)])
+    client = make_client(max_queued=4)
+
+    slow = []
+    async for record in client.stream():
+        slow.append(record)
+        await asyncio.sleep(0.02)
+    assert client.dropped > 0
+    assert len(slow) + client.dropped == len(frames)
+
+    client.max_queued = 100
+    again = [record async for record in client.stream()]
+    assert len(slow) + len(again) == len(frames)
+
+
+@pytest.mark.asyncio
+async def test_leaving_the_loop_disconnects(connect):
+    """Breaking out of the stream ends the session."""
+    fake = FakeBleakClient([frame(1, minute) for minute in range(10)])
+    connect.append(fake)
+    stream = make_client().stream()
+
+    async for _record in stream:
+        break
+    await stream.aclose()
+
+    assert not fake.connected
+
+
+@pytest.mark.asyncio
+async def test_connection_error_raised(connect):
+    """A failed connection is raised to the consumer."""
+    connect.append(BleakError("no slot"))
+
+    with pytest.raises(BleakError):
+        [record async for record in make_client().stream()]
+
+
+@pytest.mark.asyncio
+async def test_record_access_requests_new_records(connect):
+    """With a record access control point only the records since the newest yielded one are requested."""
+    memory = [frame(1, 0), frame(1, 5)]
+    first, second = FakeRacpBleakClient(memory), FakeRacpBleakClient([*memory, frame(1, 9)])
+    connect.extend([first, second])
+    client = make_client(session_timer=AdaptiveSessionTimer(5.0, 5.0))
+    client.battery.update(b"\x50", 0.0)
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    assert len([record async for record in client.stream()]) == 2  # noqa: PLR2004
+    assert [record.timestamp.minute for record in [r async for r in client.stream()]] == [9]
+
+    # The sessions end when the device confirms the transfer, not after the first notification timeout
+    assert loop.time() - started < 1.0
+    assert first.requests[0] == b"\x04\x01"
+    assert second.requests[0][:3] == b"\x04\x03\x02"
+
+
+@pytest.mark.asyncio
+async def test_record_access_requests_dropped_records_again(connect):
+    """Records dropped for a slow consumer are requested again, even if newer records were yielded."""
+    memory = [frame(1, minute) for minute in range(20)]
+    connect.extend([SlowRacpBleakClient(memory), SlowRacpBleakClient(memory)])
+    client = make_client(session_timer=AdaptiveSessionTimer(5.0, 5.0), max_queued=2)
+    client.battery.update(b"\x50", 0.0)
+
+    slow = []
+    async for record in client.stream():
+        slow.append(record.timestamp.minute)
+        await asyncio.sleep(0.01)
+    assert client.dropped > 0
+    # Later records were yielded after the first dropped one
+    assert max(slow) > min(set(range(20)) - set(slow))
+
+    client.max_queued = 100
+    again = [record.timestamp.minute async for record in client.stream()]
+    assert sorted(slow + again) == list(range(20))
+    assert client.last_timestamp.minute == 19  # noqa: PLR2004
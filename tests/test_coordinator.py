@@ -0,0 +1,299 @@
+"""Tests for the coordinator and its entities in a Home Assistant instance."""
+
+import asyncio
+from datetime import datetime, timedelta
+import logging
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from bleak import BleakError
+from bleak.backends.device import BLEDevice
+from custom_components.medisana_blood_pressure import sensor
+from custom_components.medisana_blood_pressure.const import (
+    CONF_ADAPTIVE_SESSION,
+    CONF_DEBUG_LOGGING,
+    CONF_HISTORY_MAX_AGE,
+    CONF_MAX_SESSION_DURATION,
+    DATA_CONNECTION_POOL,
+    DOMAIN,
+    EVENT_MEASUREMENT,
+    UPDATE_BATCH_WINDOW,
+)
+from custom_components.medisana_blood_pressure.medisana_bp.debug import (
+    DEFAULT_RATE_INTERVAL,
+    DEFAULT_RATE_LIMIT,
+)
+from custom_components.medisana_blood_pressure.medisana_bp.pool import (
+    PRIORITY_RETRY,
+    ConnectionPool,
+)
+from custom_components.medisana_blood_pressure.medisana_bp.scheduler import (
+    DEFAULT_BACKOFF_INITIAL,
+)
+from custom_components.medisana_blood_pressure.medisana_bp.supported_devices import (
+    BATTERY_LEVEL_UUID,
+    BP_MEASUREMENT_UUID,
+)
+from homeassistant.components import bluetooth
+from homeassistant.helpers.entity_platform import EntityPlatform
+import pytest
+from tests.frames import memory_dump
+from tests.gatt import BATTERY_SERVICE, BP_SERVICE, FakeServices, characteristic
+from tests.records import make_record
+
+ADDRESS = "A4:C1:38:00:00:01"
+
+
+class FakeCuffClient:
+    """Connected cuff that sends its memory right after the subscription."""
+
+    def __init__(self, frames, battery=80) -> None:
+        self.frames = frames
+        self.battery = battery
+        self.services = FakeServices(characteristic(3, BP_MEASUREMENT_UUID, BP_SERVICE),
+                                     characteristic(7, BATTERY_LEVEL_UUID, BATTERY_SERVICE))
+        self.connected = True
+
+    async def start_notify(self, _char, callback):
+        """Send the frames."""
+        for frame in self.frames:
+            callback(None, bytearray(frame))
+
+    async def stop_notify(self, _char):
+        """Nothing is sent after the memory."""
+
+    async def read_gatt_char(self, _char):
+        """Return the battery level."""
+        return bytearray([self.battery])
+
+    async def clear_cache(self):
+        """Nothing is cached."""
+
+    async def disconnect(self):
+        """Disconnect."""
+        self.connected = False
+
+
+def reachable(devices):
+    """Patch the Bluetooth lookups so that the device is reachable as the last of `devices`, if any."""
+    device_from_address = patch.object(bluetooth, "async_ble_device_from_address",
+                                       lambda *_args, **_kwargs: devices[-1] if devices else None)
+    return device_from_address, patch.object(bluetooth, "async_last_service_info", return_value=None)
+
+
+async def add_entities(hass, entities):
+    """Add entities through the sensor platform of the integration."""
+    platform = EntityPlatform(hass=hass, logger=logging.getLogger(__name__), domain="sensor", platform_name=DOMAIN,
+                              platform=None, scan_interval=timedelta(seconds=30), entity_namespace=None)
+    await platform.async_add_entities(entities)
+
+
+@pytest.mark.asyncio
+async def test_rolling_mean_moves_on_at_midnight(hass):
+    """The window of a rolling mean moves on at midnight without polling the coordinator."""
+    coordinator = sensor.MedisanaCoordinator(hass, ADDRESS)
+    now = datetime.now()
+    coordinator.aggregates.add(make_record(now - timedelta(days=6), 140.0, received=now))
+    mean = sensor.MbpsRollingMean(coordinator, "systolic", 7)
+    assert not mean.should_poll
+
+    with patch.object(sensor, "async_track_time_change") as track_time_change:
+        await add_entities(hass, [mean])
+    midnight = track_time_change.call_args.args[1]
+    assert track_time_change.call_args.kwargs == {"hour": 0, "minute": 0, "second": 0}
+    assert hass.states.get(mean.entity_id).state == "140.0"
+
+    with patch.object(coordinator.aggregates, "summary", wraps=coordinator.aggregates.summary) as summary, \
+            patch.object(sensor.dt_util, "now", return_value=now + timedelta(days=1)):
+        midnight(now + timedelta(days=1))
+    summary.assert_called_once()
+    state = hass.states.get(mean.entity_id)
+    assert state.state == "unknown"
+    assert state.attributes["count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_notification_burst_published_once(hass):
+    """A burst of notifications updates the entities once, but fires an event per reading."""
+    coordinator = sensor.MedisanaCoordinator(hass, ADDRESS, {CONF_HISTORY_MAX_AGE: 0})
+    events = []
+    hass.bus.async_listen(EVENT_MEASUREMENT, events.append)
+    dump = memory_dump(20)
+
+    with patch.object(sensor, "async_call_later") as call_later, \
+            patch.object(coordinator, "async_set_updated_data") as set_updated_data:
+        for frame in [*dump, dump[0]]:
+            coordinator.notification_handler(None, bytearray(frame))
+        publish = [call.args[2] for call in call_later.call_args_list if call.args[1] == UPDATE_BATCH_WINDOW]
+        assert len(publish) == 1
+        set_updated_data.assert_not_called()
+
+        publish[0](datetime.now())
+        set_updated_data.assert_called_once_with(coordinator.history)
+    await hass.async_block_till_done()
+
+    assert len(events) == len(dump)
+    assert len(coordinator.history) == len(dump)
+    assert len({event.data["timestamp"] for event in events}) == len(dump)
+
+
+@pytest.mark.asyncio
+async def test_sensors_have_valid_units(hass, caplog):
+    """Home Assistant accepts the units of the measurement and rolling mean sensors for their device classes."""
+    coordinator = sensor.MedisanaCoordinator(hass, ADDRESS)
+    with patch.object(sensor, "async_track_time_change"):
+        await add_entities(hass, [sensor.MbpsPulse(coordinator),
+                                  *(user_sensor(coordinator, user_id=1) for user_sensor in sensor.USER_SENSORS),
+                                  *sensor.rolling_aggregate_sensors(coordinator)])
+    now = datetime.now()
+    record = make_record(now, 140.0, received=now)
+    coordinator.history.add(record)
+    coordinator.aggregates.add(record)
+    coordinator.async_set_updated_data(coordinator.history)
+
+    assert hass.states.get("sensor.heart_rate").state == "70.0"
+    assert hass.states.get("sensor.heart_rate_user_1").state == "70.0"
+    assert hass.states.get("sensor.heart_rate_7_day_mean").state == "70.0"
+    assert "not a valid unit" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_sessions_share_the_slots_of_their_adapter(hass):
+    """Monitors seen by different adapters get separate connection slots, monitors on one adapter queue."""
+    hass.data[DATA_CONNECTION_POOL] = pool = ConnectionPool(max_sessions=1)
+    sources = {"A4:C1:38:00:00:01": "hci0", "A4:C1:38:00:00:02": "hci0", "A4:C1:38:00:00:03": "hci1"}
+    release = asyncio.Event()
+
+    def last_service_info(_hass, address, **_kwargs):
+        return SimpleNamespace(source=sources[address])
+
+    async def run_session(_ble_device):
+        await release.wait()
+
+    with patch.object(bluetooth, "async_ble_device_from_address",
+                      lambda _hass, address, **_kwargs: BLEDevice(address, None, {})), \
+            patch.object(bluetooth, "async_last_service_info", last_service_info):
+        coordinators = [sensor.MedisanaCoordinator(hass, address) for address in sources]
+        tasks = []
+        for coordinator in coordinators:
+            coordinator._run_session = run_session
+            tasks.append(hass.async_create_task(coordinator.connect_and_subscribe()))
+        await asyncio.sleep(0)
+
+        assert (pool.active("hci0"), pool.queued("hci0")) == (1, 1)
+        assert (pool.active("hci1"), pool.queued("hci1")) == (1, 0)
+        release.set()
+        await asyncio.gather(*tasks)
+    assert pool.active() == pool.queued() == 0
+
+
+@pytest.mark.asyncio
+async def test_debug_logging_rate_limited(hass, caplog):
+    """With debug logging enabled a burst of notifications is logged at the configured rate."""
+    caplog.set_level(logging.INFO)
+    caplog.handler.setLevel(logging.NOTSET)  # filter by logger level only, as Home Assistant does
+    coordinator = sensor.MedisanaCoordinator(hass, ADDRESS, {CONF_DEBUG_LOGGING: True})
+    now = 0.0
+    coordinator.debug_log._clock = lambda: now
+    dump = memory_dump(DEFAULT_RATE_LIMIT + 10)
+
+    with patch.object(sensor, "async_call_later"):
+        for frame in dump:
+            coordinator.notification_handler(None, bytearray(frame))
+        notifications = [record for record in caplog.records if record.msg.startswith("Notification from")]
+        assert len(notifications) == DEFAULT_RATE_LIMIT
+
+        now = DEFAULT_RATE_INTERVAL
+        coordinator.notification_handler(None, bytearray(dump[0]))
+    assert caplog.records[-2].getMessage() == "Suppressed 10 messages like 'Notification from %s: %s'"
+    assert caplog.records[-1].getMessage().startswith("Notification from")
+    coordinator.debug_log.enabled = False
+
+
+@pytest.mark.asyncio
+async def test_session_learns_the_service_filter(hass):
+    """A session transfers the memory; the next one discovers only the learned services."""
+    coordinator = sensor.MedisanaCoordinator(hass, ADDRESS, {CONF_ADAPTIVE_SESSION: False,
+                                                             CONF_MAX_SESSION_DURATION: 0.01})
+    devices = [BLEDevice(ADDRESS, "1872B", {})]
+    clients = [FakeCuffClient(memory_dump(5)), FakeCuffClient(memory_dump(6))]
+    establish_connection = AsyncMock(side_effect=clients)
+    device_from_address, last_service_info = reachable(devices)
+
+    with device_from_address, last_service_info, patch.object(sensor, "establish_connection", establish_connection), \
+            patch.object(sensor, "async_call_later"):
+        await coordinator.connect_and_subscribe()
+        first = establish_connection.call_args
+        assert first.args[1] is devices[0]
+        assert first.kwargs["services"] is None
+        # A retry of bleak-retry-connector connects through the adapter or proxy that sees the device now
+        devices.append(BLEDevice(ADDRESS, "1872B", {}))
+        assert first.kwargs["ble_device_callback"]() is devices[1]
+
+        await coordinator.connect_and_subscribe()
+    assert establish_connection.call_args.kwargs["services"] == sorted([BATTERY_SERVICE, BP_SERVICE])
+    assert not any(client.connected for client in clients)
+    assert len(coordinator.history) == 6  # noqa: PLR2004
+    assert coordinator.battery.level == 80  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_battery_sensor_follows_the_battery_reads(hass):
+    """The battery sensor shows every read level, also for measurements sent before the read and duplicates."""
+    coordinator = sensor.MedisanaCoordinator(hass, ADDRESS, {CONF_ADAPTIVE_SESSION: False,
+                                                             CONF_MAX_SESSION_DURATION: 0.01})
+    coordinator.battery.refresh_interval = 0
+    battery = sensor.MbpsBattery(coordinator)
+    await add_entities(hass, [battery])
+    dump = memory_dump(3)
+    establish_connection = AsyncMock(side_effect=[FakeCuffClient(dump, 80), FakeCuffClient(dump, 75)])
+    device_from_address, last_service_info = reachable([BLEDevice(ADDRESS, "1872B", {})])
+
+    with device_from_address, last_service_info, patch.object(sensor, "establish_connection", establish_connection), \
+            patch.object(sensor, "async_call_later"):
+        await coordinator.connect_and_subscribe()
+        assert coordinator.history.latest.battery is None
+        assert hass.states.get(battery.entity_id).state == "80"
+
+        await coordinator.connect_and_subscribe()
+    assert coordinator.deduplicator.suppressed == len(dump)
+    assert hass.states.get(battery.entity_id).state == "75"
+
+
+@pytest.mark.asyncio
+async def test_no_reachable_device(hass, caplog):
+    """Without an adapter or proxy that can reach the device no connection is attempted."""
+    coordinator = sensor.MedisanaCoordinator(hass, ADDRESS)
+    establish_connection = AsyncMock()
+    device_from_address, last_service_info = reachable([])
+
+    with device_from_address, last_service_info, patch.object(sensor, "establish_connection", establish_connection):
+        await coordinator.connect_and_subscribe()
+    establish_connection.assert_not_called()
+    assert coordinator.pool.active() == 0
+    assert "No connectable Bluetooth adapter or proxy" in caplog.text
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [BleakError("No free connection slot"), TimeoutError()])
+async def test_failed_connection_backs_off(hass, error):
+    """A failed connection is raised to the scheduler, which retries after a backoff with retry priority."""
+    coordinator = sensor.MedisanaCoordinator(hass, ADDRESS)
+    establish_connection = AsyncMock(side_effect=error)
+    device_from_address, last_service_info = reachable([BLEDevice(ADDRESS, "1872B", {})])
+
+    with device_from_address, last_service_info, patch.object(sensor, "establish_connection", establish_connection), \
+            patch.object(coordinator.pool, "session", wraps=coordinator.pool.session) as session:
+        with pytest.raises(type(error)):
+            await coordinator.connect_and_subscribe()
+        await coordinator.scheduler._run_session()
+        assert coordinator.scheduler.failures_by_error == {type(error).__name__: 1}
+
+        coordinator.scheduler.request()
+        delay = coordinator.scheduler._timer.when() - hass.loop.time()
+        assert delay == pytest.approx(DEFAULT_BACKOFF_INITIAL, abs=0.1)
+        with pytest.raises(type(error)):
+            await coordinator.connect_and_subscribe()
+    assert session.call_args.args == ("unknown", PRIORITY_RETRY)
+    assert coordinator.pool.active() == 0
+    await coordinator.scheduler.async_cancel()
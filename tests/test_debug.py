@@ -0,0 +1,75 @@
+"""Unit tests for the per-device debug log."""
+
+from datetime import datetime
+import logging
+
+from custom_components.medisana_blood_pressure.medisana_bp.debug import (
+    DeviceDebugLog,
+    HexFrame,
+)
+
+NOW = datetime(2025, 9, 1, 12, 0, 0)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_toggle_enables_only_one_device(caplog):
+    """Test that enabling debug for one device does not log for others."""
+    caplog.set_level(logging.INFO)
+    caplog.handler.setLevel(logging.NOTSET)  # filter by logger level only, as Home Assistant does
+    first = DeviceDebugLog("device-1", enabled=True)
+    second = DeviceDebugLog("device-2")
+
+    first.debug("Frame %s", HexFrame(b"\x1e\x01"))
+    second.debug("Frame %s", HexFrame(b"\x1e\x02"))
+
+    assert [record.getMessage() for record in caplog.records] == ["Frame 1e01"]
+    first.enabled = False
+    assert not first.enabled
+
+
+def test_arguments_are_not_formatted_when_disabled():
+    """Test that log arguments are only converted to strings when emitted."""
+
+    class Exploding:
+        def __str__(self) -> str:
+            raise AssertionError
+
+    DeviceDebugLog("device-3").debug("Value %s", Exploding())
+
+
+def test_rate_limit_per_call_site(caplog):
+    """Test that each message is limited per interval and suppressions are reported."""
+    caplog.set_level(logging.INFO)
+    caplog.handler.setLevel(logging.NOTSET)  # filter by logger level only, as Home Assistant does
+    clock = FakeClock()
+    debug_log = DeviceDebugLog("device-4", enabled=True, rate_limit=3, rate_interval=10.0, clock=clock)
+
+    for index in range(10):
+        debug_log.debug("Advertisement %d", index)
+    debug_log.debug("Other message")
+    assert len(caplog.records) == 4  # noqa: PLR2004
+
+    clock.now = 10.0
+    debug_log.debug("Advertisement %d", 10)
+    assert [record.getMessage() for record in caplog.records[-2:]] == [
+        "Suppressed 7 messages like 'Advertisement %d'",
+        "Advertisement 10",
+    ]
+
+
+def test_frame_ring_buffer():
+    """Test that only the latest raw frames are kept, also with debug logging disabled."""
+    debug_log = DeviceDebugLog("device-5", max_frames=3)
+    for index in range(5):
+        debug_log.record_frame(bytes([index]), NOW)
+
+    assert [raw.frame for raw in debug_log.frames()] == [b"\x02", b"\x03", b"\x04"]
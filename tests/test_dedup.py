@@ -0,0 +1,57 @@
+"""Unit tests for the duplicate frame detection."""
+
+from custom_components.medisana_blood_pressure.medisana_bp.dedup import (
+    FrameDeduplicator,
+)
+from tests.frames import build_frame
+
+
+def make_frame(minute: int, user_id: int = 1, flags: int = 0x1E) -> bytes:
+    """Return a frame of a user, timestamped if `flags` announce it."""
+    return build_frame(flags, timestamp=(2025, 9, 1, 12, minute, 0), user_id=user_id)
+
+
+def test_resent_memory_is_suppressed():
+    """Test that a second memory dump is recognised frame by frame."""
+    dedup = FrameDeduplicator()
+    dump = [make_frame(minute) for minute in range(60)]
+
+    assert not any(dedup.seen(frame) for frame in dump)
+    assert all(dedup.seen(frame) for frame in dump)
+    assert dedup.suppressed == 60  # noqa: PLR2004
+
+
+def test_users_are_distinguished():
+    """Test that equal measurements of different users are both processed."""
+    dedup = FrameDeduplicator()
+    assert not dedup.seen(make_frame(0, user_id=1))
+    assert not dedup.seen(make_frame(0, user_id=2))
+
+
+def test_frames_without_timestamp_are_never_suppressed():
+    """Test that frames without timestamp pass every time."""
+    dedup = FrameDeduplicator()
+    frame = make_frame(0, flags=0x1C)
+    assert not dedup.seen(frame)
+    assert not dedup.seen(frame)
+    assert len(dedup) == 0
+
+
+def test_index_is_bounded():
+    """Test that the least recently seen frames are forgotten first."""
+    dedup = FrameDeduplicator(max_frames=3)
+    for minute in range(4):
+        dedup.seen(make_frame(minute))
+
+    assert len(dedup) == 3  # noqa: PLR2004
+    assert not dedup.seen(make_frame(0))
+    assert dedup.seen(make_frame(3))
+
+
+def test_add_does_not_count():
+    """Test that restoring frames from the archive does not count as suppression."""
+    dedup = FrameDeduplicator()
+    dedup.add(make_frame(5))
+    assert dedup.suppressed == 0
+    assert dedup.seen(make_frame(5))
+    assert dedup.suppressed == 1
@@ -0,0 +1,50 @@
+"""Tests for the diagnostics of a config entry."""
+
+from datetime import datetime
+import json
+from types import MappingProxyType
+
+from custom_components.medisana_blood_pressure import sensor
+from custom_components.medisana_blood_pressure.const import DOMAIN
+from custom_components.medisana_blood_pressure.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from homeassistant.config_entries import SOURCE_BLUETOOTH, ConfigEntry
+import pytest
+from tests.records import make_record
+
+ADDRESS = "A4:C1:38:00:00:01"
+NAME = "Medisana BU 575"
+
+
+def make_entry():
+    """Return a config entry of a discovered cuff."""
+    return ConfigEntry(data={}, discovery_keys=MappingProxyType({}), domain=DOMAIN, minor_version=1, options={},
+                       source=SOURCE_BLUETOOTH, subentries_data=None, title=NAME, unique_id=ADDRESS, version=1)
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_redacted(hass):
+    """The diagnostics of a loaded entry hold the state of the coordinator, but not the address and name."""
+    entry = make_entry()
+    coordinator = sensor.MedisanaCoordinator(hass, ADDRESS, entry.options)
+    coordinator.history.add(make_record(datetime(2025, 9, 1, 8, 0), user_id=2))
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert set(diagnostics) == {
+        "entry", "options", "device", "scheduler", "session", "battery", "connection_pool", "gatt_service_filter",
+        "metrics", "history", "measurement_counts", "deduplicator", "raw_frames",
+    }
+    assert diagnostics["entry"] == {"address": "**REDACTED**", "name": "**REDACTED**"}
+    assert diagnostics["history"]["users"] == [2]
+    text = json.dumps(diagnostics, default=str)
+    assert ADDRESS not in text
+    assert NAME not in text
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_of_entry_not_loaded(hass):
+    """An entry without coordinator only has the redacted entry and its options."""
+    diagnostics = await async_get_config_entry_diagnostics(hass, make_entry())
+    assert diagnostics == {"entry": {"address": "**REDACTED**", "name": "**REDACTED**"}, "options": {}}
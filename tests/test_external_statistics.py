@@ -0,0 +1,195 @@
+"""Tests for the import of measurements into long-term statistics."""
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from zoneinfo import ZoneInfo
+
+from custom_components.medisana_blood_pressure import external_statistics
+from custom_components.medisana_blood_pressure.external_statistics import (
+    async_import_new_statistics,
+    async_import_statistics,
+    statistic_id,
+    to_utc,
+)
+from custom_components.medisana_blood_pressure.medisana_bp.history import (
+    MeasurementHistory,
+)
+from homeassistant.util import dt as dt_util
+import pytest
+from tests.records import make_record
+
+MAC_ADDRESS = "A4:C1:38:00:00:01"
+
+
+@pytest.fixture(autouse=True)
+def time_zone():
+    """Run the tests in a time zone with daylight saving time."""
+    default = dt_util.get_default_time_zone()
+    dt_util.set_default_time_zone(ZoneInfo("Europe/Berlin"))
+    yield
+    dt_util.set_default_time_zone(default)
+
+
+@pytest.fixture
+def add_statistics():
+    """Replace the recorder's import of external statistics."""
+    with patch.object(external_statistics, "async_add_external_statistics") as add_statistics:
+        yield add_statistics
+
+
+def make_hass(*components):
+    """Return a Home Assistant stand-in with the given components loaded."""
+    return SimpleNamespace(config=SimpleNamespace(components=set(components)))
+
+
+def make_history(records):
+    """Return a history holding `records`."""
+    history = MeasurementHistory(max_records=100, max_age=None)
+    for record in records:
+        history.add(record)
+    return history
+
+
+def make_recorder(newest):
+    """Return a recorder stand-in whose newest statistics start at `newest` by statistic id."""
+    def run(_job, _hass, _count, systolic_id, *_args):
+        return {systolic_id: [{"start": newest[systolic_id].timestamp()}]} if systolic_id in newest else {}
+    return SimpleNamespace(async_add_executor_job=AsyncMock(side_effect=run))
+
+
+def written(add_statistics):
+    """Return the statistics written per statistic id."""
+    return {call.args[1]["statistic_id"]: call.args[2] for call in add_statistics.call_args_list}
+
+
+def test_statistic_id():
+    """Statistic ids are per device and field, with a suffix for the user."""
+    assert statistic_id(MAC_ADDRESS, "systolic", None) == "medisana_blood_pressure:a4c138000001_systolic"
+    assert statistic_id(MAC_ADDRESS, "pulse_rate", 2) == "medisana_blood_pressure:a4c138000001_pulse_rate_user_2"
+
+
+def test_to_utc():
+    """Naive device times are local times of the Home Assistant time zone."""
+    assert to_utc(datetime(2025, 1, 15, 8, 30)) == datetime(2025, 1, 15, 7, 30, tzinfo=UTC)
+    assert to_utc(datetime(2025, 7, 15, 8, 30)) == datetime(2025, 7, 15, 6, 30, tzinfo=UTC)
+
+
+def test_without_recorder(add_statistics):
+    """Nothing is imported while the recorder is not loaded."""
+    history = make_history([make_record(datetime(2025, 9, 1, 7, 5), 120.0)])
+    assert async_import_statistics(make_hass(), MAC_ADDRESS, history) == 0
+    add_statistics.assert_not_called()
+
+
+def test_one_write_per_statistic(add_statistics):
+    """A transfer over several hours and users writes each statistic once, with all its hours."""
+    records = [
+        make_record(datetime(2025, 9, 1, 7, 5), 120.0, user_id=1),
+        make_record(datetime(2025, 9, 1, 7, 55), 130.0, user_id=1),
+        make_record(datetime(2025, 9, 1, 9, 0), 140.0, user_id=1),
+        make_record(datetime(2025, 9, 1, 9, 30), 150.0, user_id=2, pulse_rate=None),
+    ]
+    history = make_history(records)
+
+    assert async_import_statistics(make_hass("recorder"), MAC_ADDRESS, history, records) == 19  # noqa: PLR2004
+    statistics = written(add_statistics)
+    assert add_statistics.call_count == len(statistics) == 11  # noqa: PLR2004
+    assert statistic_id(MAC_ADDRESS, "pulse_rate", 2) not in statistics
+    assert [(row["start"], row["mean"]) for row in statistics[statistic_id(MAC_ADDRESS, "systolic", 1)]] == [
+        (datetime(2025, 9, 1, 5, tzinfo=UTC), 125.0),
+        (datetime(2025, 9, 1, 7, tzinfo=UTC), 140.0),
+    ]
+    assert [(row["start"], row["mean"]) for row in statistics[statistic_id(MAC_ADDRESS, "systolic", None)]] == [
+        (datetime(2025, 9, 1, 5, tzinfo=UTC), 125.0),
+        (datetime(2025, 9, 1, 7, tzinfo=UTC), 145.0),
+    ]
+    metadata = add_statistics.call_args_list[0].args[1]
+    assert metadata["source"] == "medisana_blood_pressure"
+    assert metadata["has_sum"] is False
+
+
+def test_cuff_with_user_ids(add_statistics):
+    """A cuff sending user ids gets statistics of all users together next to the statistics of each user."""
+    records = [
+        make_record(datetime(2025, 9, 1, 7, 5), 120.0, user_id=1),
+        make_record(datetime(2025, 9, 1, 7, 30), 140.0, user_id=2),
+    ]
+    history = make_history(records)
+
+    async_import_statistics(make_hass("recorder"), MAC_ADDRESS, history, records)
+    statistics = written(add_statistics)
+    means = {user_id: [row["mean"] for row in statistics[statistic_id(MAC_ADDRESS, "systolic", user_id)]]
+             for user_id in (None, 1, 2)}
+    assert means == {None: [130.0], 1: [120.0], 2: [140.0]}
+    names = {call.args[1]["statistic_id"]: call.args[1]["name"] for call in add_statistics.call_args_list}
+    assert names[statistic_id(MAC_ADDRESS, "systolic", None)] == "Medisana Systolic Pressure"
+    assert names[statistic_id(MAC_ADDRESS, "systolic", 2)] == "Medisana Systolic Pressure User 2"
+
+
+def test_hours_recomputed_from_history(add_statistics):
+    """The hours of new records are recomputed with the records of the history in the same hour."""
+    old = make_record(datetime(2025, 9, 1, 7, 5), 120.0)
+    new = make_record(datetime(2025, 9, 1, 7, 55), 130.0)
+    other_hour = make_record(datetime(2025, 9, 1, 8, 5), 200.0)
+    history = make_history([old, new, other_hour])
+
+    async_import_statistics(make_hass("recorder"), MAC_ADDRESS, history, [new])
+    systolic = written(add_statistics)[statistic_id(MAC_ADDRESS, "systolic", 1)]
+    assert [(row["start"], row["mean"], row["min"], row["max"]) for row in systolic] == [
+        (datetime(2025, 9, 1, 5, tzinfo=UTC), 125.0, 120.0, 130.0),
+    ]
+
+
+def test_daylight_saving_time_boundary(add_statistics):
+    """Local hours around the switch to summer time map to consecutive UTC hours."""
+    # 2025-03-30 02:00 CET is 03:00 CEST
+    before = make_record(datetime(2025, 3, 30, 1, 30), 120.0)
+    after = make_record(datetime(2025, 3, 30, 3, 10), 140.0)
+    after_2 = make_record(datetime(2025, 3, 30, 3, 50), 150.0)
+    history = make_history([before, after, after_2])
+
+    async_import_statistics(make_hass("recorder"), MAC_ADDRESS, history, [after])
+    systolic = written(add_statistics)[statistic_id(MAC_ADDRESS, "systolic", 1)]
+    assert [(row["start"], row["mean"]) for row in systolic] == [(datetime(2025, 3, 30, 1, tzinfo=UTC), 145.0)]
+
+    add_statistics.reset_mock()
+    async_import_statistics(make_hass("recorder"), MAC_ADDRESS, history, [before, after])
+    systolic = written(add_statistics)[statistic_id(MAC_ADDRESS, "systolic", 1)]
+    assert [(row["start"], row["mean"]) for row in systolic] == [
+        (datetime(2025, 3, 30, 0, tzinfo=UTC), 120.0),
+        (datetime(2025, 3, 30, 1, tzinfo=UTC), 145.0),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_new_statistics_from_newest_hour(add_statistics):
+    """Only the newest imported hour and later hours are imported again."""
+    history = make_history([
+        make_record(datetime(2025, 9, 1, 7, 5), 120.0),
+        make_record(datetime(2025, 9, 1, 8, 5), 130.0),
+        make_record(datetime(2025, 9, 1, 8, 45), 140.0),
+        make_record(datetime(2025, 9, 1, 10, 0), 150.0, user_id=2),
+    ])
+    newest = datetime(2025, 9, 1, 6, tzinfo=UTC)
+    recorder = make_recorder({statistic_id(MAC_ADDRESS, "systolic", None): newest})
+
+    with patch.object(external_statistics, "get_instance", return_value=recorder):
+        await async_import_new_statistics(make_hass("recorder"), MAC_ADDRESS, history)
+    statistics = written(add_statistics)
+    assert [row["start"] for row in statistics[statistic_id(MAC_ADDRESS, "systolic", None)]] == [
+        newest, datetime(2025, 9, 1, 8, tzinfo=UTC)]
+    assert [row["start"] for row in statistics[statistic_id(MAC_ADDRESS, "systolic", 1)]] == [newest]
+    assert [row["start"] for row in statistics[statistic_id(MAC_ADDRESS, "systolic", 2)]] == [
+        datetime(2025, 9, 1, 8, tzinfo=UTC)]
+
+
+@pytest.mark.asyncio
+async def test_import_new_statistics_without_imported_hours(add_statistics):
+    """The whole history is imported when nothing was imported yet."""
+    history = make_history([make_record(datetime(2025, 9, 1, 7, 5) + timedelta(days=day), 120.0) for day in range(3)])
+    recorder = make_recorder({})
+
+    with patch.object(external_statistics, "get_instance", return_value=recorder):
+        assert await async_import_new_statistics(make_hass("recorder"), MAC_ADDRESS, history) == 24  # noqa: PLR2004
+    assert len(written(add_statistics)[statistic_id(MAC_ADDRESS, "systolic", 1)]) == 3  # noqa: PLR2004
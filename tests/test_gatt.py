@@ -0,0 +1,55 @@
+"""Unit tests for the cached GATT layout."""
+
+from custom_components.medisana_blood_pressure.medisana_bp.gatt import GattLayout
+from custom_components.medisana_blood_pressure.medisana_bp.supported_devices import (
+    BATTERY_LEVEL_UUID,
+    BP_MEASUREMENT_UUID,
+)
+from tests.gatt import BATTERY_SERVICE, BP_SERVICE, FakeServices, characteristic
+
+
+def test_layout_is_learned_and_resolved_by_handle():
+    """Test that after learning, characteristics are resolved by handle with a service filter."""
+    services = FakeServices(characteristic(12, BP_MEASUREMENT_UUID, BP_SERVICE),
+                            characteristic(30, BATTERY_LEVEL_UUID, BATTERY_SERVICE))
+    layout = GattLayout((BP_MEASUREMENT_UUID, BATTERY_LEVEL_UUID))
+    assert layout.service_filter is None
+
+    layout.learn(services)
+    lookups = services.uuid_lookups
+
+    assert layout.service_filter == [BATTERY_SERVICE, BP_SERVICE]
+    assert layout.resolve(services, BP_MEASUREMENT_UUID).handle == 12  # noqa: PLR2004
+    assert layout.resolve(services, BATTERY_LEVEL_UUID).handle == 30  # noqa: PLR2004
+    assert services.uuid_lookups == lookups
+
+
+def test_absent_characteristic_does_not_invalidate():
+    """Test that a characteristic the device does not have keeps the layout valid."""
+    services = FakeServices(characteristic(12, BP_MEASUREMENT_UUID, BP_SERVICE))
+    layout = GattLayout((BP_MEASUREMENT_UUID, BATTERY_LEVEL_UUID))
+    layout.learn(services)
+
+    assert layout.resolve(services, BATTERY_LEVEL_UUID) is None
+    assert layout.learned
+    assert layout.service_filter == [BP_SERVICE]
+
+
+def test_stale_handle_invalidates_layout():
+    """Test that a changed handle falls back to a UUID lookup and forces a full discovery."""
+    layout = GattLayout((BP_MEASUREMENT_UUID,))
+    layout.learn(FakeServices(characteristic(12, BP_MEASUREMENT_UUID, BP_SERVICE)))
+
+    updated = FakeServices(characteristic(14, BP_MEASUREMENT_UUID, BP_SERVICE))
+    assert layout.resolve(updated, BP_MEASUREMENT_UUID).handle == 14  # noqa: PLR2004
+    assert not layout.learned
+    assert layout.service_filter is None
+
+
+def test_resolve_before_learning_uses_uuid():
+    """Test that an unknown layout is resolved by UUID without being learned."""
+    services = FakeServices(characteristic(12, BP_MEASUREMENT_UUID, BP_SERVICE))
+    layout = GattLayout((BP_MEASUREMENT_UUID,))
+
+    assert layout.resolve(services, BP_MEASUREMENT_UUID).handle == 12  # noqa: PLR2004
+    assert not layout.learned
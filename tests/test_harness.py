@@ -0,0 +1,63 @@
+"""Tests for the simulated cuff and proxy harness driving the real coordinator."""
+
+from benchmarks.harness import CuffProfile, Timing, run_load
+import pytest
+
+FAST = CuffProfile(measurement_interval=0.6, advertising_window=0.4, advertisement_interval=0.1,
+                   notification_interval=0.005, memory=10, backlog=5, connect_delay=0.02, connect_jitter=0.02)
+TIMING = Timing(debounce=0.05, cooldown=0.5, backoff_initial=0.1, idle_gap=0.1, min_idle_gap=0.05)
+
+
+def fast_profile(**changes):
+    """Return the fast profile with some fields changed."""
+    profile = CuffProfile(**{name: getattr(FAST, name) for name in CuffProfile.__slots__})
+    for name, value in changes.items():
+        setattr(profile, name, value)
+    return profile
+
+
+def assert_delivered_once(report, devices):
+    """Check the delivered measurements without depending on how many sessions fit into the run.
+
+    Whether the measurement of the last advertising window still gets through
+    depends on the timing of the machine, so only the bounds are checked.
+    """
+    assert report.sessions["started"] > 0
+    # The backlog is sent on the first session of every cuff
+    assert devices * FAST.backlog <= report.delivered <= devices * FAST.backlog + report.stats.measurements
+    # Every measurement is published once, resent frames are dropped
+    assert report.stats.events == report.delivered
+    assert report.stats.delivery_delay.count <= report.stats.measurements
+    assert report.stats.state_writes > 0
+
+
+@pytest.mark.asyncio
+async def test_measurements_delivered_once():
+    """The measurements of every cuff reach the history of its coordinator once."""
+    report = await run_load(3, 1.5, fast_profile(), TIMING)
+
+    assert report.stats.unrecognised_advertisements == 0
+    assert report.stats.slots_exhausted == 0
+    assert report.stats.measurements > 0
+    assert report.stats.loop_lag.count > 0
+    assert_delivered_once(report, 3)
+
+
+@pytest.mark.asyncio
+async def test_record_access_only_sends_new_records():
+    """Cuffs with a record access control point only send the records since the last synced one."""
+    report = await run_load(2, 1.5, fast_profile(record_access=True), TIMING)
+
+    assert_delivered_once(report, 2)
+    # Each record is sent once, plus the newest synced one the request starts at
+    assert report.stats.notifications <= report.delivered + report.stats.connections
+
+
+@pytest.mark.asyncio
+async def test_injected_failures():
+    """Failing connections are retried with backoff and deliver nothing."""
+    report = await run_load(2, 1.0, fast_profile(failure_rate=1.0), TIMING)
+
+    assert report.delivered == 0
+    assert report.sessions["failed"] == report.stats.injected_failures > 0
+    assert report.as_dict()["injected_failures"] == report.stats.injected_failures
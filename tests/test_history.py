@@ -0,0 +1,211 @@
+"""Unit tests for the bounded measurement history."""
+
+from datetime import datetime, timedelta
+
+from custom_components.medisana_blood_pressure.medisana_bp.history import (
+    MeasurementHistory,
+)
+import pytest
+from tests.records import make_record
+
+NOW = datetime(2025, 9, 1, 12, 0, 0)
+
+
+def test_latest_is_newest_timestamp_regardless_of_arrival_order():
+    """Test that memory dumps arriving out of order still yield the newest record."""
+    history = MeasurementHistory()
+    for hours in (3, 1, 5, 2, 4):
+        history.add(make_record(NOW - timedelta(hours=hours)))
+
+    assert len(history) == 5  # noqa: PLR2004
+    assert history.latest is not None
+    assert history.latest.timestamp == NOW - timedelta(hours=1)
+    times = [record.time for record in history]
+    assert times == sorted(times)
+
+
+def test_resent_record_replaces_stored_one():
+    """Test that a record with known timestamp and user is replaced, not duplicated."""
+    history = MeasurementHistory()
+    assert history.add(make_record(NOW, systolic=120.0))
+    assert not history.add(make_record(NOW, systolic=121.0))
+
+    assert len(history) == 1
+    assert history.latest is not None
+    assert history.latest.systolic == 121.0  # noqa: PLR2004
+
+
+def test_same_timestamp_different_users_are_kept():
+    """Test that two users measuring at the same second are both stored."""
+    history = MeasurementHistory()
+    history.add(make_record(NOW, user_id=1))
+    history.add(make_record(NOW, user_id=2))
+
+    assert len(history) == 2  # noqa: PLR2004
+
+
+def test_records_without_timestamp_are_kept_in_arrival_order():
+    """Test that frames without timestamp neither collide nor break sorting."""
+    history = MeasurementHistory()
+    history.add(make_record(NOW - timedelta(days=1)))
+    first = make_record(None, systolic=130.0, received=NOW)
+    second = make_record(None, systolic=131.0, received=NOW)
+    history.add(first)
+    history.add(second)
+
+    assert len(history) == 3  # noqa: PLR2004
+    assert history.latest is second
+    assert list(history)[-2] is first
+
+
+def test_size_limit_evicts_oldest():
+    """Test that the history never grows beyond its size limit."""
+    history = MeasurementHistory(max_records=10, max_age=None)
+    for minutes in range(100):
+        history.add(make_record(NOW + timedelta(minutes=minutes)))
+
+    assert len(history) == 10  # noqa: PLR2004
+    assert next(iter(history)).timestamp == NOW + timedelta(minutes=90)
+    assert history.latest is not None
+    assert history.latest.timestamp == NOW + timedelta(minutes=99)
+
+
+def test_age_limit_evicts_old_records():
+    """Test that records older than the age limit, relative to the latest one, are dropped."""
+    history = MeasurementHistory(max_age=timedelta(days=30))
+    history.add(make_record(NOW - timedelta(days=10)))
+    assert not history.add(make_record(NOW - timedelta(days=50)))
+
+    assert len(history) == 1
+
+
+def test_eviction_keeps_timestamp_index_bounded():
+    """Test that eviction also forgets the timestamp index entries."""
+    history = MeasurementHistory(max_records=2, max_age=None)
+    for hours in range(50):
+        history.add(make_record(NOW + timedelta(hours=hours)))
+
+    assert len(history) == 2  # noqa: PLR2004
+    assert len(history._by_timestamp) == 2  # noqa: PLR2004
+
+
+def test_views_skip_evicted_records():
+    """Test that records evicted ahead of the next compaction are not visible."""
+    history = MeasurementHistory(max_records=20, max_age=None)
+    records = [make_record(NOW + timedelta(hours=hours)) for hours in range(55)]
+    for record in records:
+        history.add(record)
+    kept = records[-20:]
+
+    assert len(history) == 20  # noqa: PLR2004
+    assert list(history) == kept
+    assert list(reversed(history)) == kept[::-1]
+    assert history.recent(30) == kept
+    assert history.page(15, 10) == kept[4::-1]
+    assert history.page(20, 10) == []
+    assert history.between(NOW, NOW + timedelta(days=10)) == kept
+    assert list(history.as_dict()) == [record.time.isoformat() for record in kept]
+    # Older than all stored records: evicted right away
+    assert not history.add(make_record(NOW - timedelta(hours=1)))
+    assert list(history) == kept
+
+
+def test_record_dict_access():
+    """Test the dictionary compatible accessors of a record."""
+    record = make_record(NOW)
+    assert record.get("systolic") == 120.0  # noqa: PLR2004
+    assert record.get("rssi") == -60  # noqa: PLR2004
+    assert record.get("unknown") is None
+    assert list(record.as_dict()) == [
+        "systolic", "diastolic", "mean_arterial_pressure", "timestamp",
+        "pulse_rate", "user_id", "measurement_status", "rssi", "battery",
+    ]
+
+    history = MeasurementHistory()
+    history.add(record)
+    assert history.as_dict() == {NOW.isoformat(): record.as_dict()}
+
+
+def test_recent_and_paging():
+    """Test the bounded views used for attributes and the history service."""
+    history = MeasurementHistory()
+    for minutes in range(25):
+        history.add(make_record(NOW + timedelta(minutes=minutes)))
+
+    assert [r.timestamp.minute for r in history.recent(3)] == [22, 23, 24]
+    assert len(history.as_dict(10)) == 10  # noqa: PLR2004
+    assert [r.timestamp.minute for r in history.page(0, 3)] == [24, 23, 22]
+    assert [r.timestamp.minute for r in history.page(20, 10)] == [4, 3, 2, 1, 0]
+    assert history.page(25, 10) == []
+    assert history.recent(0) == []
+
+
+def test_latest_record_per_user():
+    """Test that each user's latest record is indexed independently of arrival order."""
+    history = MeasurementHistory()
+    history.add(make_record(NOW - timedelta(hours=1), user_id=2))
+    history.add(make_record(NOW, user_id=1))
+    history.add(make_record(NOW - timedelta(hours=2), user_id=2))
+    history.add(make_record(NOW - timedelta(hours=3), user_id=1))
+
+    assert set(history.users) == {1, 2}
+    assert history.latest_for_user(1).timestamp == NOW
+    assert history.latest_for_user(2).timestamp == NOW - timedelta(hours=1)
+    assert history.latest_for_user(3) is None
+
+    replacement = make_record(NOW - timedelta(hours=1), user_id=2, systolic=140.0)
+    history.add(replacement)
+    assert history.latest_for_user(2) is replacement
+
+
+def test_user_index_follows_eviction():
+    """Test that users whose records were all evicted are dropped from the index."""
+    history = MeasurementHistory(max_records=3, max_age=None)
+    history.add(make_record(NOW, user_id=1))
+    for minutes in range(1, 4):
+        history.add(make_record(NOW + timedelta(minutes=minutes), user_id=2))
+
+    assert set(history.users) == {2}
+    assert history.latest_for_user(1) is None
+    assert not history.add(make_record(NOW - timedelta(days=1), user_id=3))
+    assert set(history.users) == {2}
+
+
+def test_memory_usage_grows_with_records():
+    """Test that the memory estimate accounts for the stored records."""
+    history = MeasurementHistory()
+    empty = history.memory_usage()
+    for minutes in range(100):
+        history.add(make_record(NOW + timedelta(minutes=minutes)))
+
+    assert history.memory_usage() > empty + 100 * 64
+
+
+def test_record_is_compact_and_immutable():
+    """Test that records have no instance dict, cannot be changed and convert to JSON compatible dicts."""
+    record = make_record(NOW)
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.systolic = 130.0
+    assert record.as_json()["timestamp"] == NOW.isoformat()
+    assert make_record(None).as_json()["timestamp"] is None
+
+
+def test_latest_timestamp_skips_records_without_timestamp():
+    """Test that the last synced device timestamp ignores frames without a timestamp."""
+    history = MeasurementHistory()
+    assert history.latest_timestamp is None
+    history.add(make_record(NOW - timedelta(days=1)))
+    history.add(make_record(NOW - timedelta(days=2)))
+    history.add(make_record(None, received=NOW))
+    assert history.latest_timestamp == NOW - timedelta(days=1)
+
+
+def test_between():
+    """Test the records within a time range."""
+    history = MeasurementHistory()
+    for hours in range(5):
+        history.add(make_record(NOW + timedelta(hours=hours)))
+    records = history.between(NOW + timedelta(hours=1), NOW + timedelta(hours=3))
+    assert [record.timestamp for record in records] == [NOW + timedelta(hours=1), NOW + timedelta(hours=2)]
+    assert history.between(NOW + timedelta(days=1), NOW + timedelta(days=2)) == []
@@ -0,0 +1,52 @@
+"""Unit tests for the hourly statistics of measurements."""
+
+from datetime import UTC, datetime, timedelta, timezone
+
+from custom_components.medisana_blood_pressure.medisana_bp.hourly import (
+    HourlyStatistic,
+    hourly_statistics,
+)
+from tests.records import make_record
+
+# Device clock in UTC+2, e.g. Central European Summer Time
+LOCAL = timezone(timedelta(hours=2))
+
+
+def to_utc(time: datetime) -> datetime:
+    """Convert the naive local time of the device to UTC."""
+    return time.replace(tzinfo=LOCAL).astimezone(UTC)
+
+
+def test_hours_from_device_time():
+    """Records are bucketed by the UTC hour of their device timestamp, not the receive time."""
+    records = [
+        make_record(datetime(2025, 9, 1, 7, 5), 120.0),
+        make_record(datetime(2025, 9, 1, 7, 55), 130.0),
+        make_record(datetime(2025, 9, 1, 8, 0), 140.0),
+    ]
+    statistics = hourly_statistics(records, "systolic", to_utc)
+
+    hours = [
+        HourlyStatistic(datetime(2025, 9, 1, 5, tzinfo=UTC), 125.0, 120.0, 130.0),
+        HourlyStatistic(datetime(2025, 9, 1, 6, tzinfo=UTC), 140.0, 140.0, 140.0),
+    ]
+    assert statistics == {None: hours, 1: hours}
+
+
+def test_users_and_missing_values():
+    """Statistics are kept per user and for all users, records without the field are skipped, hours are sorted."""
+    records = [
+        make_record(datetime(2025, 9, 1, 20, 0), 150.0, user_id=2),
+        make_record(datetime(2025, 9, 1, 7, 0), 120.0, user_id=1, pulse_rate=None),
+        make_record(None, 110.0, user_id=None, received=datetime(2025, 9, 10, 12, 0)),
+    ]
+    statistics = hourly_statistics(records, "pulse_rate", to_utc)
+
+    assert set(statistics) == {2, None}
+    assert [statistic.start for statistic in statistics[None]] == [
+        datetime(2025, 9, 1, 18, tzinfo=UTC), datetime(2025, 9, 10, 10, tzinfo=UTC)]
+
+    systolic = hourly_statistics([*records, make_record(datetime(2025, 9, 1, 6, 0), 100.0, user_id=2)],
+                                 "systolic", to_utc)
+    assert [statistic.start.hour for statistic in systolic[2]] == [4, 18]
+
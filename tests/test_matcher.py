@@ -0,0 +1,85 @@
+"""Unit tests for the cached advertisement matcher."""
+
+from types import SimpleNamespace
+
+from custom_components.medisana_blood_pressure.medisana_bp import matcher
+from custom_components.medisana_blood_pressure.medisana_bp.matcher import (
+    AdvertisementMatcher,
+    rank_candidates,
+    uuid_to_int,
+)
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+
+
+def make_info(name="OtherName", manufacturer_data=None, service_uuids=(), *, address=ADDRESS, rssi=-80, time=0.0):  # noqa: PLR0913
+    """Create a BluetoothServiceInfo-like object."""
+    return SimpleNamespace(
+        address=address,
+        name=name,
+        manufacturer_data=manufacturer_data or {},
+        service_uuids=list(service_uuids),
+        rssi=rssi,
+        time=time,
+    )
+
+
+def test_uuid_normalization():
+    """Test that short, long and upper case UUIDs map to the same int."""
+    full = uuid_to_int("00001810-0000-1000-8000-00805f9b34fb")
+    assert uuid_to_int("1810") == full
+    assert uuid_to_int("00001810") == full
+    assert uuid_to_int("00001810-0000-1000-8000-00805F9B34FB") == full
+    assert uuid_to_int("not-a-uuid") is None
+
+
+def test_upper_case_and_short_service_uuids_match():
+    """Test that advertised UUIDs are compared independent of their notation."""
+    assert matcher.supported(make_info(service_uuids=["00001810-0000-1000-8000-00805F9B34FB"], address=None))
+    assert matcher.supported(make_info(service_uuids=["1810"], address=None))
+    assert not matcher.supported(make_info(service_uuids=["180f", "invalid"], address=None))
+
+
+def test_verdict_is_cached_until_advertisement_changes(monkeypatch):
+    """Test that an unchanged advertisement is not matched again."""
+    calls = []
+    match = matcher._match
+    monkeypatch.setattr(matcher, "_match", lambda signature: calls.append(signature) or match(signature))
+    adv_matcher = AdvertisementMatcher()
+
+    assert not adv_matcher.supported(make_info())
+    assert not adv_matcher.supported(make_info())
+    assert len(calls) == 1
+
+    assert adv_matcher.supported(make_info(manufacturer_data={18498: b"\x00"}))
+    assert len(calls) == 2  # noqa: PLR2004
+    assert adv_matcher.supported(make_info(manufacturer_data={18498: b"\x01"}))
+    assert len(calls) == 2  # noqa: PLR2004
+
+
+def test_cache_is_bounded():
+    """Test that the least recently seen addresses are forgotten."""
+    adv_matcher = AdvertisementMatcher(max_addresses=3)
+    for index in range(10):
+        adv_matcher.supported(make_info(address=f"AA:BB:CC:DD:EE:{index:02X}"))
+
+    assert len(adv_matcher) == 3  # noqa: PLR2004
+    adv_matcher.clear()
+    assert len(adv_matcher) == 0
+
+
+def test_rank_candidates():
+    """Test that candidates are filtered and ranked by signal strength and last seen time."""
+    infos = [
+        make_info("1872B-1", address="00:00:00:00:00:01", rssi=-90, time=5.0),
+        make_info("Television", address="00:00:00:00:00:02", rssi=-40, time=9.0),
+        make_info("1872B-3", address="00:00:00:00:00:03", rssi=-60, time=1.0),
+        make_info("1872B-4", address="00:00:00:00:00:04", rssi=-60, time=3.0),
+        make_info("1872B-1", address="00:00:00:00:00:01", rssi=-50, time=8.0),
+        make_info("1872B-5", address="00:00:00:00:00:05", rssi=-30, time=9.0),
+    ]
+
+    ranked = rank_candidates(infos, exclude={"00:00:00:00:00:05"})
+
+    assert [info.address[-1] for info in ranked] == ["1", "4", "3"]
+    assert ranked[0].rssi == -50  # noqa: PLR2004
@@ -0,0 +1,53 @@
+"""Unit tests for the connection metrics."""
+
+from custom_components.medisana_blood_pressure.medisana_bp.metrics import (
+    ConnectionMetrics,
+    Histogram,
+    RateMeter,
+)
+
+
+def test_histogram():
+    """Test bucketing and summary values of a histogram."""
+    histogram = Histogram((1.0, 10.0))
+    for value in (0.5, 1.0, 5.0, 50.0):
+        histogram.add(value)
+
+    result = histogram.as_dict()
+    assert result["buckets"] == {"<=1": 2, "<=10": 1, ">10": 1}
+    assert result["count"] == 4  # noqa: PLR2004
+    assert result["min"] == 0.5  # noqa: PLR2004
+    assert result["max"] == 50.0  # noqa: PLR2004
+    assert result["last"] == 50.0  # noqa: PLR2004
+    assert histogram.mean == 14.125  # noqa: PLR2004
+    assert Histogram((1.0,)).mean is None
+
+
+def test_rate_meter_window():
+    """Test that the rate only counts events within the window."""
+    meter = RateMeter(window=60)
+    for index in range(120):
+        meter.add(1000.0 + index * 0.5)
+
+    assert meter.total == 120  # noqa: PLR2004
+    assert meter.rate(1059.9) == 120.0  # noqa: PLR2004
+    assert meter.rate(1089.9) == 60.0  # noqa: PLR2004
+    assert meter.rate(2000.0) == 0.0
+
+
+def test_session_metrics():
+    """Test the session timing from the advertisement to the end of the transfer."""
+    metrics = ConnectionMetrics()
+    metrics.session_started(101.0, requested_at=100.0)
+    metrics.notification(103.5)
+    metrics.notification(103.6)
+    metrics.session_finished(108.0, notifications=2)
+
+    assert metrics.time_to_first_notification.last == 3.5  # noqa: PLR2004
+    assert metrics.time_to_first_notification.count == 1
+    assert metrics.session_duration.last == 7.0  # noqa: PLR2004
+    assert metrics.notifications_per_session.last == 2  # noqa: PLR2004
+    assert set(metrics.as_dict(110.0)) == {
+        "parse_latency_us", "notifications_per_session", "session_duration_s",
+        "time_to_first_notification_s", "queue_wait_s", "advertisements",
+    }
@@ -1,28 +1,21 @@
 """Unit tests for the blood pressure data parser."""
 
 from datetime import datetime
+import random
 import struct
 
 from custom_components.medisana_blood_pressure.medisana_bp.parser import (
     parse_blood_pressure,
+    parse_measurement,
 )
-
-
-def make_sfloat(value: float) -> bytes:
-    """Encode a float into IEEE-11073 SFLOAT (approx, exponent=0)."""
-    mantissa = int(value)
-    raw = mantissa & 0x0FFF
-    return struct.pack("<H", raw)
+import pytest
+from tests.frames import build_frame, random_frame
+from tests.reference_parser import parse_blood_pressure_reference
 
 
 def test_parse_basic_measurement():
     """Test parsing a minimal measurement with only systolic/diastolic/MAP."""
-    flags = 0x00
-    systolic = make_sfloat(120)
-    diastolic = make_sfloat(80)
-    map_ = make_sfloat(95)
-
-    data = bytes([flags]) + systolic + diastolic + map_
+    data = build_frame(0x00, systolic=120, diastolic=80, mean_arterial_pressure=95)
     result = parse_blood_pressure(data)
 
     assert result["systolic"] == 120  # noqa: PLR2004
@@ -36,15 +29,8 @@ def test_parse_basic_measurement():
 
 def test_parse_with_timestamp_and_pulse():
     """Test parsing a measurement including timestamp and pulse rate."""
-    flags = 0x02 | 0x04
-    systolic = make_sfloat(125)
-    diastolic = make_sfloat(85)
-    map_ = make_sfloat(98)
-
-    timestamp = struct.pack("<HBBBBB", 2023, 8, 27, 14, 30, 45)
-    pulse = make_sfloat(72)
-
-    data = bytes([flags]) + systolic + diastolic + map_ + timestamp + pulse
+    data = build_frame(0x02 | 0x04, systolic=125, diastolic=85, mean_arterial_pressure=98,
+                       timestamp=(2023, 8, 27, 14, 30, 45), pulse_rate=72)
     result = parse_blood_pressure(data)
 
     assert result["systolic"] == 125  # noqa: PLR2004
@@ -59,15 +45,7 @@ def test_parse_with_timestamp_and_pulse():
 
 def test_parse_with_user_id_and_status():
     """Test parsing a measurement including user ID and status flags."""
-    flags = 0x08 | 0x10
-    systolic = make_sfloat(110)
-    diastolic = make_sfloat(70)
-    map_ = make_sfloat(90)
-
-    user_id = bytes([3])
-    status = struct.pack("<H", 0x1234)
-
-    data = bytes([flags]) + systolic + diastolic + map_ + user_id + status
+    data = build_frame(0x08 | 0x10, systolic=110, diastolic=70, mean_arterial_pressure=90, user_id=3, status=0x1234)
     result = parse_blood_pressure(data)
 
     assert result["systolic"] == 110  # noqa: PLR2004
@@ -75,3 +53,59 @@ def test_parse_with_user_id_and_status():
     assert result["mean_arterial_pressure"] == 90  # noqa: PLR2004
     assert result["user_id"] == 3  # noqa: PLR2004
     assert result["measurement_status"] == 0x1234  # noqa: PLR2004
+
+
+@pytest.mark.parametrize("flags", range(0x20))
+def test_fast_path_matches_reference(flags):
+    """Test that the fast path returns exactly what the field-by-field decoder returns."""
+    rng = random.Random(flags)
+    for _ in range(200):
+        data = random_frame(rng, flags)
+        fast = parse_blood_pressure(data)
+        reference = parse_blood_pressure_reference(data)
+        assert fast == reference
+        assert list(fast) == list(reference)
+        assert [type(v) for v in fast.values()] == [type(v) for v in reference.values()]
+
+
+def test_fast_path_covers_all_sfloat_values():
+    """Test the SFLOAT lookup tables against the reference for every raw value."""
+    for raw in range(0x10000):
+        data = bytes([0x04]) + struct.pack("<4H", raw, raw, raw, raw)
+        assert parse_blood_pressure(data) == parse_blood_pressure_reference(data)
+
+
+def test_fast_path_accepts_bytearray_and_memoryview():
+    """Test that notification payloads can be passed without copying."""
+    data = random_frame(random.Random(0), 0x1E)
+    expected = parse_blood_pressure(data)
+    assert parse_blood_pressure(bytearray(data)) == expected
+    assert parse_blood_pressure(memoryview(data)) == expected
+
+
+@pytest.mark.parametrize("flags", range(0x20))
+def test_parse_measurement_matches_dict(flags):
+    """Test that the typed record carries the same values as the dict."""
+    data = random_frame(random.Random(flags), flags)
+    received = datetime(2025, 9, 1, 12, 0, 0)
+    record = parse_measurement(data, received, -60, 90)
+
+    assert record.as_dict() == {**parse_blood_pressure(data), "rssi": -60, "battery": 90}
+    assert record.received == received
+
+
+def test_invalid_timestamp_is_none():
+    """Test that an invalid timestamp does not abort parsing."""
+    data = build_frame(0x02, timestamp=(2023, 13, 40, 25, 61, 61))
+    result = parse_blood_pressure(data)
+
+    assert result["timestamp"] is None
+    assert result["systolic"] == 120  # noqa: PLR2004
+
+
+def test_truncated_frame_raises():
+    """Test that a frame shorter than announced by its flags is rejected."""
+    # Ends after the diastolic pressure
+    data = build_frame(0x02)[:5]
+    with pytest.raises(struct.error):
+        parse_blood_pressure(data)
@@ -0,0 +1,120 @@
+"""Unit tests for the connection pool shared by all devices."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from custom_components.medisana_blood_pressure import async_unload_entry
+from custom_components.medisana_blood_pressure.const import (
+    DATA_CONNECTION_POOL,
+    DOMAIN,
+)
+from custom_components.medisana_blood_pressure.medisana_bp.pool import (
+    PRIORITY_MEASUREMENT,
+    PRIORITY_RETRY,
+    ConnectionPool,
+    QueueTimeoutError,
+)
+from custom_components.medisana_blood_pressure.sensor import connection_pool
+import pytest
+
+
+async def hold(pool: ConnectionPool, adapter: str, name: str, order: list[str], *,  # noqa: PLR0913
+               priority: int = PRIORITY_MEASUREMENT, duration: float = 0.01) -> float:
+    """Hold a slot for `duration` and record the order in which slots were granted."""
+    async with pool.session(adapter, priority) as waited:
+        order.append(name)
+        await asyncio.sleep(duration)
+    return waited
+
+
+@pytest.mark.asyncio
+async def test_sessions_limited_per_adapter():
+    """At most `max_sessions` sessions run on one adapter, other adapters are independent."""
+    pool = ConnectionPool(max_sessions=2)
+    order: list[str] = []
+    tasks = [asyncio.create_task(hold(pool, "proxy1", f"cuff{i}", order, duration=0.05)) for i in range(4)]
+    tasks.append(asyncio.create_task(hold(pool, "proxy2", "other", order, duration=0.05)))
+    await asyncio.sleep(0.01)
+
+    assert pool.active("proxy1") == 2  # noqa: PLR2004
+    assert pool.queued("proxy1") == 2  # noqa: PLR2004
+    assert pool.active("proxy2") == 1
+    waits = await asyncio.gather(*tasks)
+
+    assert order[:3] == ["cuff0", "cuff1", "other"]
+    assert order[3:] == ["cuff2", "cuff3"]
+    assert waits[0] < 0.01  # noqa: PLR2004
+    assert waits[3] >= 0.04  # noqa: PLR2004
+    assert pool.active() == 0
+    assert pool.as_dict()["adapters"]["proxy1"]["max_queued"] == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_new_measurements_before_retries():
+    """Waiting devices that just took a measurement are served before retries, otherwise in order."""
+    pool = ConnectionPool(max_sessions=1)
+    order: list[str] = []
+    tasks = [asyncio.create_task(hold(pool, "hci0", "busy", order, duration=0.02))]
+    await asyncio.sleep(0)
+    for name, priority in (("retry1", PRIORITY_RETRY), ("new1", PRIORITY_MEASUREMENT),
+                           ("retry2", PRIORITY_RETRY), ("new2", PRIORITY_MEASUREMENT)):
+        tasks.append(asyncio.create_task(hold(pool, "hci0", name, order, priority=priority)))
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+
+    assert order == ["busy", "new1", "new2", "retry1", "retry2"]
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout():
+    """A request that does not get a slot in time fails and leaves the queue."""
+    pool = ConnectionPool(max_sessions=1, max_wait=0.01)
+    order: list[str] = []
+    busy = asyncio.create_task(hold(pool, "hci0", "busy", order, duration=0.05))
+    await asyncio.sleep(0)
+
+    with pytest.raises(QueueTimeoutError):
+        await hold(pool, "hci0", "late", order)
+    assert isinstance(QueueTimeoutError("hci0", 1.0), TimeoutError)
+    assert pool.queued() == 0
+    assert pool.timeouts == 1
+    await busy
+    assert pool.active() == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_a_slot():
+    """Cancelling a waiting request, e.g. when the entry is unloaded, frees its place."""
+    pool = ConnectionPool(max_sessions=1)
+    order: list[str] = []
+    busy = asyncio.create_task(hold(pool, "hci0", "busy", order, duration=0.02))
+    await asyncio.sleep(0)
+    waiting = asyncio.create_task(hold(pool, "hci0", "cancelled", order))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    await busy
+
+    assert order == ["busy"]
+    assert pool.active() == 0
+    assert pool.queued() == 0
+    await hold(pool, "hci0", "next", order)
+    assert order == ["busy", "next"]
+
+
+@pytest.mark.asyncio
+async def test_pool_dropped_with_last_entry():
+    """The pool is kept apart from the coordinators and dropped when the last monitor is unloaded."""
+    hass = SimpleNamespace(data={}, config_entries=SimpleNamespace(
+        async_forward_entry_unload=AsyncMock(return_value=True)))
+    pool = connection_pool(hass)
+    assert connection_pool(hass) is pool
+    hass.data[DOMAIN] = {entry_id: SimpleNamespace(async_will_remove_from_hass=AsyncMock())
+                         for entry_id in ("first", "second")}
+
+    await async_unload_entry(hass, SimpleNamespace(entry_id="first"))
+    assert connection_pool(hass) is pool
+
+    await async_unload_entry(hass, SimpleNamespace(entry_id="second"))
+    assert hass.data[DOMAIN] == {}
+    assert DATA_CONNECTION_POOL not in hass.data
@@ -0,0 +1,109 @@
+"""Unit tests for the Record Access Control Point requests."""
+
+import asyncio
+from datetime import datetime
+
+from custom_components.medisana_blood_pressure.medisana_bp import racp
+from custom_components.medisana_blood_pressure.medisana_bp.racp import (
+    RacpResponse,
+    RecordAccessError,
+    build_request,
+    parse_response,
+    request_records,
+)
+import pytest
+
+SINCE = datetime(2025, 9, 1, 8, 30, 15)
+
+
+class FakeRacpClient:
+    """Connected device answering requests with indications."""
+
+    def __init__(self, stored, *, count_supported=True, report_code=racp.RESPONSE_SUCCESS, delay=0.001) -> None:
+        self.stored = stored
+        self.delay = delay
+        self.count_supported = count_supported
+        self.report_code = report_code
+        self.requests = []
+        self._callback = None
+
+    async def start_notify(self, _char, callback):
+        """Subscribe to the indications."""
+        self._callback = callback
+
+    async def write_gatt_char(self, _char, data, response):
+        """Answer a request after a delay."""
+        assert response
+        self.requests.append(bytes(data))
+        asyncio.get_running_loop().call_later(self.delay, self._callback, None, bytearray(self._answer(bytes(data))))
+
+    def _answer(self, request: bytes) -> bytes:
+        if request[0] == racp.OP_REPORT_NUMBER_OF_RECORDS:
+            if not self.count_supported:
+                return bytes((racp.OP_RESPONSE_CODE, 0, request[0], racp.RESPONSE_OP_CODE_NOT_SUPPORTED))
+            return bytes((racp.OP_NUMBER_OF_RECORDS_RESPONSE, 0)) + self.stored.to_bytes(2, "little")
+        return bytes((racp.OP_RESPONSE_CODE, 0, request[0], self.report_code))
+
+
+def test_build_request():
+    """Test requests for all records and for the records since a time."""
+    assert build_request(racp.OP_REPORT_STORED_RECORDS, None) == b"\x01\x01"
+    assert build_request(racp.OP_REPORT_NUMBER_OF_RECORDS, SINCE) == bytes(
+        (0x04, 0x03, 0x02, 0xE9, 0x07, 9, 1, 8, 30, 15))
+
+
+def test_parse_response():
+    """Test the number of records and the response code indications."""
+    assert parse_response(b"\x05\x00\x2c\x01") == RacpResponse(0x05, 0x04, 300)
+    assert parse_response(b"\x06\x00\x01\x06") == RacpResponse(0x06, 0x01, racp.RESPONSE_NO_RECORDS_FOUND)
+
+
+@pytest.mark.asyncio
+async def test_request_new_records():
+    """The records since the last synced one are counted and requested."""
+    device = FakeRacpClient(stored=3)
+    assert await request_records(device, None, SINCE, timeout=1.0) == 3  # noqa: PLR2004
+    assert [request[:2] for request in device.requests] == [b"\x04\x03", b"\x01\x03"]
+
+
+@pytest.mark.asyncio
+async def test_no_new_records_skips_the_report():
+    """Without new records only the count is requested."""
+    device = FakeRacpClient(stored=0)
+    assert await request_records(device, None, SINCE, timeout=1.0) == 0
+    assert len(device.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_count_not_supported():
+    """A device that cannot count records is asked for the records anyway."""
+    device = FakeRacpClient(stored=3, count_supported=False)
+    assert await request_records(device, None, None, timeout=1.0) is None
+    assert device.requests[-1] == b"\x01\x01"
+
+
+@pytest.mark.asyncio
+async def test_rejected_report_raises():
+    """A rejected request is raised, so the caller can fall back to the pushed records."""
+    device = FakeRacpClient(stored=3, report_code=racp.RESPONSE_OPERATOR_NOT_SUPPORTED)
+    with pytest.raises(RecordAccessError) as err:
+        await request_records(device, None, SINCE, timeout=1.0)
+    assert err.value.unsupported
+
+
+@pytest.mark.asyncio
+async def test_silent_device_times_out():
+    """A device that does not answer times out."""
+    device = FakeRacpClient(stored=3)
+    device.write_gatt_char = lambda *_args, **_kwargs: asyncio.sleep(0)
+    with pytest.raises(TimeoutError):
+        await request_records(device, None, SINCE, timeout=0.01)
+
+
+@pytest.mark.asyncio
+async def test_slow_count_shortens_the_report():
+    """The count and the report share one timeout, so a slow device cannot hold the link for twice as long."""
+    device = FakeRacpClient(stored=3, delay=0.06)
+    with pytest.raises(TimeoutError):
+        await request_records(device, None, SINCE, timeout=0.1)
+    assert len(device.requests) == 2  # noqa: PLR2004
@@ -0,0 +1,107 @@
+"""Unit tests for the connection scheduler."""
+
+import asyncio
+
+from bleak import BleakError
+from custom_components.medisana_blood_pressure.medisana_bp.scheduler import (
+    ConnectionScheduler,
+)
+import pytest
+
+
+def make_scheduler(session, **kwargs):
+    """Create a scheduler with short timings suitable for tests."""
+    options = {"debounce": 0.01, "cooldown": 0.0, "backoff_initial": 0.05, "backoff_max": 0.2}
+    options.update(kwargs)
+    return ConnectionScheduler(session, name="test", **options)
+
+
+@pytest.mark.asyncio
+async def test_burst_is_collapsed_into_one_session():
+    """Test that an advertisement burst starts exactly one session."""
+    calls = 0
+
+    async def session():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+
+    scheduler = make_scheduler(session, cooldown=10.0)
+    for _ in range(20):
+        scheduler.request()
+        await asyncio.sleep(0.005)
+    await asyncio.sleep(0.1)
+
+    assert calls == 1
+    assert scheduler.sessions_started == 1
+    assert scheduler.sessions_coalesced == 19  # noqa: PLR2004
+    assert scheduler.sessions_failed == 0
+
+
+@pytest.mark.asyncio
+async def test_cooldown_after_success():
+    """Test that requests right after a successful session are coalesced."""
+    calls = 0
+
+    async def session():
+        nonlocal calls
+        calls += 1
+
+    scheduler = make_scheduler(session, cooldown=10.0)
+    scheduler.request()
+    await asyncio.sleep(0.05)
+    scheduler.request()
+    await asyncio.sleep(0.05)
+
+    assert calls == 1
+    assert scheduler.stats == {"sessions_started": 1, "sessions_coalesced": 1, "sessions_failed": 0}
+
+
+@pytest.mark.parametrize("error", [BleakError("boom"), TimeoutError()])
+@pytest.mark.asyncio
+async def test_backoff_after_failure(error):
+    """Test that a failed session delays the next one by the backoff."""
+    starts: list[float] = []
+    loop = asyncio.get_running_loop()
+
+    async def session():
+        starts.append(loop.time())
+        raise error
+
+    scheduler = make_scheduler(session)
+    scheduler.request()
+    await asyncio.sleep(0.03)
+    assert scheduler.sessions_failed == 1
+
+    scheduler.request()
+    await asyncio.sleep(0.1)
+
+    assert scheduler.sessions_failed == 2  # noqa: PLR2004
+    assert starts[1] - starts[0] >= 0.05  # noqa: PLR2004
+    assert scheduler.failures_by_error == {type(error).__name__: 2}
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_running_session():
+    """Test that cancelling aborts the running session and ignores new requests."""
+    started = asyncio.Event()
+    cancelled = False
+
+    async def session():
+        nonlocal cancelled
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    scheduler = make_scheduler(session)
+    scheduler.request()
+    await asyncio.wait_for(started.wait(), 1)
+    await scheduler.async_cancel()
+
+    assert cancelled
+    assert not scheduler.busy
+    scheduler.request()
+    assert not scheduler.busy
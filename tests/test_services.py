@@ -0,0 +1,92 @@
+"""Tests for the services of the integration."""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from custom_components.medisana_blood_pressure import sensor
+from custom_components.medisana_blood_pressure.const import (
+    DOMAIN,
+    SERVICE_DUMP_FRAMES,
+    SERVICE_GET_MEASUREMENTS,
+)
+from custom_components.medisana_blood_pressure.medisana_bp.debug import (
+    DEFAULT_MAX_FRAMES,
+)
+from custom_components.medisana_blood_pressure.services import async_setup_services
+from homeassistant.exceptions import ServiceValidationError
+import pytest
+import pytest_asyncio
+from tests.frames import memory_dump
+from tests.records import make_record
+
+ADDRESS = "A4:C1:38:00:00:01"
+ENTRY_ID = "entry-1"
+NOW = datetime(2025, 9, 1, 12, 0, 0)
+
+
+@pytest_asyncio.fixture
+async def coordinator(hass):
+    """Return the coordinator of a loaded entry, with the services registered."""
+    async_setup_services(hass)
+    coordinator = sensor.MedisanaCoordinator(hass, ADDRESS)
+    hass.data.setdefault(DOMAIN, {})[ENTRY_ID] = coordinator
+    return coordinator
+
+
+async def get_measurements(hass, **data):
+    """Call the get_measurements service and return its response."""
+    return await hass.services.async_call(DOMAIN, SERVICE_GET_MEASUREMENTS, {"config_entry_id": ENTRY_ID, **data},
+                                          blocking=True, return_response=True)
+
+
+@pytest.mark.asyncio
+async def test_get_measurements_pages_latest_first(hass, coordinator):
+    """Pages hold the latest measurements first, `offset` skips the latest ones."""
+    for minutes in range(5):
+        coordinator.history.add(make_record(NOW + timedelta(minutes=minutes), 120.0 + minutes))
+
+    response = await get_measurements(hass, limit=2)
+    assert response["total"] == 5  # noqa: PLR2004
+    assert response["offset"] == 0
+    assert [measurement["systolic"] for measurement in response["measurements"]] == [124.0, 123.0]
+    assert response["measurements"][0]["timestamp"] == "2025-09-01T12:04:00"
+
+    response = await get_measurements(hass, offset=4, limit=2)
+    assert response["offset"] == 4  # noqa: PLR2004
+    assert [measurement["systolic"] for measurement in response["measurements"]] == [120.0]
+
+    assert (await get_measurements(hass, offset=5))["measurements"] == []
+
+
+@pytest.mark.asyncio
+async def test_get_measurements_default_page(hass, coordinator):
+    """Without `offset` and `limit` the latest 100 measurements are returned."""
+    for minutes in range(150):
+        coordinator.history.add(make_record(NOW + timedelta(minutes=minutes)))
+
+    response = await get_measurements(hass)
+    assert response["total"] == 150  # noqa: PLR2004
+    assert len(response["measurements"]) == 100  # noqa: PLR2004
+    assert response["measurements"][-1]["timestamp"] == (NOW + timedelta(minutes=50)).isoformat()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("coordinator")
+async def test_get_measurements_of_entry_not_loaded(hass):
+    """An entry without coordinator is rejected."""
+    with pytest.raises(ServiceValidationError):
+        await get_measurements(hass, config_entry_id="unknown")
+
+
+@pytest.mark.asyncio
+async def test_dump_frames_returns_latest_frames(hass, coordinator):
+    """The latest raw frames are returned oldest first, with debug logging disabled."""
+    dump = memory_dump(DEFAULT_MAX_FRAMES + 20)
+    with patch.object(sensor, "async_call_later"):
+        for frame in dump:
+            coordinator.notification_handler(None, bytearray(frame))
+
+    response = await hass.services.async_call(DOMAIN, SERVICE_DUMP_FRAMES, {"config_entry_id": ENTRY_ID},
+                                              blocking=True, return_response=True)
+    assert [raw["frame"] for raw in response["frames"]] == [frame.hex() for frame in dump[-DEFAULT_MAX_FRAMES:]]
+    assert datetime.fromisoformat(response["frames"][0]["received"])
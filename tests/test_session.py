@@ -0,0 +1,80 @@
+"""Unit tests for the adaptive session timer."""
+
+import asyncio
+
+from custom_components.medisana_blood_pressure.medisana_bp import session
+from custom_components.medisana_blood_pressure.medisana_bp.session import (
+    AdaptiveSessionTimer,
+)
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def short_gaps(monkeypatch):
+    """Scale the idle gap limits down so the tests run fast."""
+    monkeypatch.setattr(session, "MIN_IDLE_GAP", 0.02)
+    monkeypatch.setattr(session, "MAX_IDLE_GAP", 0.2)
+    monkeypatch.setattr(session, "DEFAULT_IDLE_GAP", 0.1)
+
+
+async def notify_periodically(timer: AdaptiveSessionTimer, count: int, interval: float) -> None:
+    """Simulate a record dump of `count` notifications."""
+    for _ in range(count):
+        timer.notify()
+        await asyncio.sleep(interval)
+
+
+@pytest.mark.asyncio
+async def test_session_ends_without_notifications():
+    """Test that a session without notifications ends after the first-notification timeout."""
+    loop = asyncio.get_running_loop()
+    timer = AdaptiveSessionTimer(max_duration=1.0, first_notification_timeout=0.05)
+    timer.start()
+    started = loop.time()
+    await timer.wait()
+
+    assert 0.05 <= loop.time() - started < 0.5  # noqa: PLR2004
+    assert timer.notifications == 0
+
+
+@pytest.mark.asyncio
+async def test_session_ends_after_idle_gap():
+    """Test that the session ends shortly after the last notification."""
+    loop = asyncio.get_running_loop()
+    timer = AdaptiveSessionTimer(max_duration=5.0, first_notification_timeout=1.0)
+    timer.start()
+    started = loop.time()
+    dump = loop.create_task(notify_periodically(timer, 10, 0.01))
+    await timer.wait()
+    await dump
+
+    assert timer.notifications == 10  # noqa: PLR2004
+    assert timer.interval is not None
+    assert timer.interval == pytest.approx(0.01, abs=0.01)
+    assert loop.time() - started < 1.0
+
+
+@pytest.mark.asyncio
+async def test_session_capped_by_max_duration():
+    """Test that a device that keeps sending is disconnected after the maximum duration."""
+    loop = asyncio.get_running_loop()
+    timer = AdaptiveSessionTimer(max_duration=0.1, first_notification_timeout=1.0)
+    timer.start()
+    started = loop.time()
+    dump = loop.create_task(notify_periodically(timer, 100, 0.005))
+    await timer.wait()
+    dump.cancel()
+
+    assert 0.1 <= loop.time() - started < 0.3  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_fixed_session_duration():
+    """Test that the non-adaptive mode keeps the connection for the maximum duration."""
+    loop = asyncio.get_running_loop()
+    timer = AdaptiveSessionTimer(max_duration=0.1, first_notification_timeout=0.01, adaptive=False)
+    timer.start()
+    started = loop.time()
+    await timer.wait()
+
+    assert loop.time() - started >= 0.1  # noqa: PLR2004